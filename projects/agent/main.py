@@ -7,12 +7,13 @@ import os
 import sys
 
 from kubernetes import client
-from sqlalchemy import create_engine
 from sqlalchemy.orm import scoped_session, sessionmaker
 
 from projects.agent.logger import DEFAULT_LOG_LEVEL
+from projects.agent.responses import maintain_responses
 from projects.agent.watchers.deployment import watch_seldon_deployments
 from projects.agent.watchers.workflow import watch_workflows
+from projects.database import create_db_engine
 from projects.kubernetes.kube_config import load_kube_config
 
 DB_HOST = os.getenv("MYSQL_DB_HOST", "mysql.platiagro")
@@ -22,10 +23,7 @@ DB_PASS = os.getenv("MYSQL_DB_PASSWORD", "")
 DB_URL = f"mysql+pymysql://{DB_USER}:{DB_PASS}@{DB_HOST}/{DB_NAME}"
 
 
-engine = create_engine(DB_URL,
-                       pool_size=5,
-                       pool_recycle=300,
-                       max_overflow=10)
+engine = create_db_engine(DB_URL)
 session = scoped_session(sessionmaker(autocommit=False,
                                       autoflush=False,
                                       bind=engine))
@@ -44,7 +42,7 @@ def run(log_level):
 
     logging.basicConfig(level=log_level)
 
-    watchers = [watch_workflows, watch_seldon_deployments]
+    watchers = [watch_workflows, watch_seldon_deployments, maintain_responses]
 
     # We decided to use a ThreadPoolExecutor to concurrently run our watchers.
     # This is necessary because we couldn't easily catch watchers exceptions
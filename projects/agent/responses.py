@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+"""Rollups and retention of deployment responses."""
+import logging
+import os
+import time
+
+from projects.controllers.deployments.responses import ResponseController
+
+# seconds between two runs of the rollup and retention job
+RESPONSES_ROLLUP_INTERVAL = int(os.getenv("RESPONSES_ROLLUP_INTERVAL", "300"))
+
+
+def maintain_responses(api, session):
+    """
+    Periodically computes the rollups of responses and deletes expired responses.
+
+    Parameters
+    ----------
+    api : kubernetes.client.apis.custom_objects_api.CustomObjectsApi
+    session : sqlalchemy.orm.session.Session
+    """
+    while os.environ["STOP_THREADS"] == "0":
+        try:
+            response_controller = ResponseController(session)
+            # rollups are computed first, so that expired responses are summarized
+            response_controller.rollup_responses()
+            deleted = response_controller.delete_expired_responses()
+            logging.info(f"Deleted {deleted} expired responses")
+        except Exception:
+            logging.exception("Failed to maintain responses")
+            session.rollback()
+
+        deadline = time.monotonic() + RESPONSES_ROLLUP_INTERVAL
+        while os.environ["STOP_THREADS"] == "0" and time.monotonic() < deadline:
+            time.sleep(1)
@@ -112,6 +112,12 @@ def update_status(workflow_manifest, session):
                 created_at_str=workflow_manifest["object"]["status"].get("startedAt"),
                 session=session
             )
+            update_deployment_run(
+                deployment_id=id_,
+                metadata=workflow_manifest["object"]["metadata"],
+                status=workflow_manifest["object"]["status"].get("phase"),
+                session=session
+            )
 
     # Then, we set the status for operators that are listed in object.status.nodes
     for node in workflow_manifest["object"]["status"].get("nodes", {}).values():
@@ -170,3 +176,52 @@ def update_seldon_deployment(deployment_id, status, created_at_str, session):
         .update({"status": status, "deployed_at": deployed_at})
 
     session.commit()
+
+
+def update_deployment_run(deployment_id, metadata, status, session):
+    """
+    Sets the latest run of a deployment in the deployment runs index.
+
+    Parameters
+    ----------
+    deployment_id : str
+    metadata : dict
+        The workflow metadata. KFP sets the run id in the label pipeline/runid.
+    status : str
+    session : sqlalchemy.orm.session.Session
+    """
+    run_id = metadata.get("labels", {}).get("pipeline/runid")
+    if run_id is None:
+        return
+
+    created_at = None
+    if metadata.get("creationTimestamp") is not None:
+        created_at = dateutil.parser.isoparse(metadata["creationTimestamp"])
+        created_at = created_at.replace(tzinfo=None)
+
+    deployment_run = session.query(models.DeploymentRun).get(deployment_id)
+
+    if deployment_run is None:
+        deployment = session.query(models.Deployment).get(deployment_id)
+        if deployment is None:
+            return
+        deployment_run = models.DeploymentRun(
+            deployment_id=deployment_id,
+            experiment_id=deployment_id,
+            name=deployment.name,
+        )
+        session.add(deployment_run)
+    elif (
+        deployment_run.run_id != run_id
+        and created_at is not None
+        and created_at < deployment_run.created_at
+    ):
+        # events of older runs do not replace the latest run
+        return
+
+    deployment_run.run_id = run_id
+    deployment_run.status = status or "Running"
+    if created_at is not None:
+        deployment_run.created_at = created_at
+
+    session.commit()
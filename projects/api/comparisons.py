@@ -15,7 +15,7 @@ router = APIRouter(
 
 
 @router.get("", response_model=projects.schemas.comparison.ComparisonList)
-async def handle_list_comparisons(
+def handle_list_comparisons(
     project_id: str,
     session: Session = Depends(database.session_scope),
     kubeflow_userid: Optional[str] = Header(database.DB_TENANT),
@@ -42,7 +42,7 @@ async def handle_list_comparisons(
 
 
 @router.post("", response_model=projects.schemas.comparison.Comparison)
-async def handle_post_comparisons(
+def handle_post_comparisons(
     project_id: str,
     session: Session = Depends(database.session_scope),
     kubeflow_userid: Optional[str] = Header(database.DB_TENANT),
@@ -69,7 +69,7 @@ async def handle_post_comparisons(
 
 
 @router.patch("/{comparison_id}", response_model=projects.schemas.comparison.Comparison)
-async def handle_patch_comparisons(
+def handle_patch_comparisons(
     project_id: str,
     comparison_id: str,
     comparison: projects.schemas.comparison.ComparisonUpdate,
@@ -103,7 +103,7 @@ async def handle_patch_comparisons(
 
 
 @router.delete("/{comparison_id}")
-async def handle_delete_comparisons(
+def handle_delete_comparisons(
     project_id: str,
     comparison_id: str,
     session: Session = Depends(database.session_scope),
@@ -15,7 +15,7 @@ router = APIRouter(
 
 
 @router.get("", response_model=projects.schemas.deployment.DeploymentList)
-async def handle_list_deployments(
+def handle_list_deployments(
     project_id: str,
     session: Session = Depends(database.session_scope),
     kubeflow_userid: Optional[str] = Header(database.DB_TENANT),
@@ -44,7 +44,7 @@ async def handle_list_deployments(
 
 
 @router.post("", response_model=projects.schemas.deployment.DeploymentList)
-async def handle_post_deployments(
+def handle_post_deployments(
     project_id: str,
     deployment: projects.schemas.deployment.DeploymentCreate,
     background_tasks: BackgroundTasks,
@@ -77,7 +77,7 @@ async def handle_post_deployments(
 
 
 @router.get("/{deployment_id}", response_model=projects.schemas.deployment.Deployment)
-async def handle_get_deployment(
+def handle_get_deployment(
     project_id: str,
     deployment_id: str,
     session: Session = Depends(database.session_scope),
@@ -108,7 +108,7 @@ async def handle_get_deployment(
 
 
 @router.patch("/{deployment_id}", response_model=projects.schemas.deployment.Deployment)
-async def handle_patch_deployment(
+def handle_patch_deployment(
     project_id: str,
     deployment_id: str,
     deployment: projects.schemas.deployment.DeploymentUpdate,
@@ -142,7 +142,7 @@ async def handle_patch_deployment(
 
 
 @router.delete("/{deployment_id}")
-async def handle_delete_deployment(
+def handle_delete_deployment(
     project_id: str,
     deployment_id: str,
     background_tasks: BackgroundTasks,
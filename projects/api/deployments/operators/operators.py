@@ -19,7 +19,7 @@ router = APIRouter(
 
 
 @router.get("", response_model=projects.schemas.operator.OperatorList)
-async def handle_list_operators(
+def handle_list_operators(
     project_id: str,
     deployment_id: str,
     session: Session = Depends(database.session_scope),
@@ -53,7 +53,7 @@ async def handle_list_operators(
 
 
 @router.patch("/{operator_id}", response_model=projects.schemas.operator.Operator)
-async def handle_patch_operator(
+def handle_patch_operator(
     project_id: str,
     deployment_id: str,
     operator_id: str,
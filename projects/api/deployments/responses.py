@@ -1,15 +1,20 @@
 # -*- coding: utf-8 -*-
 """Deployments Responses API Router."""
+from datetime import datetime
+from typing import Optional
 
-from fastapi import APIRouter, Body, Depends
+from fastapi import APIRouter, Body, Depends, Header
 from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 
+import projects.schemas.response
 from projects import database
 from projects.controllers import (
     DeploymentController,
+    ProjectController,
     ResponseController,
 )
+from projects.controllers.deployments import responses
 
 router = APIRouter(
     prefix="/projects/{project_id}/deployments/{deployment_id}/responses",
@@ -17,7 +22,7 @@ router = APIRouter(
 
 
 @router.post("")
-async def handle_post_responses(
+def handle_post_responses(
     project_id: str,
     deployment_id: str,
     body: dict = Body(...),
@@ -37,11 +42,20 @@ async def handle_post_responses(
     -------
     fastapi.responses.JSONResponse
     """
+    response_controller = ResponseController(session)
+
+    if responses.RESPONSES_INGESTION_MODE == "batch":
+        # responses are saved in micro-batches by a background thread,
+        # which also drops responses of deployments that do not exist
+        response_controller.enqueue_response(deployment_id=deployment_id, body=body)
+        return JSONResponse(
+            status_code=202,
+            content={"message": "Accepted"},
+        )
 
     deployment_controller = DeploymentController(session)
     deployment_controller.raise_if_deployment_does_not_exist(deployment_id)
 
-    response_controller = ResponseController(session)
     response_controller.create_response(
         deployment_id=deployment_id, body=body
     )
@@ -50,3 +64,84 @@ async def handle_post_responses(
         status_code=200,
         content={"message": "OK"},
     )
+
+
+@router.get("/rollups", response_model=projects.schemas.response.ResponseRollupList)
+def handle_list_rollups(
+    project_id: str,
+    deployment_id: str,
+    granularity: Optional[str] = "hour",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    session: Session = Depends(database.read_session_scope),
+    kubeflow_userid: Optional[str] = Header(database.DB_TENANT),
+):
+    """
+    Handles GET requests to /rollups.
+
+    Parameters
+    ----------
+    project_id : str
+    deployment_id : str
+    granularity : str
+    start : datetime
+    end : datetime
+    session : sqlalchemy.orm.session.Session
+    kubeflow_userid : fastapi.Header
+
+    Returns
+    -------
+    projects.schemas.response.ResponseRollupList
+    """
+    project_controller = ProjectController(session, kubeflow_userid=kubeflow_userid)
+    project_controller.raise_if_project_does_not_exist(project_id)
+
+    deployment_controller = DeploymentController(session)
+    deployment_controller.raise_if_deployment_does_not_exist(deployment_id)
+
+    response_controller = ResponseController(session)
+    rollups = response_controller.list_rollups(
+        deployment_id=deployment_id,
+        granularity=granularity,
+        start=start,
+        end=end,
+    )
+    return rollups
+
+
+@router.put(
+    "/retention", response_model=projects.schemas.response.ResponseRetention
+)
+def handle_put_retention(
+    project_id: str,
+    deployment_id: str,
+    retention: projects.schemas.response.ResponseRetentionUpdate,
+    session: Session = Depends(database.session_scope),
+    kubeflow_userid: Optional[str] = Header(database.DB_TENANT),
+):
+    """
+    Handles PUT requests to /retention.
+
+    Parameters
+    ----------
+    project_id : str
+    deployment_id : str
+    retention : projects.schemas.response.ResponseRetentionUpdate
+    session : sqlalchemy.orm.session.Session
+    kubeflow_userid : fastapi.Header
+
+    Returns
+    -------
+    projects.schemas.response.ResponseRetention
+    """
+    project_controller = ProjectController(session, kubeflow_userid=kubeflow_userid)
+    project_controller.raise_if_project_does_not_exist(project_id)
+
+    deployment_controller = DeploymentController(session)
+    deployment_controller.raise_if_deployment_does_not_exist(deployment_id)
+
+    response_controller = ResponseController(session)
+    retention = response_controller.update_retention(
+        deployment_id=deployment_id, retention=retention
+    )
+    return retention
@@ -15,7 +15,7 @@ router = APIRouter(
 
 
 @router.get("")
-async def handle_list_logs(
+def handle_list_logs(
     project_id: str,
     deployment_id: str,
     run_id: str,
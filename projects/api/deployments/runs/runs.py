@@ -15,9 +15,11 @@ router = APIRouter(
 
 
 @router.get("")
-async def handle_list_runs(
+def handle_list_runs(
     project_id: str,
     deployment_id: str,
+    page_size: Optional[int] = 10,
+    page_token: Optional[str] = None,
     session: Session = Depends(database.session_scope),
     kubeflow_userid: Optional[str] = Header(database.DB_TENANT),
 ):
@@ -28,6 +30,8 @@ async def handle_list_runs(
     ----------
     project_id : str
     deployment_id : str
+    page_size : int
+    page_token : str
     session : sqlalchemy.orm.session.Session
     kubeflow_userid : fastapi.Header
 
@@ -42,12 +46,16 @@ async def handle_list_runs(
     deployment_controller.raise_if_deployment_does_not_exist(deployment_id)
 
     run_controller = RunController(session)
-    runs = run_controller.list_runs(deployment_id=deployment_id)
+    runs = run_controller.list_runs(
+        deployment_id=deployment_id,
+        page_size=page_size,
+        page_token=page_token,
+    )
     return runs
 
 
 @router.post("")
-async def handle_post_runs(
+def handle_post_runs(
     project_id: str,
     deployment_id: str,
     background_tasks: BackgroundTasks,
@@ -81,7 +89,7 @@ async def handle_post_runs(
 
 
 @router.get("/{run_id}")
-async def handle_get_run(
+def handle_get_run(
     project_id: str,
     deployment_id: str,
     run_id: str,
@@ -115,7 +123,7 @@ async def handle_get_run(
 
 
 @router.delete("/{run_id}")
-async def handle_delete_runs(
+def handle_delete_runs(
     project_id: str,
     deployment_id: str,
     run_id: str,
@@ -144,5 +152,5 @@ async def handle_delete_runs(
     deployment_controller.raise_if_deployment_does_not_exist(deployment_id)
 
     run_controller = RunController(session)
-    run = run_controller.terminate_run(deployment_id=deployment_id)
+    run = run_controller.delete_run(deployment_id=deployment_id)
     return run
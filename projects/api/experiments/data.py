@@ -19,7 +19,7 @@ router = APIRouter(
 
 
 @router.get("")
-async def handle_get_data(
+def handle_get_data(
     project_id: str,
     experiment_id: str,
     session: Session = Depends(database.session_scope),
@@ -17,9 +17,9 @@ router = APIRouter(
 
 
 @router.get("", response_model=projects.schemas.experiment.ExperimentList)
-async def handle_list_experiments(
+def handle_list_experiments(
     project_id: str,
-    session: Session = Depends(database.session_scope),
+    session: Session = Depends(database.read_session_scope),
     kubeflow_userid: Optional[str] = Header(database.DB_TENANT),
 ):
     """
@@ -44,7 +44,7 @@ async def handle_list_experiments(
 
 
 @router.post("", response_model=projects.schemas.experiment.Experiment)
-async def handle_post_experiments(
+def handle_post_experiments(
     project_id: str,
     experiment: projects.schemas.experiment.ExperimentCreate,
     session: Session = Depends(database.session_scope),
@@ -75,10 +75,10 @@ async def handle_post_experiments(
 
 
 @router.get("/{experiment_id}", response_model=projects.schemas.experiment.Experiment)
-async def handle_get_experiment(
+def handle_get_experiment(
     project_id: str,
     experiment_id: str,
-    session: Session = Depends(database.session_scope),
+    session: Session = Depends(database.read_session_scope),
     kubeflow_userid: Optional[str] = Header(database.DB_TENANT),
 ):
     """
@@ -106,7 +106,7 @@ async def handle_get_experiment(
 
 
 @router.patch("/{experiment_id}", response_model=projects.schemas.experiment.Experiment)
-async def handle_patch_experiment(
+def handle_patch_experiment(
     project_id: str,
     experiment_id: str,
     experiment: projects.schemas.experiment.ExperimentUpdate,
@@ -139,7 +139,7 @@ async def handle_patch_experiment(
 
 
 @router.delete("/{experiment_id}")
-async def handle_delete_experiment(
+def handle_delete_experiment(
     project_id: str,
     experiment_id: str,
     session: Session = Depends(database.session_scope),
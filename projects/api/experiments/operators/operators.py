@@ -20,7 +20,7 @@ router = APIRouter(
 
 
 @router.get("", response_model=projects.schemas.operator.OperatorList)
-async def handle_list_operators(
+def handle_list_operators(
     project_id: str,
     experiment_id: str,
     session: Session = Depends(database.session_scope),
@@ -54,7 +54,7 @@ async def handle_list_operators(
 
 
 @router.post("", response_model=projects.schemas.operator.Operator)
-async def handle_post_operator(
+def handle_post_operator(
     project_id: str,
     experiment_id: str,
     operator: projects.schemas.operator.OperatorCreate,
@@ -90,7 +90,7 @@ async def handle_post_operator(
 
 
 @router.patch("/{operator_id}", response_model=projects.schemas.operator.Operator)
-async def handle_patch_operator(
+def handle_patch_operator(
     project_id: str,
     experiment_id: str,
     operator_id: str,
@@ -130,7 +130,7 @@ async def handle_patch_operator(
 
 
 @router.delete("/{operator_id}")
-async def handle_delete_operator(
+def handle_delete_operator(
     project_id: str,
     experiment_id: str,
     operator_id: str,
@@ -20,7 +20,7 @@ router = APIRouter(
 
 
 @router.patch("/{name}")
-async def handle_patch_parameter(
+def handle_patch_parameter(
     project_id: str,
     experiment_id: str,
     operator_id: str,
@@ -20,7 +20,7 @@ router = APIRouter(
 
 
 @router.get("")
-async def handle_get_dataset(
+def handle_get_dataset(
     project_id: str,
     experiment_id: str,
     run_id: str,
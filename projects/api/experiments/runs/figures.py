@@ -19,7 +19,7 @@ router = APIRouter(
 
 
 @router.get("")
-async def handle_list_figures(
+def handle_list_figures(
     project_id: str,
     experiment_id: str,
     run_id: str,
@@ -19,7 +19,7 @@ router = APIRouter(
 
 
 @router.get("")
-async def handle_list_metrics(
+def handle_list_metrics(
     project_id: str,
     experiment_id: str,
     run_id: str,
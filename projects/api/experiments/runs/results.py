@@ -21,7 +21,7 @@ router = APIRouter(
 
 
 @router.get("/results")
-async def handle_get_results(
+def handle_get_results(
     project_id: str,
     experiment_id: str,
     run_id: str,
@@ -62,7 +62,7 @@ async def handle_get_results(
 
 
 @router.get("/operators/{operator_id}/results")
-async def handle_get_operator_results(
+def handle_get_operator_results(
     project_id: str,
     experiment_id: str,
     run_id: str,
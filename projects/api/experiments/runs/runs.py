@@ -16,9 +16,11 @@ router = APIRouter(
 
 
 @router.get("", response_model=projects.schemas.run.RunList)
-async def handle_list_runs(
+def handle_list_runs(
     project_id: str,
     experiment_id: str,
+    page_size: Optional[int] = 10,
+    page_token: Optional[str] = None,
     session: Session = Depends(database.session_scope),
     kubeflow_userid: Optional[str] = Header(database.DB_TENANT),
 ):
@@ -29,6 +31,8 @@ async def handle_list_runs(
     ----------
     project_id : str
     experiment_id : str
+    page_size : int
+    page_token : str
     session : sqlalchemy.orm.session.Session
     kubeflow_userid : fastapi.Header
 
@@ -43,12 +47,16 @@ async def handle_list_runs(
     experiment_controller.raise_if_experiment_does_not_exist(experiment_id)
 
     run_controller = RunController(session)
-    runs = run_controller.list_runs(experiment_id=experiment_id)
+    runs = run_controller.list_runs(
+        experiment_id=experiment_id,
+        page_size=page_size,
+        page_token=page_token,
+    )
     return runs
 
 
 @router.post("", response_model=projects.schemas.run.Run)
-async def handle_post_run(
+def handle_post_run(
     project_id: str,
     experiment_id: str,
     session: Session = Depends(database.session_scope),
@@ -80,7 +88,7 @@ async def handle_post_run(
 
 
 @router.get("/{run_id}", response_model=projects.schemas.run.Run)
-async def handle_get_run(
+def handle_get_run(
     project_id: str,
     experiment_id: str,
     run_id: str,
@@ -116,7 +124,7 @@ async def handle_get_run(
 
 
 @router.delete("/{run_id}")
-async def handle_delete_run(
+def handle_delete_run(
     project_id: str,
     experiment_id: str,
     run_id: str,
@@ -150,7 +158,7 @@ async def handle_delete_run(
 
 
 @router.post("/{run_id}/retry")
-async def handle_post_retry_run(
+def handle_post_retry_run(
     project_id: str,
     experiment_id: str,
     run_id: str,
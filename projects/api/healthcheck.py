@@ -8,6 +8,7 @@ from sqlalchemy.exc import OperationalError
 
 from projects import database
 from projects.exceptions import ServiceUnavailable
+from projects.executor import list_executors_stats
 
 router = APIRouter(
     prefix="/healthcheck",
@@ -38,3 +39,17 @@ def handle_healthcheck(session: Session = Depends(database.session_scope)):
             code="CannotConnectToDatabase", message="Could not connect to database"
         )
     return "Sucessfully connected to db"
+
+
+@router.get("/executors")
+def handle_list_executors():
+    """
+    Handles GET request to /executors.
+
+    Returns
+    -------
+    dict
+        Usage metrics of each thread pool.
+    """
+    executors = list_executors_stats()
+    return {"executors": executors, "total": len(executors)}
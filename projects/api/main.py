@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 """ASGI server."""
 import argparse
+import asyncio
 import os
 import sys
 
@@ -9,7 +10,9 @@ from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse, PlainTextResponse, Response
 
 from projects import __version__, api
+from projects.controllers.deployments.responses import RESPONSE_BUFFER
 from projects.database import init_db
+from projects.executor import get_executor
 from projects.exceptions import (
     BadRequest,
     Forbidden,
@@ -53,10 +56,21 @@ app.include_router(api.healthcheck.router)
 async def startup_event():
     """
     Run before the application starts. Creates tables in the database.
+    Sync handlers, dependencies and background tasks run in the default executor,
+    so it is replaced by a bounded thread pool.
     """
+    asyncio.get_running_loop().set_default_executor(get_executor())
     init_db()
 
 
+@app.on_event("shutdown")
+def shutdown_event():
+    """
+    Run before the application stops. Saves the buffered responses.
+    """
+    RESPONSE_BUFFER.drain()
+
+
 @app.get("/", response_class=PlainTextResponse)
 async def ping():
     """
@@ -19,7 +19,7 @@ router = APIRouter(
 
 
 @router.get("")
-async def handle_list_figures_monitorings(
+def handle_list_figures_monitorings(
     project_id: str,
     deployment_id: str,
     monitoring_id: str,
@@ -19,7 +19,7 @@ router = APIRouter(
 
 
 @router.get("", response_model=projects.schemas.monitoring.MonitoringList)
-async def handle_list_monitorings(
+def handle_list_monitorings(
     project_id: str,
     deployment_id: str,
     session: Session = Depends(database.session_scope),
@@ -51,7 +51,7 @@ async def handle_list_monitorings(
 
 
 @router.post("", response_model=projects.schemas.monitoring.Monitoring)
-async def handle_post_monitorings(
+def handle_post_monitorings(
     project_id: str,
     deployment_id: str,
     monitoring: projects.schemas.monitoring.MonitoringCreate,
@@ -89,7 +89,7 @@ async def handle_post_monitorings(
 
 
 @router.delete("/{monitoring_id}")
-async def handle_delete_monitorings(
+def handle_delete_monitorings(
     project_id: str,
     deployment_id: str,
     monitoring_id: str,
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 """Predictions API Router."""
+import functools
 from json.decoder import JSONDecodeError
 from typing import Optional
 
@@ -22,6 +23,7 @@ from projects.controllers import (
 
 from projects.database import session_scope
 from projects.exceptions import BadRequest
+from projects.executor import run_in_executor
 from projects.schemas import Prediction, PredictionBase
 
 router = APIRouter(
@@ -36,6 +38,7 @@ async def handle_post_prediction(
     request: Request,
     background_tasks: BackgroundTasks,
     file: Optional[UploadFile] = File(None),
+    batch: Optional[bool] = False,
     session: Session = Depends(session_scope),
     kubeflow_userid: Optional[str] = Header("anonymous"),
 ):
@@ -48,6 +51,7 @@ async def handle_post_prediction(
     deployment_id : str
     request : starlette.requests.Request
     file : starlette.datastructures.UploadFile
+    batch : bool
     session : sqlalchemy.orm.session.Session
     kubeflow_userid : fastapi.Header
 
@@ -55,11 +59,15 @@ async def handle_post_prediction(
     -------
     Prediction: projects.schemas.prediction.Prediction
     """
+    # this handler is async because it reads the request body,
+    # so the blocking calls are explicitly sent to the thread pool
     project_controller = ProjectController(session, kubeflow_userid=kubeflow_userid)
-    project_controller.raise_if_project_does_not_exist(project_id)
+    await run_in_executor(project_controller.raise_if_project_does_not_exist, project_id)
 
     deployment_controller = DeploymentController(session)
-    deployment_controller.raise_if_deployment_does_not_exist(deployment_id)
+    await run_in_executor(
+        deployment_controller.raise_if_deployment_does_not_exist, deployment_id
+    )
 
     # at this endpoint, we can accept both form-data and json as the request content-type
     kwargs = {}
@@ -74,15 +82,22 @@ async def handle_post_prediction(
                 message="either form-data or json is required",
             )
 
+    # batch may be given either as a query parameter or in the json body
+    batch = kwargs.pop("batch", batch)
+
     prediction_controller = PredictionController(session, background_tasks)
-    prediction = prediction_controller.create_prediction(
-        deployment_id=deployment_id, **kwargs
+    create_prediction = functools.partial(
+        prediction_controller.create_prediction,
+        deployment_id=deployment_id,
+        batch=batch,
+        **kwargs,
     )
+    prediction = await run_in_executor(create_prediction)
     return prediction
 
 
 @router.get("/{prediction_id}", response_model=Prediction)
-async def handle_get_prediction(
+def handle_get_prediction(
     prediction_id: str, session: Session = Depends(session_scope)
 ):
     """
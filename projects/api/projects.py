@@ -15,9 +15,9 @@ router = APIRouter(
 
 
 @router.post("/list-projects", response_model=projects.schemas.project.ProjectList)
-async def handle_list_projects(
+def handle_list_projects(
     request_schema: projects.schemas.project.ProjectListRequest,
-    session: Session = Depends(database.session_scope),
+    session: Session = Depends(database.read_session_scope),
     kubeflow_userid: Optional[str] = Header(database.DB_TENANT),
 ):
     """
@@ -38,16 +38,21 @@ async def handle_list_projects(
     order_by = request_as_dict.get("order")
     page = request_as_dict.get("page")
     page_size = request_as_dict.get("page_size")
+    cursor = request_as_dict.get("cursor")
 
     project_controller = ProjectController(session, kubeflow_userid=kubeflow_userid)
     projects = project_controller.list_projects(
-        page=page, page_size=page_size, order_by=order_by, **filters
+        page=page,
+        page_size=page_size,
+        order_by=order_by,
+        cursor=cursor,
+        **filters,
     )
     return projects
 
 
 @router.post("", response_model=projects.schemas.project.Project)
-async def handle_post_projects(
+def handle_post_projects(
     project: projects.schemas.project.ProjectCreate,
     session: Session = Depends(database.session_scope),
     kubeflow_userid: Optional[str] = Header(database.DB_TENANT),
@@ -71,9 +76,9 @@ async def handle_post_projects(
 
 
 @router.get("/{project_id}", response_model=projects.schemas.project.Project)
-async def handle_get_project(
+def handle_get_project(
     project_id: str,
-    session: Session = Depends(database.session_scope),
+    session: Session = Depends(database.read_session_scope),
     kubeflow_userid: Optional[str] = Header(database.DB_TENANT),
 ):
     """
@@ -95,7 +100,7 @@ async def handle_get_project(
 
 
 @router.patch("/{project_id}", response_model=projects.schemas.project.Project)
-async def handle_patch_project(
+def handle_patch_project(
     project_id: str,
     project: projects.schemas.project.ProjectUpdate,
     session: Session = Depends(database.session_scope),
@@ -121,7 +126,7 @@ async def handle_patch_project(
 
 
 @router.delete("/{project_id}")
-async def handle_delete_project(
+def handle_delete_project(
     project_id: str,
     session: Session = Depends(database.session_scope),
     kubeflow_userid: Optional[str] = Header(database.DB_TENANT),
@@ -145,7 +150,7 @@ async def handle_delete_project(
 
 
 @router.post("/deleteprojects")
-async def handle_post_deleteprojects(
+def handle_post_deleteprojects(
     projects: List[str],
     session: Session = Depends(database.session_scope),
     kubeflow_userid: Optional[str] = Header(database.DB_TENANT),
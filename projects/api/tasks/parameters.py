@@ -14,7 +14,7 @@ router = APIRouter(
 
 
 @router.get("")
-async def handle_list_parameters(
+def handle_list_parameters(
     task_id: str,
     session: Session = Depends(database.session_scope),
     kubeflow_userid: Optional[str] = Header(database.DB_TENANT),
@@ -18,9 +18,9 @@ ATTACHMENT_FILE_NAME = "taskfiles.zip"
 
 
 @router.post("/list-tasks", response_model=projects.schemas.task.TaskList)
-async def handle_list_tasks(
+def handle_list_tasks(
     request_schema: projects.schemas.task.TaskListRequest,
-    session: Session = Depends(database.session_scope),
+    session: Session = Depends(database.read_session_scope),
 ):
     """
     Handles GET requests to /.
@@ -38,16 +38,21 @@ async def handle_list_tasks(
     order_by = request_as_dict.get("order")
     page = request_as_dict.get("page")
     page_size = request_as_dict.get("page_size")
+    cursor = request_as_dict.get("cursor")
 
     task_controller = TaskController(session)
     tasks = task_controller.list_tasks(
-        page=page, page_size=page_size, order_by=order_by, **filters
+        page=page,
+        page_size=page_size,
+        order_by=order_by,
+        cursor=cursor,
+        **filters,
     )
     return tasks
 
 
 @router.post("", response_model=projects.schemas.task.Task)
-async def handle_post_tasks(
+def handle_post_tasks(
     task: projects.schemas.task.TaskCreate,
     background_tasks: BackgroundTasks,
     session: Session = Depends(database.session_scope),
@@ -71,8 +76,8 @@ async def handle_post_tasks(
 
 
 @router.get("/{task_id}", response_model=projects.schemas.task.Task)
-async def handle_get_task(
-    task_id: str, session: Session = Depends(database.session_scope)
+def handle_get_task(
+    task_id: str, session: Session = Depends(database.read_session_scope)
 ):
     """
     Handles GET requests to /<task_id>.
@@ -92,7 +97,7 @@ async def handle_get_task(
 
 
 @router.patch("/{task_id}", response_model=projects.schemas.task.Task)
-async def handle_patch_task(
+def handle_patch_task(
     task_id: str,
     task: projects.schemas.task.TaskCreate,
     background_tasks: BackgroundTasks,
@@ -118,7 +123,7 @@ async def handle_patch_task(
 
 
 @router.delete("/{task_id}")
-async def handle_delete_task(
+def handle_delete_task(
     task_id: str,
     background_tasks: BackgroundTasks,
     session: Session = Depends(database.session_scope),
@@ -140,7 +145,7 @@ async def handle_delete_task(
 
 
 @router.post("/{task_id}/emails", status_code=200)
-async def handle_task_email_sender(
+def handle_task_email_sender(
     task_id: str,
     email_schema: EmailSchema,
     background_tasks: BackgroundTasks,
@@ -15,8 +15,8 @@ router = APIRouter(
 
 
 @router.get("", response_model=projects.schemas.template.TemplateList)
-async def handle_list_templates(
-    session: Session = Depends(database.session_scope),
+def handle_list_templates(
+    session: Session = Depends(database.read_session_scope),
     kubeflow_userid: Optional[str] = Header(database.DB_TENANT),
 ):
     """
@@ -36,7 +36,7 @@ async def handle_list_templates(
 
 
 @router.post("", response_model=projects.schemas.template.Template)
-async def handle_post_templates(
+def handle_post_templates(
     template: projects.schemas.template.TemplateCreate,
     session: Session = Depends(database.session_scope),
     kubeflow_userid: Optional[str] = Header(database.DB_TENANT),
@@ -60,9 +60,9 @@ async def handle_post_templates(
 
 
 @router.get("/{template_id}", response_model=projects.schemas.template.Template)
-async def handle_get_template(
+def handle_get_template(
     template_id: str,
-    session: Session = Depends(database.session_scope),
+    session: Session = Depends(database.read_session_scope),
     kubeflow_userid: Optional[str] = Header(database.DB_TENANT),
 ):
     """
@@ -84,7 +84,7 @@ async def handle_get_template(
 
 
 @router.patch("/{template_id}", response_model=projects.schemas.template.Template)
-async def handle_patch_template(
+def handle_patch_template(
     template_id: str,
     template: projects.schemas.template.TemplateUpdate,
     session: Session = Depends(database.session_scope),
@@ -112,7 +112,7 @@ async def handle_patch_template(
 
 
 @router.delete("/{template_id}")
-async def handle_delete_template(
+def handle_delete_template(
     template_id: str,
     session: Session = Depends(database.session_scope),
     kubeflow_userid: Optional[str] = Header(database.DB_TENANT),
@@ -136,7 +136,7 @@ async def handle_delete_template(
 
 
 @router.post("/deletetemplates")
-async def handle_post_deletetemplates(
+def handle_post_deletetemplates(
     templates: List[str],
     session: Session = Depends(database.session_scope),
     kubeflow_userid: Optional[str] = Header(database.DB_TENANT),
@@ -4,12 +4,13 @@ import sys
 import warnings
 from datetime import datetime
 
-from sqlalchemy import event
+from sqlalchemy import event, func
 
 from projects import models, schemas
+from projects.controllers.deployments.responses import evict_response_window
 from projects.controllers.deployments.runs import RunController
 from projects.controllers.templates import TemplateController
-from projects.controllers.utils import uuid_alpha
+from projects.controllers.utils import update_positions, uuid_alpha
 from projects.controllers.tasks import TaskController
 from projects.exceptions import BadRequest, NotFound
 from projects.utils import now
@@ -287,11 +288,25 @@ class DeploymentController:
             raise NOT_FOUND
 
         self.session.delete(deployment)
+        # the flush fires after_delete, which reads the deployment run index
+        # to terminate the run, so the index row is deleted afterwards
+        self.session.flush()
+        self.session.query(models.DeploymentRun).filter_by(
+            deployment_id=deployment_id
+        ).delete()
+        self.session.query(models.ResponseRollup).filter_by(
+            deployment_id=deployment_id
+        ).delete()
+        self.session.query(models.ResponseRetention).filter_by(
+            deployment_id=deployment_id
+        ).delete()
 
         self.fix_positions(project_id=project_id)
 
         self.session.commit()
 
+        evict_response_window(deployment_id)
+
         return schemas.Message(message="Deployment deleted")
 
     def create_deployments_from_experiments(self, experiments: list, project_id: str):
@@ -329,13 +344,23 @@ class DeploymentController:
 
         deployments = []
 
-        for experiment_id in experiments:
+        # new deployments are added to the end of list, in the given order
+        last_position = (
+            self.session.query(func.max(models.Deployment.position))
+            .filter_by(project_id=project_id)
+            .scalar()
+        )
+        if last_position is None:
+            last_position = -1
+
+        for index, experiment_id in enumerate(experiments, start=1):
             experiment = experiments_dict[experiment_id]
             deployment = models.Deployment(
                 uuid=uuid_alpha(),
                 experiment_id=experiment_id,
                 name=experiment.name,
                 project_id=project_id,
+                position=last_position + index,
                 created_at=now(),
                 updated_at=now()
             )
@@ -348,11 +373,12 @@ class DeploymentController:
                 deployment_id=deployment.uuid, stored_operators=experiment.operators
             )
 
+        if deployments:
             self.fix_positions(
                 project_id=project_id,
-                deployment_id=deployment.uuid,
+                deployment_id=deployments[-1].uuid,
                 new_position=sys.maxsize,
-            )  # will add to end of list
+            )
 
         return deployments
 
@@ -381,33 +407,9 @@ class DeploymentController:
         self.session.add(deployment)
         self.session.flush()
 
-        # save the operators created to get the created_uuid to use on dependencies
-        operators_created = []
-        for task in template.tasks:
-            dependencies = []
-            task_dependencies = task["dependencies"]
-            if len(task_dependencies) > 0:
-                for d in task_dependencies:
-                    op_created = next(
-                        (o for o in operators_created if o["uuid"] == d), None
-                    )
-                    dependencies.append(op_created["created_uuid"])
-
-            operator_id = uuid_alpha()
-            objects = [
-                models.Operator(
-                    uuid=operator_id,
-                    deployment_id=deployment.uuid,
-                    task_id=task["task_id"],
-                    dependencies=dependencies,
-                    position_x=task["position_x"],
-                    position_y=task["position_y"],
-                    status="Setted up",
-                )
-            ]
-            self.session.bulk_save_objects(objects)
-            task["created_uuid"] = operator_id
-            operators_created.append(task)
+        self.template_controller.create_operators_from_template(
+            tasks=template.tasks, deployment_id=deployment.uuid, status="Setted up"
+        )
 
         return [deployment]
 
@@ -609,30 +611,10 @@ class DeploymentController:
         new_position : int
             The position where the experiment is shown.
         """
-        other_deployments = (
-            self.session.query(models.Deployment)
-            .filter_by(project_id=project_id)
-            .filter(models.Deployment.uuid != deployment_id)
-            .order_by(models.Deployment.position.asc())
-            .all()
+        update_positions(
+            self.session,
+            models.Deployment,
+            project_id=project_id,
+            record_uuid=deployment_id,
+            new_position=new_position,
         )
-
-        if deployment_id is not None:
-            deployment = self.session.query(models.Deployment).get(deployment_id)
-            other_deployments.insert(new_position, deployment)
-
-        for index, deployment in enumerate(other_deployments):
-            data = {"position": index}
-            is_last = index == len(other_deployments) - 1
-            # if deployment_id WAS NOT informed, then set the higher position as is_active=True
-            if deployment_id is None and is_last:
-                data["is_active"] = True
-            # if deployment_id WAS informed, then set experiment.is_active=True
-            elif deployment_id is not None and deployment_id == deployment.uuid:
-                data["is_active"] = True
-            else:
-                data["is_active"] = False
-
-            self.session.query(models.Deployment).filter_by(
-                uuid=deployment.uuid
-            ).update(data)
@@ -1,18 +1,218 @@
 # -*- coding: utf-8 -*-
 """Deployment Response controller."""
+import json
+import logging
+import math
 import os
+import queue
+import threading
+import time
 import uuid
+from collections import OrderedDict, deque
+from datetime import datetime, timedelta
+from typing import Optional
 
 import pandas as pd
 import requests
+from sqlalchemy import func
 
-from projects import models
+from projects import models, schemas
 from projects.controllers.utils import uuid_alpha
+from projects.database import Session
+from projects.exceptions import BadRequest, ServiceUnavailable
 
 DEFAULT_BROKER_URL = (
     "http://broker-ingress.knative-eventing.svc.cluster.local/anonymous/default"
 )
 BROKER_URL = os.getenv("BROKER_URL", DEFAULT_BROKER_URL)
+# maximum number of latest responses of a deployment that are sent to the broker
+RESPONSES_WINDOW_SIZE = int(os.getenv("RESPONSES_WINDOW_SIZE", "1000"))
+# seconds a window is used before it is reloaded from the database. Records
+# saved by other replicas are only added to a window when it is reloaded.
+RESPONSES_WINDOW_TTL = float(os.getenv("RESPONSES_WINDOW_TTL", "60"))
+# maximum number of deployments whose windows are kept, least recently used are dropped
+RESPONSES_MAX_WINDOWS = int(os.getenv("RESPONSES_MAX_WINDOWS", "1000"))
+
+# "sync" saves responses within the request, "batch" buffers them and
+# saves them in micro-batches
+RESPONSES_INGESTION_MODE = os.getenv("RESPONSES_INGESTION_MODE", "sync")
+RESPONSES_QUEUE_SIZE = int(os.getenv("RESPONSES_QUEUE_SIZE", "10000"))
+RESPONSES_BATCH_SIZE = int(os.getenv("RESPONSES_BATCH_SIZE", "500"))
+RESPONSES_FLUSH_INTERVAL = float(os.getenv("RESPONSES_FLUSH_INTERVAL", "1.0"))
+# attempts to save a micro-batch before it is dropped
+RESPONSES_SAVE_ATTEMPTS = int(os.getenv("RESPONSES_SAVE_ATTEMPTS", "3"))
+
+# responses older than this are deleted, unless the deployment has its own
+# retention. 0 keeps responses forever.
+RESPONSES_RETENTION_DAYS = int(os.getenv("RESPONSES_RETENTION_DAYS", "0"))
+
+GRANULARITIES = ["hour", "day"]
+
+INVALID_GRANULARITY = BadRequest(
+    code="InvalidGranularity",
+    message=f"Granularity must be one of {GRANULARITIES}",
+)
+QUEUE_FULL = ServiceUnavailable(
+    code="ResponsesQueueFull",
+    message="Too many responses are waiting to be saved. Try again later.",
+)
+
+# Sliding windows with the latest responses of each deployment, so that the
+# whole history is not read from the database at every logger call.
+# A window is loaded from the database the first time it is used, and again
+# every RESPONSES_WINDOW_TTL seconds to include records of other replicas.
+_WINDOWS = OrderedDict()
+_WINDOWS_LOCK = threading.Lock()
+
+
+class ResponseWindow:
+    """
+    The latest responses of a deployment. The lock of a window is held while
+    it is loaded and read, so deployments don't wait for each other.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.records = None
+        self.loaded_at = 0.0
+
+
+def get_response_window(deployment_id: str):
+    """
+    Returns the window of a deployment, creating an empty one if needed.
+
+    Parameters
+    ----------
+    deployment_id : str
+
+    Returns
+    -------
+    ResponseWindow
+    """
+    with _WINDOWS_LOCK:
+        window = _WINDOWS.get(deployment_id)
+        if window is None:
+            window = ResponseWindow()
+            _WINDOWS[deployment_id] = window
+            while len(_WINDOWS) > RESPONSES_MAX_WINDOWS:
+                _WINDOWS.popitem(last=False)
+        else:
+            _WINDOWS.move_to_end(deployment_id)
+        return window
+
+
+def evict_response_window(deployment_id: str):
+    """
+    Discards the window of a deployment.
+
+    Parameters
+    ----------
+    deployment_id : str
+    """
+    with _WINDOWS_LOCK:
+        _WINDOWS.pop(deployment_id, None)
+
+
+def clear_response_windows():
+    """
+    Discards the sliding windows of all deployments.
+    """
+    with _WINDOWS_LOCK:
+        _WINDOWS.clear()
+
+
+def parse_response_body(body: dict):
+    """
+    Parses the body sent by seldon logger into a list of records.
+
+    Parameters
+    ----------
+    body : dict
+
+    Returns
+    -------
+    list
+    """
+    if "data" in body:
+        ndarray = pd.DataFrame(body["data"]["ndarray"])
+        if "names" in body["data"]:
+            names = body["data"]["names"]
+            ndarray.columns = names
+        body = ndarray.to_dict(orient="records")
+
+    if isinstance(body, dict):
+        body = [body]
+
+    return body
+
+
+def truncate_period(value: datetime, granularity: str):
+    """
+    Returns the start of the hour or day of a datetime.
+
+    Parameters
+    ----------
+    value : datetime
+    granularity : str
+
+    Returns
+    -------
+    datetime
+    """
+    if granularity == "day":
+        return value.replace(hour=0, minute=0, second=0, microsecond=0)
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def summarize_record(summary: dict, record: dict):
+    """
+    Adds the numeric values of a record to a summary of count, sum, min and max
+    of each column.
+
+    Parameters
+    ----------
+    summary : dict
+    record : dict
+    """
+    if not isinstance(record, dict):
+        return
+
+    for column, value in record.items():
+        if (
+            isinstance(value, bool)
+            or not isinstance(value, (int, float))
+            or not math.isfinite(value)
+        ):
+            continue
+
+        stats = summary.get(column)
+        if stats is None:
+            summary[column] = {"count": 1, "sum": value, "min": value, "max": value}
+        else:
+            stats["count"] += 1
+            stats["sum"] += value
+            stats["min"] = min(stats["min"], value)
+            stats["max"] = max(stats["max"], value)
+
+
+def merge_summaries(summary: dict, other: dict):
+    """
+    Adds the column statistics of another summary to a summary.
+
+    Parameters
+    ----------
+    summary : dict
+    other : dict
+    """
+    for column, other_stats in other.items():
+        stats = summary.get(column)
+        if stats is None:
+            summary[column] = dict(other_stats)
+        else:
+            stats["count"] += other_stats["count"]
+            stats["sum"] += other_stats["sum"]
+            stats["min"] = min(stats["min"], other_stats["min"])
+            stats["max"] = max(stats["max"], other_stats["max"])
 
 
 class ResponseController:
@@ -28,44 +228,101 @@ class ResponseController:
         deployment_id : str
         body : dict
         """
-        if "data" in body:
-            ndarray = pd.DataFrame(body["data"]["ndarray"])
-            if "names" in body["data"]:
-                names = body["data"]["names"]
-                ndarray.columns = names
-            body = ndarray.to_dict(orient="records")
+        records = parse_response_body(body)
 
-        if isinstance(body, dict):
-            body = [body]
+        self.save_responses([(deployment_id, records)])
+        self.send_to_broker(deployment_id, records)
 
-        responses = []
+    def enqueue_response(self, deployment_id: str, body: dict):
+        """
+        Adds the records of a response to the buffer, to be saved in a micro-batch.
 
-        for record in body:
-            responses.append(
-                models.Response(
-                    uuid=uuid_alpha(),
-                    deployment_id=deployment_id,
-                    body=record,
-                )
-            )
+        Parameters
+        ----------
+        deployment_id : str
+        body : dict
+
+        Raises
+        ------
+        ServiceUnavailable
+            When the buffer is full.
+        """
+        records = parse_response_body(body)
+        RESPONSE_BUFFER.put(deployment_id, records)
 
-        self.session.bulk_save_objects(responses)
+    def save_responses(self, responses: list):
+        """
+        Inserts the records of many responses in a single statement.
+
+        Parameters
+        ----------
+        responses : list
+            A list of (deployment_id, records) tuples.
+        """
+        mappings = [
+            {
+                "uuid": uuid_alpha(),
+                "deployment_id": deployment_id,
+                "body": record,
+                "created_at": datetime.utcnow(),
+            }
+            for deployment_id, records in responses
+            for record in records
+        ]
+        self.session.bulk_insert_mappings(models.Response, mappings)
         self.session.commit()
 
-        responses = (
-            self.session.query(models.Response)
-            .filter_by(deployment_id=deployment_id)
-            .order_by(models.Response.created_at.asc())
-            .all()
-        )
+    def remove_unknown_deployments(self, responses: list):
+        """
+        Removes the responses of deployments that do not exist.
 
-        d = []
+        Parameters
+        ----------
+        responses : list
+            A list of (deployment_id, records) tuples.
 
-        if len(responses) > 0:
-            for response in responses:
-                d.append(response.body)
+        Returns
+        -------
+        list
+        """
+        deployment_ids = {deployment_id for deployment_id, _ in responses}
+        existing = {
+            uuid
+            for (uuid,) in self.session.query(models.Deployment.uuid).filter(
+                models.Deployment.uuid.in_(deployment_ids)
+            )
+        }
+        for deployment_id in deployment_ids - existing:
+            logging.warning(f"Dropped responses of unknown deployment {deployment_id}")
+        return [response for response in responses if response[0] in existing]
 
-        data = pd.DataFrame(d)
+    def send_to_broker(self, deployment_id: str, records: list):
+        """
+        Adds the new records to the window of a deployment and sends the
+        window to the broker. Expects the records to be already saved.
+
+        Parameters
+        ----------
+        deployment_id : str
+        records : list
+        """
+        window = get_response_window(deployment_id)
+        with window.lock:
+            if (
+                window.records is None
+                or time.monotonic() - window.loaded_at >= RESPONSES_WINDOW_TTL
+            ):
+                # the window loaded from the database already has the new records
+                window.records = deque(
+                    self.list_latest_bodies(deployment_id), maxlen=RESPONSES_WINDOW_SIZE
+                )
+                window.loaded_at = time.monotonic()
+            else:
+                # keeps records as they are read from the JSON column
+                window.records.extend(
+                    json.loads(json.dumps(record)) for record in records
+                )
+            data = pd.DataFrame(list(window.records))
 
         # sends latest data to broker
         response = requests.post(
@@ -84,3 +341,390 @@ class ResponseController:
             },
         )
         response.raise_for_status()
+
+    def list_latest_bodies(self, deployment_id: str):
+        """
+        Lists the bodies of the latest responses of a deployment, oldest first.
+
+        Parameters
+        ----------
+        deployment_id : str
+
+        Returns
+        -------
+        list
+        """
+        rows = (
+            self.session.query(models.Response.body)
+            .filter_by(deployment_id=deployment_id)
+            .order_by(models.Response.created_at.desc())
+            .limit(RESPONSES_WINDOW_SIZE)
+            .all()
+        )
+        return [body for (body,) in reversed(rows)]
+
+    def list_rollups(
+        self,
+        deployment_id: str,
+        granularity: Optional[str] = "hour",
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ):
+        """
+        Lists the precomputed hourly or daily rollups of a deployment.
+
+        Parameters
+        ----------
+        deployment_id : str
+        granularity : str
+            Either "hour" or "day".
+        start : datetime
+            Lists rollups whose period starts at or after this time.
+        end : datetime
+            Lists rollups whose period starts before this time.
+
+        Returns
+        -------
+        projects.schemas.response.ResponseRollupList
+
+        Raises
+        ------
+        BadRequest
+            When granularity is invalid.
+        """
+        if granularity not in GRANULARITIES:
+            raise INVALID_GRANULARITY
+
+        query = self.session.query(models.ResponseRollup).filter_by(
+            deployment_id=deployment_id, granularity=granularity
+        )
+        if start is not None:
+            query = query.filter(models.ResponseRollup.period_start >= start)
+        if end is not None:
+            query = query.filter(models.ResponseRollup.period_start < end)
+
+        rollups = query.order_by(models.ResponseRollup.period_start).all()
+        return schemas.ResponseRollupList.from_orm(rollups, len(rollups))
+
+    def rollup_responses(self, now: Optional[datetime] = None):
+        """
+        Computes the hourly and daily rollups of the responses of all deployments.
+
+        Hours are recomputed from the latest hourly rollup, which may have
+        been computed before its hour ended. Days are recomputed from the
+        hourly rollups, so they stay available after raw responses expire.
+
+        Parameters
+        ----------
+        now : datetime
+        """
+        now = now or datetime.utcnow()
+
+        start = (
+            self.session.query(func.max(models.ResponseRollup.period_start))
+            .filter_by(granularity="hour")
+            .scalar()
+        )
+        if start is None:
+            start = self.session.query(func.min(models.Response.created_at)).scalar()
+            if start is None:
+                return
+        start = truncate_period(start, "hour")
+
+        rows = (
+            self.session.query(
+                models.Response.deployment_id,
+                models.Response.created_at,
+                models.Response.body,
+            )
+            .filter(models.Response.created_at >= start)
+            .execution_options(stream_results=True)
+            .yield_per(1000)
+        )
+        hourly = {}
+        for deployment_id, created_at, body in rows:
+            key = (deployment_id, truncate_period(created_at, "hour"))
+            rollup = hourly.setdefault(key, {"count": 0, "summary": {}})
+            rollup["count"] += 1
+            summarize_record(rollup["summary"], body)
+        self.replace_rollups("hour", start, hourly, now)
+
+        day_start = truncate_period(start, "day")
+        rows = (
+            self.session.query(models.ResponseRollup)
+            .filter_by(granularity="hour")
+            .filter(models.ResponseRollup.period_start >= day_start)
+        )
+        daily = {}
+        for hour in rows:
+            key = (hour.deployment_id, truncate_period(hour.period_start, "day"))
+            rollup = daily.setdefault(key, {"count": 0, "summary": {}})
+            rollup["count"] += hour.count
+            merge_summaries(rollup["summary"], hour.summary)
+        self.replace_rollups("day", day_start, daily, now)
+
+        self.session.commit()
+
+    def replace_rollups(
+        self, granularity: str, start: datetime, rollups: dict, now: datetime
+    ):
+        """
+        Replaces the rollups of the periods that start at or after a time.
+
+        Parameters
+        ----------
+        granularity : str
+        start : datetime
+        rollups : dict
+            A map of (deployment_id, period_start) to its count and summary.
+        now : datetime
+        """
+        self.session.query(models.ResponseRollup).filter_by(
+            granularity=granularity
+        ).filter(models.ResponseRollup.period_start >= start).delete(
+            synchronize_session=False
+        )
+        self.session.bulk_insert_mappings(
+            models.ResponseRollup,
+            [
+                {
+                    "deployment_id": deployment_id,
+                    "granularity": granularity,
+                    "period_start": period_start,
+                    "count": rollup["count"],
+                    "summary": rollup["summary"],
+                    "updated_at": now,
+                }
+                for (deployment_id, period_start), rollup in rollups.items()
+            ],
+        )
+
+    def update_retention(
+        self,
+        deployment_id: str,
+        retention: schemas.ResponseRetentionUpdate,
+    ):
+        """
+        Sets for how many days the responses of a deployment are kept.
+
+        Parameters
+        ----------
+        deployment_id : str
+        retention : projects.schemas.response.ResponseRetentionUpdate
+
+        Returns
+        -------
+        projects.schemas.response.ResponseRetention
+        """
+        model = self.session.merge(
+            models.ResponseRetention(
+                deployment_id=deployment_id,
+                retention_days=retention.retention_days,
+            )
+        )
+        self.session.commit()
+        return schemas.ResponseRetention.from_orm(model)
+
+    def delete_expired_responses(self, now: Optional[datetime] = None):
+        """
+        Deletes the responses older than the retention of their deployments.
+        Rollups are kept.
+
+        Parameters
+        ----------
+        now : datetime
+
+        Returns
+        -------
+        int
+            The number of responses deleted.
+        """
+        now = now or datetime.utcnow()
+        retentions = dict(
+            self.session.query(
+                models.ResponseRetention.deployment_id,
+                models.ResponseRetention.retention_days,
+            ).all()
+        )
+
+        deleted = 0
+        if RESPONSES_RETENTION_DAYS > 0:
+            cutoff = now - timedelta(days=RESPONSES_RETENTION_DAYS)
+            query = self.session.query(models.Response).filter(
+                models.Response.created_at < cutoff
+            )
+            if retentions:
+                query = query.filter(
+                    models.Response.deployment_id.notin_(list(retentions))
+                )
+            deleted += query.delete(synchronize_session=False)
+
+        for deployment_id, retention_days in retentions.items():
+            if retention_days > 0:
+                cutoff = now - timedelta(days=retention_days)
+                deleted += (
+                    self.session.query(models.Response)
+                    .filter(models.Response.deployment_id == deployment_id)
+                    .filter(models.Response.created_at < cutoff)
+                    .delete(synchronize_session=False)
+                )
+
+        self.session.commit()
+        return deleted
+
+
+class ResponseBuffer:
+    """
+    A bounded buffer of responses, flushed by a background thread in
+    micro-batches of RESPONSES_BATCH_SIZE records or every
+    RESPONSES_FLUSH_INTERVAL seconds, whichever comes first.
+
+    Parameters
+    ----------
+    session_factory : callable
+        Creates the sessions used to save the batches.
+    """
+
+    def __init__(self, session_factory=Session):
+        self.session_factory = session_factory
+        self.queue = queue.Queue(maxsize=RESPONSES_QUEUE_SIZE)
+        self._flush_lock = threading.Lock()
+        self._thread = None
+        self._thread_lock = threading.Lock()
+
+    def put(self, deployment_id: str, records: list):
+        """
+        Adds records to the buffer without blocking.
+
+        Parameters
+        ----------
+        deployment_id : str
+        records : list
+
+        Raises
+        ------
+        ServiceUnavailable
+            When the buffer is full.
+        """
+        self.start()
+        try:
+            self.queue.put_nowait((deployment_id, records))
+        except queue.Full:
+            raise QUEUE_FULL
+
+    def start(self):
+        """
+        Starts the background thread that flushes the buffer, if not running.
+        """
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="responses-flusher", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            try:
+                self.flush(timeout=RESPONSES_FLUSH_INTERVAL)
+            except Exception as e:
+                logging.exception(e)
+
+    def flush(self, timeout: float = 0):
+        """
+        Saves a micro-batch of buffered responses and sends one broker event
+        per deployment in the batch.
+
+        Parameters
+        ----------
+        timeout : float
+            Seconds to wait for the batch to fill up.
+
+        Returns
+        -------
+        int
+            The number of records taken from the buffer.
+        """
+        with self._flush_lock:
+            batch = []
+            size = 0
+            deadline = time.monotonic() + timeout
+            while size < RESPONSES_BATCH_SIZE:
+                try:
+                    remaining = deadline - time.monotonic()
+                    if remaining > 0:
+                        item = self.queue.get(timeout=remaining)
+                    else:
+                        item = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                batch.append(item)
+                size += len(item[1])
+
+            if not batch:
+                return 0
+
+            session = self.session_factory()
+            try:
+                controller = ResponseController(session)
+                batch = controller.remove_unknown_deployments(batch)
+
+                records_by_deployment = OrderedDict()
+                if batch and self.save_batch(session, batch):
+                    for deployment_id, records in batch:
+                        records_by_deployment.setdefault(deployment_id, []).extend(
+                            records
+                        )
+
+                for deployment_id, records in records_by_deployment.items():
+                    try:
+                        controller.send_to_broker(deployment_id, records)
+                    except Exception as e:
+                        logging.exception(e)
+            finally:
+                session.close()
+
+            return size
+
+    def save_batch(self, session, batch: list):
+        """
+        Saves a micro-batch, trying RESPONSES_SAVE_ATTEMPTS times.
+
+        Parameters
+        ----------
+        session : sqlalchemy.orm.session.Session
+        batch : list
+            A list of (deployment_id, records) tuples.
+
+        Returns
+        -------
+        bool
+            Whether the batch was saved.
+        """
+        size = sum(len(records) for _, records in batch)
+        for attempt in range(1, RESPONSES_SAVE_ATTEMPTS + 1):
+            try:
+                ResponseController(session).save_responses(batch)
+                return True
+            except Exception:
+                session.rollback()
+                if attempt == RESPONSES_SAVE_ATTEMPTS:
+                    logging.exception(
+                        f"Dropped a batch of {size} responses after {attempt} attempts"
+                    )
+                    return False
+                logging.warning(
+                    f"Could not save a batch of {size} responses (attempt {attempt})"
+                )
+                time.sleep(min(2 ** attempt * 0.1, RESPONSES_FLUSH_INTERVAL))
+        return False
+
+    def drain(self):
+        """
+        Flushes all buffered responses.
+        """
+        while self.flush() > 0:
+            pass
+
+
+RESPONSE_BUFFER = ResponseBuffer()
@@ -1,7 +1,12 @@
 # -*- coding: utf-8 -*-
 """Deployments Runs controller."""
+from datetime import timezone
+from typing import Optional
+
+import dateutil.parser
 from kubernetes import client
 from kubernetes.client.rest import ApiException
+from sqlalchemy import select
 
 from projects import models, schemas
 from projects.exceptions import BadRequest, NotFound
@@ -38,20 +43,33 @@ class RunController:
         except (ApiException, ValueError):
             raise NOT_FOUND
 
-    def list_runs(self, deployment_id: str):
+    def list_runs(
+        self,
+        deployment_id: str,
+        page_size: Optional[int] = 10,
+        page_token: Optional[str] = None,
+    ):
         """
-        Lists all runs under a deployment.
+        Lists a page of runs under a deployment, the most recent first.
 
         Parameters
         ----------
         deployment_id : str
+        page_size : int
+            The page size. Default value is 10.
+        page_token : str
+            The nextPageToken of the previous page. None lists the first page.
 
         Returns
         -------
         projects.schemas.run.RunList
         """
-        runs = kfp_runs.list_runs(experiment_id=deployment_id)
-        return schemas.RunList.from_orm(runs, len(runs))
+        runs, total, next_page_token = kfp_runs.list_runs(
+            experiment_id=deployment_id,
+            page_size=page_size,
+            page_token=page_token,
+        )
+        return schemas.RunList.from_orm(runs, total, next_page_token)
 
     def create_run(self, deployment_id: str):
         """
@@ -99,6 +117,10 @@ class RunController:
         """
         Starts a new run in Kubeflow Pipelines.
 
+        The run is added to the deployment runs index, but the session is not
+        committed: the caller must commit it, or the index keeps the previous
+        run of the deployment (see DeploymentController.create_deployments_from_experiments).
+
         Parameters
         ----------
         deployment : projects.models.deployment.Deployment
@@ -140,8 +162,48 @@ class RunController:
         for operator in deployment.operators:
             self.session.expunge(operator)
 
+        self.save_deployment_run(
+            deployment_id=deployment.uuid,
+            run_id=run["uuid"],
+            experiment_id=deployment.uuid,
+            name=deployment.name,
+            status="Running",
+            created_at=run["createdAt"],
+        )
+
         return schemas.Run.from_orm(run)
 
+    def save_deployment_run(
+        self, deployment_id, run_id, experiment_id, name, status, created_at
+    ):
+        """
+        Saves the latest run of a deployment in the deployment runs index.
+        The caller commits the session.
+
+        Parameters
+        ----------
+        deployment_id : str
+        run_id : str
+        experiment_id : str
+            The name of the KFP experiment of the run.
+        name : str
+        status : str
+        created_at : datetime.datetime
+        """
+        if created_at.tzinfo is not None:
+            created_at = created_at.astimezone(timezone.utc).replace(tzinfo=None)
+
+        self.session.merge(
+            models.DeploymentRun(
+                deployment_id=deployment_id,
+                run_id=run_id,
+                experiment_id=experiment_id,
+                name=name,
+                status=status,
+                created_at=created_at,
+            )
+        )
+
     def get_run(self, deployment_id: str):
         """
         Details a run in Kubeflow Pipelines.
@@ -159,14 +221,43 @@ class RunController:
         NotFound
             When any of project_id, deployment_id, or run_id does not exist.
         """
-        run = get_deployment_runs(deployment_id)
-
-        return run
+        deployment_run = self.session.query(models.DeploymentRun).get(deployment_id)
+
+        if deployment_run is None:
+            # deployments deployed before the index existed are found by
+            # scanning the KFP runs once, then added to the index
+            run = get_deployment_runs(deployment_id)
+            if run:
+                self.save_deployment_run(
+                    deployment_id=deployment_id,
+                    run_id=run["runId"],
+                    experiment_id=run["experimentId"],
+                    name=run["name"],
+                    status=run["status"],
+                    created_at=dateutil.parser.isoparse(run["createdAt"]),
+                )
+                self.session.commit()
+            return run
+
+        created_at = deployment_run.created_at.isoformat(timespec="milliseconds")
+        return {
+            "experimentId": deployment_run.experiment_id,
+            "name": deployment_run.name,
+            "deploymentId": deployment_run.deployment_id,
+            "status": deployment_run.status,
+            "createdAt": f"{created_at}Z",
+            "runId": deployment_run.run_id,
+            "url": get_seldon_deployment_url(deployment_id),
+        }
 
     def terminate_run(self, deployment_id):
         """
         Terminates a run in Kubeflow Pipelines.
 
+        The deployment run index is read, but not changed, so this method may
+        also be called with the connection of a flush (see
+        DeploymentController.after_delete).
+
         Parameters
         ----------
         deployment_id : str
@@ -199,17 +290,54 @@ class RunController:
                         namespace=deployment["metadata"]["namespace"],
                     )
 
-        deployment_run = get_deployment_runs(deployment_id)
+        # a core select works with both a Session and a Connection
+        run_id = self.session.execute(
+            select([models.DeploymentRun.run_id]).where(
+                models.DeploymentRun.deployment_id == deployment_id
+            )
+        ).scalar()
+
+        if run_id is None:
+            # deployments deployed before the index existed
+            deployment_run = get_deployment_runs(deployment_id)
+            if deployment_run:
+                run_id = deployment_run["runId"]
 
-        if not deployment_run:
+        if run_id is None:
             raise NotFound(
                 code="RunNotFound", message="The specified run does not exist."
             )
 
-        kfp_client().runs.delete_run(deployment_run["runId"])
+        kfp_client().runs.delete_run(run_id)
 
         return schemas.Message(message="Deployment deleted")
 
+    def delete_run(self, deployment_id):
+        """
+        Terminates the run of a deployment and removes it from the deployment run index.
+
+        Parameters
+        ----------
+        deployment_id : str
+
+        Returns
+        -------
+        projects.schemas.message.Message
+
+        Raises
+        ------
+        NotFound
+            When deployment run does not exist.
+        """
+        message = self.terminate_run(deployment_id=deployment_id)
+
+        self.session.query(models.DeploymentRun).filter_by(
+            deployment_id=deployment_id
+        ).delete()
+        self.session.commit()
+
+        return message
+
     def remove_non_deployable_operators(self, operators):
         """
         Removes operators that are not part of the deployment pipeline.
@@ -1,13 +1,19 @@
 # -*- coding: utf-8 -*-
 """Experiments controller."""
 import sys
+import warnings
 from datetime import datetime
 from typing import Optional
 
+from kfp_server_api.rest import ApiException
+from sqlalchemy import event
+
 from projects import models, schemas
 from projects.controllers.operators import OperatorController
-from projects.controllers.utils import uuid_alpha
+from projects.controllers.templates import TemplateController
+from projects.controllers.utils import update_positions, uuid_alpha
 from projects.exceptions import BadRequest, NotFound
+from projects.kfp.pipeline import delete_pipeline
 from projects.utils import now
 
 NOT_FOUND = NotFound(
@@ -19,6 +25,23 @@ class ExperimentController:
     def __init__(self, session):
         self.session = session
         self.operator_controller = OperatorController(session)
+        self.template_controller = TemplateController(session)
+
+    @staticmethod
+    @event.listens_for(models.Experiment, "after_delete")
+    def after_delete(_mapper, _connection, target):
+        """
+        Deletes the KFP pipeline and pipeline versions of target experiment.
+        Parameters
+        ----------
+        _mapper : sqlalchemy.orm.Mapper
+        connection : sqlalchemy.engine.Connection
+        target : models.Experiment
+        """
+        try:
+            delete_pipeline(name=f"experiment-{target.uuid}")
+        except ApiException as e:
+            warnings.warn(f"Could not delete pipeline of experiment {target.uuid}: {e}")
 
     def raise_if_experiment_does_not_exist(self, experiment_id: str):
         """
@@ -296,39 +319,10 @@ class ExperimentController:
         self.session.add(experiment)
         self.session.flush()
 
-        # Creates a dict to map source operator_id to its copy operator_id.
-        # This map will be used to build the dependencies using new operator_ids
-        copies_map = {}
-
-        for stored_operator in stored_experiment.operators:
-            operator = schemas.OperatorCreate(
-                task_id=stored_operator.task_id,
-                experiment_id=experiment.uuid,
-                parameters=stored_operator.parameters,
-                position_x=stored_operator.position_x,
-                position_y=stored_operator.position_y,
-            )
-            operator = self.operator_controller.create_operator(
-                operator=operator, experiment_id=experiment.uuid
-            )
-
-            copies_map[stored_operator.uuid] = {
-                "copy_uuid": operator.uuid,
-                "dependencies": stored_operator.dependencies,
-            }
-
-        # sets dependencies on new operators
-        for _, value in copies_map.items():
-            operator = schemas.OperatorUpdate(
-                dependencies=[
-                    copies_map[d]["copy_uuid"] for d in value["dependencies"]
-                ],
-            )
-            self.operator_controller.update_operator(
-                experiment_id=experiment.uuid,
-                operator_id=value["copy_uuid"],
-                operator=operator,
-            )
+        self.operator_controller.copy_operators(
+            stored_operators=stored_experiment.operators,
+            experiment_id=experiment.uuid,
+        )
 
         return experiment
 
@@ -356,32 +350,9 @@ class ExperimentController:
             models.Operator.experiment_id == experiment_id
         ).delete()
 
-        # save the operators created to get the created_uuid to use on dependencies
-        operators_created = []
-        for task in template.tasks:
-            dependencies = []
-            task_dependencies = task["dependencies"]
-            if len(task_dependencies) > 0:
-                for d in task_dependencies:
-                    op_created = next(
-                        (o for o in operators_created if o["uuid"] == d), None
-                    )
-                    dependencies.append(op_created["created_uuid"])
-
-            operator_id = uuid_alpha()
-            objects = [
-                models.Operator(
-                    uuid=operator_id,
-                    experiment_id=experiment_id,
-                    task_id=task["task_id"],
-                    dependencies=dependencies,
-                    position_x=task["position_x"],
-                    position_y=task["position_y"],
-                )
-            ]
-            self.session.bulk_save_objects(objects)
-            task["created_uuid"] = operator_id
-            operators_created.append(task)
+        self.template_controller.create_operators_from_template(
+            tasks=template.tasks, experiment_id=experiment_id
+        )
 
         self.session.commit()
 
@@ -405,30 +376,10 @@ class ExperimentController:
         new_position : int
             The position where the experiment is shown.
         """
-        other_experiments = (
-            self.session.query(models.Experiment)
-            .filter_by(project_id=project_id)
-            .filter(models.Experiment.uuid != experiment_id)
-            .order_by(models.Experiment.position.asc())
-            .all()
+        update_positions(
+            self.session,
+            models.Experiment,
+            project_id=project_id,
+            record_uuid=experiment_id,
+            new_position=new_position,
         )
-
-        if experiment_id is not None:
-            experiment = self.session.query(models.Experiment).get(experiment_id)
-            other_experiments.insert(new_position, experiment)
-
-        for index, experiment in enumerate(other_experiments):
-            data = {"position": index}
-            is_last = index == len(other_experiments) - 1
-            # if experiment_id WAS NOT informed, then set the higher position as is_active=True
-            if experiment_id is None and is_last:
-                data["is_active"] = True
-            # if experiment_id WAS informed, then set experiment.is_active=True
-            elif experiment_id is not None and experiment_id == experiment.uuid:
-                data["is_active"] = True
-            else:
-                data["is_active"] = False
-
-            self.session.query(models.Experiment).filter_by(
-                uuid=experiment.uuid
-            ).update(data)
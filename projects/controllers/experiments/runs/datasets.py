@@ -1,9 +1,15 @@
 # -*- coding: utf-8 -*-
 """Experiments Datasets controller."""
+import logging
+import os
+import shutil
+import threading
+import uuid
 from typing import Optional
 
-import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from fastapi.responses import StreamingResponse
 from platiagro import load_dataset, stat_dataset
 
@@ -11,6 +17,14 @@ from projects import models
 from projects.exceptions import NotFound
 from projects.kfp.runs import get_latest_run_id
 
+# local directory of the columnar cache of run datasets. The cache is disabled when empty.
+DATASETS_CACHE_DIR = os.getenv("DATASETS_CACHE_DIR", "")
+DATASETS_CACHE_ROW_GROUP_SIZE = int(os.getenv("DATASETS_CACHE_ROW_GROUP_SIZE", "1000"))
+# least recently used datasets are removed when the cache is larger than this
+DATASETS_CACHE_MAX_BYTES = int(os.getenv("DATASETS_CACHE_MAX_BYTES", str(1024 ** 3)))
+
+_CACHE_LOCK = threading.Lock()
+
 
 class DatasetController:
     def __init__(self, session):
@@ -53,6 +67,12 @@ class DatasetController:
 
         name = self.get_dataset_name(operator_id, experiment_id)
 
+        if DATASETS_CACHE_DIR:
+            cache_path = self.get_cache_path(name, run_id, operator_id)
+            if os.path.exists(cache_path):
+                dataset, total = self.read_cached_page(cache_path, page, page_size)
+                return self.format_page(dataset, total)
+
         try:
             metadata = stat_dataset(name=name, operator_id=operator_id, run_id=run_id)
         except FileNotFoundError:
@@ -61,25 +81,194 @@ class DatasetController:
                 message="The specified run does not contain dataset",
             )
 
-        dataset = load_dataset(
-            name=name,
-            run_id=run_id,
-            operator_id=operator_id,
-            page=page,
-            page_size=page_size,
-        )
+        if DATASETS_CACHE_DIR:
+            # the whole dataset is loaded once and later pages are read from the cache
+            dataset = load_dataset(name=name, run_id=run_id, operator_id=operator_id)
+            if isinstance(dataset, pd.DataFrame):
+                if self.write_cache(cache_path, dataset):
+                    dataset, total = self.read_cached_page(cache_path, page, page_size)
+                    return self.format_page(dataset, total)
+
+                # datasets that can't be cached are paged in memory
+                total = len(dataset.index)
+                if page_size != -1:
+                    dataset = dataset.iloc[(page - 1) * page_size:page * page_size]
+                return self.format_page(dataset, total)
+        else:
+            dataset = load_dataset(
+                name=name,
+                run_id=run_id,
+                operator_id=operator_id,
+                page=page,
+                page_size=page_size,
+            )
+
         if isinstance(dataset, pd.DataFrame):
-            # Replaces NaN value by a text "NaN" so JSON encode doesn't fail
-            dataset.replace(np.nan, "NaN", inplace=True, regex=True)
-            data = dataset.to_dict(orient="split")
             total = metadata.get("total", len(dataset.index))
-            return {"columns": data["columns"], "data": data["data"], "total": total}
+            return self.format_page(dataset, total)
 
         return StreamingResponse(
             dataset,
             media_type="application/octet-stream",
         )
 
+    def format_page(self, dataset, total):
+        """
+        Formats a page of a dataset as columns, data and total.
+
+        Parameters
+        ----------
+        dataset : pandas.DataFrame
+        total : int
+
+        Returns
+        -------
+        dict
+        """
+        # Replaces NaN value by a text "NaN" so JSON encode doesn't fail
+        mask = dataset.isna()
+        if mask.values.any():
+            dataset = dataset.astype(object).mask(mask, "NaN")
+        data = dataset.to_dict(orient="split")
+        return {"columns": data["columns"], "data": data["data"], "total": total}
+
+    def get_cache_path(self, name, run_id, operator_id):
+        """
+        Returns the path of the cached dataset of a run.
+
+        Parameters
+        ----------
+        name : str
+        run_id : str
+        operator_id : str
+
+        Returns
+        -------
+        str
+        """
+        return os.path.join(DATASETS_CACHE_DIR, run_id, operator_id, f"{name}.parquet")
+
+    def write_cache(self, path, dataset):
+        """
+        Writes a dataset to the cache as a Parquet file with row groups of
+        DATASETS_CACHE_ROW_GROUP_SIZE rows.
+
+        Parameters
+        ----------
+        path : str
+        dataset : pandas.DataFrame
+
+        Returns
+        -------
+        bool
+            Whether the dataset could be cached. Datasets whose columns have
+            mixed types are not cached.
+        """
+        if not all(isinstance(column, str) for column in dataset.columns):
+            return False
+
+        try:
+            table = pa.Table.from_pandas(dataset, preserve_index=False)
+        except (pa.ArrowException, TypeError, ValueError) as e:
+            logging.info(f"Dataset not cached: {e}")
+            return False
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # a temporary file avoids that concurrent requests read a partial file
+        tmp_path = f"{path}.{uuid.uuid4()}.tmp"
+        pq.write_table(table, tmp_path, row_group_size=DATASETS_CACHE_ROW_GROUP_SIZE)
+        os.replace(tmp_path, path)
+
+        self.prune_cache()
+        return True
+
+    def read_cached_page(self, path, page, page_size):
+        """
+        Reads a page of a cached dataset. Only the row groups that contain
+        the page are read.
+
+        Parameters
+        ----------
+        path : str
+        page : int
+            The page number. First page is 1.
+        page_size : int
+            The page size. -1 reads all rows.
+
+        Returns
+        -------
+        tuple
+            The page as a pandas.DataFrame and the total number of rows.
+        """
+        parquet_file = pq.ParquetFile(path, memory_map=True)
+        metadata = parquet_file.metadata
+        total = metadata.num_rows
+
+        if page_size == -1:
+            start, end = 0, total
+        else:
+            start = (page - 1) * page_size
+            end = min(start + page_size, total)
+
+        row_groups = []
+        first_row = None
+        offset = 0
+        for index in range(metadata.num_row_groups):
+            num_rows = metadata.row_group(index).num_rows
+            if offset < end and offset + num_rows > start:
+                row_groups.append(index)
+                if first_row is None:
+                    first_row = offset
+            offset += num_rows
+
+        if not row_groups:
+            return parquet_file.schema_arrow.empty_table().to_pandas(), total
+
+        # marks the file as recently used
+        os.utime(path)
+
+        dataset = parquet_file.read_row_groups(row_groups).to_pandas()
+        dataset = dataset.iloc[start - first_row:end - first_row]
+        return dataset, total
+
+    def prune_cache(self):
+        """
+        Removes the least recently used datasets while the cache is larger
+        than DATASETS_CACHE_MAX_BYTES.
+        """
+        with _CACHE_LOCK:
+            files = []
+            for directory, _, filenames in os.walk(DATASETS_CACHE_DIR):
+                for filename in filenames:
+                    if filename.endswith(".parquet"):
+                        path = os.path.join(directory, filename)
+                        stat = os.stat(path)
+                        files.append((stat.st_mtime, stat.st_size, path))
+
+            size = sum(file_size for _, file_size, _ in files)
+            for _, file_size, path in sorted(files):
+                if size <= DATASETS_CACHE_MAX_BYTES:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                size -= file_size
+
+    def remove_cache(self, run_id):
+        """
+        Removes the cached datasets of a run.
+
+        Parameters
+        ----------
+        run_id : str
+        """
+        if not DATASETS_CACHE_DIR or not run_id:
+            return
+
+        with _CACHE_LOCK:
+            shutil.rmtree(os.path.join(DATASETS_CACHE_DIR, run_id), ignore_errors=True)
+
     def get_dataset_name(self, operator_id, experiment_id):
         """
         Get operator's dataset name.
@@ -1,11 +1,53 @@
 # -*- coding: utf-8 -*-
 """Experiments Results controller."""
-import io
+import os
 import re
 import zipfile
+from collections import deque
 
+from projects.executor import get_executor
 from projects.kfp.runs import get_latest_run_id
-from projects.object_storage import list_objects, get_object
+from projects.object_storage import BUCKET_NAME, get_object, list_objects, make_bucket
+
+# number of result files that are downloaded at the same time
+RESULTS_MAX_PARALLEL_DOWNLOADS = int(os.getenv("RESULTS_MAX_PARALLEL_DOWNLOADS", "8"))
+# files in these formats are already compressed, so they are stored as they are
+STORED_EXTENSIONS = {".png", ".jpg", ".jpeg", ".gif", ".zip", ".gz"}
+FILENAME_PATTERN = re.compile(r"figure-([0-9]{18})\.(png|html)")
+
+
+class ZipStream:
+    """
+    A write-only file whose written bytes are collected by the reader.
+    Lets zipfile write an archive that is sent while it is built.
+    """
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.offset = 0
+
+    def write(self, data):
+        self.buffer.extend(data)
+        self.offset += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.offset
+
+    def flush(self):
+        pass
+
+    def read_written(self):
+        """
+        Returns the bytes written since the last call.
+
+        Returns
+        -------
+        bytes
+        """
+        data = bytes(self.buffer)
+        self.buffer.clear()
+        return data
 
 
 class ResultController:
@@ -26,41 +68,114 @@ class ResultController:
 
         Returns
         -------
-        io.BytesIO
-            Zip file of experiment results.
+        generator
+            Chunks of the zip file of experiment results.
         """
         if run_id == "latest":
             run_id = get_latest_run_id(experiment_id)
 
+        # results are listed from object storage, so that the results of
+        # operators deleted after the run are also returned
+        operators_prefix = f"experiments/{experiment_id}/operators/"
+
+        # ensures MinIO bucket exists
+        make_bucket(BUCKET_NAME)
+
+        # objects are listed before streaming starts, so that errors are
+        # returned as an http status
         if operator_id:
-            objects_path = f"experiments/{experiment_id}/operators/{operator_id}"
+            operator_prefixes = [f"{operators_prefix}{operator_id}/"]
         else:
-            objects_path = f"experiments/{experiment_id}/operators/"
-        objects = list_objects(objects_path)
+            operator_prefixes = [
+                obj.object_name
+                for obj in list_objects(
+                    operators_prefix, ensure_bucket=False, recursive=False
+                )
+                if obj.is_dir
+            ]
+
+        run_prefixes = [f"{prefix}{run_id}/" for prefix in operator_prefixes]
+        object_names = [
+            object_name
+            for names in get_executor("results").map(
+                self._list_run_results, run_prefixes
+            )
+            for object_name in names
+        ]
+
+        return self._stream_zip(object_names)
+
+    def _list_run_results(self, prefix):
+        """
+        Lists the result files of an operator in a run.
+
+        Parameters
+        ----------
+        prefix : str
+            experiments/{experiment_id}/operators/{operator_id}/{run_id}/
+
+        Returns
+        -------
+        list
+            The object names.
+        """
+        return [
+            obj.object_name
+            for obj in list_objects(prefix, ensure_bucket=False, recursive=False)
+            if FILENAME_PATTERN.match(obj.object_name[len(prefix):])
+        ]
+
+    def _stream_zip(self, object_names):
+        """
+        Downloads the objects in the "results" thread pool, at most
+        RESULTS_MAX_PARALLEL_DOWNLOADS at a time, and yields the zip file as
+        each object is added.
 
-        zip_file = io.BytesIO()
-        with zipfile.ZipFile(zip_file, "a", zipfile.ZIP_DEFLATED) as z:
-            for object in objects:
-                file = self._download_result(object.object_name, run_id)
-                if file is not None:
-                    z.writestr(f"{file['operatorId']}/{file['filename']}", file["data"])
+        Parameters
+        ----------
+        object_names : list
+
+        Yields
+        ------
+        bytes
+        """
+        stream = ZipStream()
+        executor = get_executor("results")
+        with zipfile.ZipFile(stream, "w", zipfile.ZIP_DEFLATED) as z:
+            pending = deque()
+            names = iter(object_names)
 
-        zip_file.seek(0)
+            # keeps a bounded window of downloads, added to the zip in order
+            for object_name in names:
+                pending.append(
+                    (object_name, executor.submit(get_object, object_name, False))
+                )
+                if len(pending) >= RESULTS_MAX_PARALLEL_DOWNLOADS:
+                    break
 
-        return zip_file
+            while pending:
+                object_name, future = pending.popleft()
+                next_name = next(names, None)
+                if next_name is not None:
+                    pending.append(
+                        (next_name, executor.submit(get_object, next_name, False))
+                    )
 
-    def _download_result(self, object_name, run_id):
+                self._write_result(z, object_name, future.result())
+                yield stream.read_written()
+
+        yield stream.read_written()
+
+    def _write_result(self, z, object_name, data):
         # split and remove /experiments/{experiment_id}/operators/
         # object_name_splitted = [{operator_id}, {run_id}, {filename}]
         object_name_splitted = object_name.split("/")[3:]
+        operator_id, filename = object_name_splitted[0], object_name_splitted[2]
+
+        extension = os.path.splitext(filename)[1].lower()
+        if extension in STORED_EXTENSIONS:
+            compress_type = zipfile.ZIP_STORED
+        else:
+            compress_type = zipfile.ZIP_DEFLATED
 
-        if object_name_splitted[1] == run_id:
-            filename = object_name_splitted[2]
-            filename_pattern = re.compile(r"figure-([0-9]{18})\.(png|html)")
-            if filename_pattern.match(filename):
-                return {
-                    "filename": filename,
-                    "data": get_object(object_name),
-                    "operatorId": object_name_splitted[0],
-                }
-        return None
+        z.writestr(f"{operator_id}/{filename}", data, compress_type=compress_type)
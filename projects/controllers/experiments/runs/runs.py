@@ -1,8 +1,11 @@
 # -*- coding: utf-8 -*-
 """Experiments Runs controller."""
+from typing import Optional
+
 from kfp_server_api.rest import ApiException
 
 from projects import models, schemas
+from projects.controllers.experiments.runs.datasets import DatasetController
 from projects.exceptions import NotFound
 from projects.kfp import runs as kfp_runs
 
@@ -31,26 +34,38 @@ class RunController:
         except (ApiException, ValueError):
             raise NOT_FOUND
 
-    def list_runs(self, experiment_id: str):
+    def list_runs(
+        self,
+        experiment_id: str,
+        page_size: Optional[int] = 10,
+        page_token: Optional[str] = None,
+    ):
         """
-        Lists all runs from an experiment.
+        Lists a page of runs from an experiment, the most recent first.
 
         Parameters
         ----------
         experiment_id : str
+        page_size : int
+            The page size. Default value is 10.
+        page_token : str
+            The nextPageToken of the previous page. None lists the first page.
 
         Returns
         -------
-        list
-            A list of all runs from an experiment.
+        projects.schemas.run.RunList
 
         Raises
         ------
         NotFound
             When experiment_id does not exist.
         """
-        runs = kfp_runs.list_runs(experiment_id=experiment_id)
-        return schemas.RunList.from_orm(runs, len(runs))
+        runs, total, next_page_token = kfp_runs.list_runs(
+            experiment_id=experiment_id,
+            page_size=page_size,
+            page_token=page_token,
+        )
+        return schemas.RunList.from_orm(runs, total, next_page_token)
 
     def create_run(self, project_id: str, experiment_id: str):
         """
@@ -177,9 +192,15 @@ class RunController:
         NotFound
             When experiment_id or run_id does not exist.
         """
+        if run_id == "latest":
+            run_id = kfp_runs.get_latest_run_id(experiment_id)
+
         try:
             run = kfp_runs.retry_run(experiment_id=experiment_id, run_id=run_id)
         except ApiException:
             raise NOT_FOUND
 
+        # the retried run writes its datasets again, so cached pages are stale
+        DatasetController(self.session).remove_cache(run_id)
+
         return run
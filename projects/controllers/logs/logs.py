@@ -37,6 +37,17 @@ LOG_LEVELS = {
 
 class LogController:
     def __init__(self):
+        # the queue, loop and pool are only needed by event sources, which are
+        # started from the event loop. list_logs runs in a worker thread instead.
+        self.queue = None
+        self.loop = None
+        self.pool = None
+
+    def start_event_source(self):
+        """
+        Creates the queue and the thread pool used by event sources.
+        Must be called from the event loop thread.
+        """
         self.queue = asyncio.Queue()
         self.loop = asyncio.get_running_loop()
         self.pool = futures.ThreadPoolExecutor()
@@ -289,6 +300,7 @@ class LogController:
         ------
             Iterator
         """
+        self.start_event_source()
         self.loop.run_in_executor(self.pool, self.watch_deployment_pods, deployment_id)
         return pop_log_queue(self.queue, self.pool)
 
@@ -326,6 +338,7 @@ class LogController:
         ------
             Iterator
         """
+        self.start_event_source()
         self.loop.run_in_executor(self.pool, self.watch_workflow_pods, experiment_id)
         return pop_log_queue(self.queue, self.pool)
 
@@ -8,6 +8,7 @@ import time
 from projects import models, schemas
 from projects.controllers.tasks import TaskController
 from projects.controllers.utils import uuid_alpha
+from projects.dag import OperatorGraph
 from projects.exceptions import BadRequest, NotFound
 from projects.kubernetes.kube_config import load_kube_config
 from projects.agent.utils import list_resource_version
@@ -151,6 +152,69 @@ class OperatorController:
 
         return schemas.Operator.from_orm(operator)
 
+    def copy_operators(self, stored_operators: List, experiment_id: str):
+        """
+        Copies operators to an experiment, keeping the dependencies between them.
+
+        The copies are validated once, their dependencies are remapped in memory
+        and all of them are inserted in a single statement. Does not commit.
+
+        Parameters
+        ----------
+        stored_operators : list
+            List of projects.models.operator.Operator.
+        experiment_id : str
+
+        Returns
+        -------
+        dict
+            A map of source operator_id to its copy operator_id.
+
+        Raises
+        ------
+        BadRequest
+            When the operator attributes are invalid.
+        """
+        task_ids = {o.task_id for o in stored_operators}
+        existing_task_ids = {
+            task_id
+            for (task_id,) in self.session.query(models.Task.uuid).filter(
+                models.Task.uuid.in_(task_ids)
+            )
+        }
+        if task_ids - existing_task_ids:
+            raise BadRequest(code="InvalidTaskId", message="source task does not exist")
+
+        # Creates a dict to map source operator_id to its copy operator_id.
+        # This map will be used to build the dependencies using new operator_ids
+        copies_map = {o.uuid: uuid_alpha() for o in stored_operators}
+        graph = OperatorGraph.from_operators(stored_operators).remap(copies_map)
+
+        mappings = []
+        for stored_operator in stored_operators:
+            parameters = stored_operator.parameters or {}
+            self.raise_if_parameters_are_invalid(parameters)
+
+            copy_uuid = copies_map[stored_operator.uuid]
+            mappings.append(
+                {
+                    "uuid": copy_uuid,
+                    "experiment_id": experiment_id,
+                    "task_id": stored_operator.task_id,
+                    "dependencies": graph.dependencies[copy_uuid],
+                    "parameters": parameters,
+                    "status": "Unset",
+                    "position_x": stored_operator.position_x,
+                    "position_y": stored_operator.position_y,
+                    "created_at": now(),
+                    "updated_at": now(),
+                }
+            )
+
+        self.session.bulk_insert_mappings(models.Operator, mappings)
+
+        return copies_map
+
     def update_operator(
         self,
         operator: schemas.OperatorUpdate,
@@ -246,30 +310,23 @@ class OperatorController:
         if operator is None:
             raise NOT_FOUND
 
-        # check if other operators contains the operator being deleted
-        # in dependencies and remove this operator from dependencies
-        operators = (
-            self.session.query(models.Operator)
-            .filter_by(experiment_id=experiment_id)
-            .filter_by(deployment_id=deployment_id)
-            .filter(models.Operator.uuid != operator_id)
-            .all()
+        # removes this operator from the dependencies of other operators,
+        # rewriting all affected dependency lists in a single bulk update
+        graph = OperatorGraph.load(
+            self.session, experiment_id=experiment_id, deployment_id=deployment_id
         )
-        for op in operators:
-            if operator_id in op.dependencies:
-                dependencies = op.dependencies.remove(operator_id)
-                if dependencies is None:
-                    dependencies = []
-
-                op_update = schemas.OperatorUpdate(
-                    dependencies=dependencies,
-                )
-                self.update_operator(
-                    experiment_id=experiment_id,
-                    deployment_id=deployment_id,
-                    operator_id=op.uuid,
-                    operator=op_update,
-                )
+        mappings = [
+            {
+                "uuid": dependent_id,
+                "dependencies": [
+                    d for d in graph.dependencies[dependent_id] if d != operator_id
+                ],
+                "updated_at": now(),
+            }
+            for dependent_id in graph.dependents.get(operator_id, [])
+            if dependent_id != operator_id
+        ]
+        self.session.bulk_update_mappings(models.Operator, mappings)
 
         self.session.delete(operator)
         self.session.commit()
@@ -331,13 +388,17 @@ class OperatorController:
         if len(dependencies) != len(set(dependencies)):
             raise INVALID_DEPENDENCIES
 
-        for d in dependencies:
-            try:
-                self.raise_if_operator_does_not_exist(d)
-                if d == operator_id:
-                    raise INVALID_DEPENDENCIES
-            except NotFound:
-                raise INVALID_DEPENDENCIES
+        if operator_id in dependencies:
+            raise INVALID_DEPENDENCIES
+
+        # check if all dependencies exist, with a single query
+        existing = (
+            self.session.query(models.Operator.uuid)
+            .filter(models.Operator.uuid.in_(dependencies))
+            .count()
+        )
+        if existing != len(dependencies):
+            raise INVALID_DEPENDENCIES
 
         self.raise_if_has_cycles(
             experiment_id=experiment_id,
@@ -368,83 +429,18 @@ class OperatorController:
         BadRequest
             When dependencies are cyclic.
         """
-        operators = (
-            self.session.query(models.Operator)
-            .filter_by(experiment_id=experiment_id)
-            .filter_by(deployment_id=deployment_id)
-            .all()
+        graph = OperatorGraph.load(
+            self.session, experiment_id=experiment_id, deployment_id=deployment_id
         )
 
-        visited = dict.fromkeys([op.uuid for op in operators], False)
-        recursion_stack = dict.fromkeys([op.uuid for op in operators], False)
-
-        for op in operators:
-            op_uuid = op.uuid
-            if (
-                visited[op_uuid] is False
-                and self.has_cycles_util(
-                    op_uuid, visited, recursion_stack, dependencies, operator_id
-                )
-                is True
-            ):
-                raise BadRequest(
-                    code="InvalidCyclicalDependencies", message="Cyclical dependencies."
-                )
-        return False
-
-    def has_cycles_util(
-        self,
-        operator_id: str,
-        visited: Dict[str, bool],
-        recursion_stack: Dict[str, bool],
-        new_dependencies: List[str],
-        new_dependencies_op: str,
-    ):
-        """
-        Check if a run has cycle.
-
-        Parameters
-        ----------
-        operator_id : str
-        visited : dict
-        recursion_stack : dict
-        new_dependencies : list
-        new_dependencies_op : str
-
-        Returns
-        -------
-        bool
-            If a run has cycles or not.
-        """
-        visited[operator_id] = True
-        recursion_stack[operator_id] = True
-
-        operator = self.session.query(models.Operator).get(operator_id)
-        dependencies = operator.dependencies
-
-        if operator_id == new_dependencies_op:
-            dependencies = dependencies + list(
-                set(new_dependencies) - set(dependencies)
+        # the new dependencies create a cycle when any of them
+        # already depends (directly or not) on the operator
+        if operator_id is not None and set(dependencies) & graph.descendants(
+            operator_id
+        ):
+            raise BadRequest(
+                code="InvalidCyclicalDependencies", message="Cyclical dependencies."
             )
-
-        # Recur for all neighbours
-        # if any neighbour is visited and in
-        # recursion_stack then graph is cyclic
-        for neighbour in dependencies:
-            if (
-                visited.get(neighbour) is False
-                and self.has_cycles_util(
-                    neighbour,
-                    visited,
-                    recursion_stack,
-                    new_dependencies,
-                    new_dependencies_op,
-                )
-                is True
-            ) or recursion_stack.get(neighbour) is True:
-                return True
-
-        recursion_stack[operator_id] = False
         return False
 
     def watch_operator(
@@ -1,10 +1,19 @@
 # -*- coding: utf-8 -*-
 """Predictions controller."""
+import codecs
+import csv
+import gzip
 import json
 import logging
+import math
+import os
+import zlib
+from concurrent.futures import FIRST_COMPLETED, wait
 from typing import Optional
 
+import pandas as pd
 import requests
+from fastapi.responses import StreamingResponse
 from sqlalchemy.exc import DataError
 from platiagro import load_dataset
 
@@ -12,14 +21,35 @@ from projects import models, schemas, exceptions
 from projects.controllers.utils import (
     parse_dataframe_to_seldon_request,
     parse_file_buffer_to_seldon_request,
+    read_csv_buffer,
     uuid_alpha,
 )
 from projects.exceptions import BadRequest, NotFound
-from projects.kubernetes.seldon import get_seldon_deployment_url
+from projects.executor import get_executor
+from projects.kubernetes.seldon import (
+    SELDON_MAX_CONCURRENCY,
+    get_seldon_deployment_url,
+    post_prediction,
+)
+from projects.object_storage import put_object, remove_object, stream_object
+
+# number of dataset rows sent in each request of a batch prediction
+PREDICTION_CHUNK_SIZE = int(os.getenv("PREDICTION_CHUNK_SIZE", "1000"))
+# number of chunks of a batch prediction that are sent at the same time
+PREDICTION_MAX_PARALLEL_CHUNKS = int(os.getenv("PREDICTION_MAX_PARALLEL_CHUNKS", "4"))
+# request and response bodies larger than this number of bytes are saved,
+# compressed, in object storage instead of the database
+PREDICTION_PAYLOAD_THRESHOLD = int(os.getenv("PREDICTION_PAYLOAD_THRESHOLD", "65535"))
+# prefix of the column values that point to a payload in object storage
+PAYLOAD_POINTER_PREFIX = "minio://"
 
 NOT_FOUND = NotFound(
     code="PredictionNotFound", message="The specified prediction does not exist"
 )
+INVALID_BATCH_DATASET = BadRequest(
+    code="InvalidBatchDataset",
+    message="batch predictions require a tabular dataset",
+)
 
 
 class PredictionController:
@@ -32,6 +62,7 @@ class PredictionController:
         deployment_id: str,
         upload_file: Optional[bytes] = None,
         dataset: Optional[str] = None,
+        batch: Optional[bool] = False,
     ):
         """
         POST a prediction file to seldon deployment.
@@ -44,12 +75,21 @@ class PredictionController:
             File buffer.
         dataset : str
             Dataset name.
+        batch : bool
+            Whether to split the dataset into chunks of rows, that are sent
+            concurrently and whose results are saved in object storage.
 
         Returns
         -------
         prediction_as_schema: schemas.prediction.PredictionBase
 
         """
+        if batch:
+            return self.create_batch_prediction(
+                deployment_id=deployment_id,
+                upload_file=upload_file,
+                dataset=dataset,
+            )
 
         if upload_file is not None:
             file = upload_file.file
@@ -90,6 +130,77 @@ class PredictionController:
         )
         return prediction_as_schema
 
+    def create_batch_prediction(
+        self,
+        deployment_id: str,
+        upload_file: Optional[bytes] = None,
+        dataset: Optional[str] = None,
+    ):
+        """
+        Starts a batch prediction of a tabular dataset.
+
+        Parameters
+        ----------
+        deployment_id : str
+        upload_file : starlette.datastructures.UploadFile
+        dataset : str
+
+        Returns
+        -------
+        prediction_as_schema: schemas.prediction.PredictionBase
+
+        Raises
+        ------
+        BadRequest
+            When the dataset is missing or is not tabular.
+        """
+        if upload_file is not None:
+            try:
+                dataframe = read_csv_buffer(upload_file.file._file)
+            except (UnicodeDecodeError, csv.Error):
+                raise INVALID_BATCH_DATASET
+        elif dataset is not None:
+            try:
+                dataframe = load_dataset(dataset)
+            except FileNotFoundError:
+                raise BadRequest(
+                    code="InvalidDataset", message="a valid dataset is required"
+                )
+            if not isinstance(dataframe, pd.DataFrame):
+                raise INVALID_BATCH_DATASET
+        else:
+            raise BadRequest(
+                code="MissingRequiredDatasetOrFile",
+                message="either dataset name or file is required",
+            )
+
+        prediction_id = str(uuid_alpha())
+        total_chunks = math.ceil(len(dataframe) / PREDICTION_CHUNK_SIZE)
+        # only a description of the request is saved, as the dataset may be
+        # larger than the request_body column
+        prediction_object = self.create_prediction_database_object(
+            prediction_id=prediction_id,
+            deployment_id=deployment_id,
+            request_body={
+                "dataset": dataset,
+                "rows": len(dataframe),
+                "chunkSize": PREDICTION_CHUNK_SIZE,
+            },
+            response_body=self.batch_progress(prediction_id, total_chunks),
+            status="started",
+        )
+
+        prediction_as_schema = schemas.PredictionBase.from_orm(prediction_object)
+
+        url = get_seldon_deployment_url(deployment_id=deployment_id, external_url=False)
+        self.background_tasks.add_task(
+            self.start_and_save_batch_prediction,
+            dataframe=dataframe,
+            prediction_object=prediction_object,
+            url=url,
+        )
+        return prediction_as_schema
+
     def create_prediction_database_object(
         self,
         prediction_id: str,
@@ -117,13 +228,17 @@ class PredictionController:
             uuid=prediction_id,
             deployment_id=deployment_id,
             status=status,
-            request_body=json.dumps(request_body),
-            response_body=json.dumps(response_body),
+            request_body=self.save_payload(
+                prediction_id, "request_body", json.dumps(request_body)
+            ),
+            response_body=self.save_payload(
+                prediction_id, "response_body", json.dumps(response_body)
+            ),
         )
 
         self.session.add(prediction)
         try:
-            self.session.commit()
+            self.commit_payloads(prediction.request_body, prediction.response_body)
         except DataError:
             raise(exceptions.BadRequest("400", "File too large"))
         return prediction
@@ -146,16 +261,300 @@ class PredictionController:
         -------
 
         """
-        response = requests.post(url=url, json=request_body)
+        try:
+            response = post_prediction(
+                deployment_id=prediction_object.deployment_id,
+                url=url,
+                json=request_body,
+            )
+        except requests.RequestException as e:
+            logging.info(f"Unable to acquire prediction data: {e}")
+            prediction_object.status = "failed"
+            prediction_object.response_body = json.dumps({"message": str(e)})
+            self.session.commit()
+            return
+
         if response.status_code == 200:
             prediction_object.status = "done"
         else:
             logging.info(f"Unable to acquire prediction data: {response._content}")
             prediction_object.status = "failed"
 
-        prediction_object.response_body = response._content
+        prediction_object.response_body = self.save_payload(
+            prediction_object.uuid, "response_body", response._content
+        )
+        self.commit_payloads(prediction_object.response_body)
+
+    def save_payload(self, prediction_id, name, payload):
+        """
+        Returns the value saved in a body column. Payloads larger than
+        PREDICTION_PAYLOAD_THRESHOLD are gzipped to object storage and the
+        column keeps only a pointer with their size.
+
+        Parameters
+        ----------
+        prediction_id : str
+        name : str
+            Either "request_body" or "response_body".
+        payload : str or bytes
+
+        Returns
+        -------
+        str
+        """
+        if isinstance(payload, str):
+            data = payload.encode()
+        else:
+            data = payload
+
+        if len(data) <= PREDICTION_PAYLOAD_THRESHOLD:
+            return payload
+
+        object_name = f"predictions/{prediction_id}/{name}.json.gz"
+        put_object(object_name, gzip.compress(data), content_type="application/gzip")
+        return f"{PAYLOAD_POINTER_PREFIX}{object_name}?size={len(data)}"
+
+    def commit_payloads(self, *values):
+        """
+        Commits the session. When the commit fails, the payloads that were
+        saved in object storage for the given body columns are removed, so
+        that no object is left without a prediction pointing to it.
+
+        Parameters
+        ----------
+        *values : str or bytes
+            The body columns set in this transaction.
+        """
+        try:
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            for value in values:
+                if self.is_payload_pointer(value):
+                    remove_object(self.payload_object_name(value))
+            raise
+
+    def payload_object_name(self, value):
+        """
+        Returns the name of the object a payload pointer points to.
+
+        Parameters
+        ----------
+        value : str
+
+        Returns
+        -------
+        str
+        """
+        return value[len(PAYLOAD_POINTER_PREFIX):].rsplit("?size=", 1)[0]
+
+    def is_payload_pointer(self, value):
+        """
+        Checks whether a body column points to a payload in object storage.
+
+        Parameters
+        ----------
+        value : str or bytes
+
+        Returns
+        -------
+        bool
+        """
+        return isinstance(value, str) and value.startswith(PAYLOAD_POINTER_PREFIX)
+
+    def iter_payload(self, value):
+        """
+        Reads a body column, streaming and decompressing it from object storage
+        when it is a pointer.
+
+        Parameters
+        ----------
+        value : str or bytes
+
+        Yields
+        ------
+        str
+        """
+        if not self.is_payload_pointer(value):
+            if isinstance(value, bytes):
+                value = value.decode()
+            yield value
+            return
+
+        object_name = self.payload_object_name(value)
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        for chunk in stream_object(object_name):
+            yield decoder.decode(decompressor.decompress(chunk))
+        yield decoder.decode(decompressor.flush(), final=True)
+
+    def iter_prediction_json(self, prediction):
+        """
+        Encodes a prediction as JSON, streaming its bodies from object storage.
+
+        Parameters
+        ----------
+        prediction : schemas.prediction.Prediction
+
+        Yields
+        ------
+        str
+        """
+        bodies = [
+            ("request_body", prediction.request_body),
+            ("response_body", prediction.response_body),
+        ]
+
+        yield prediction.json(exclude={name for name, _ in bodies})[:-1]
+        for name, value in bodies:
+            yield f', "{name}": "'
+            for text in self.iter_payload(value):
+                # escapes the text as the content of a JSON string
+                yield json.dumps(text)[1:-1]
+            yield '"'
+        yield "}"
+
+    def start_and_save_batch_prediction(self, dataframe, prediction_object, url):
+        """
+        Sends the chunks of a dataset to seldon API, at most
+        PREDICTION_MAX_PARALLEL_CHUNKS (and fewer than SELDON_MAX_CONCURRENCY)
+        at a time, saves the result of each chunk in object storage and
+        updates the progress of the prediction.
+
+        Parameters
+        ----------
+        dataframe : pandas.DataFrame
+        prediction_object : models.prediction.Prediction
+        url : str
+        """
+        prediction_id = prediction_object.uuid
+        chunks = [
+            dataframe.iloc[start:start + PREDICTION_CHUNK_SIZE]
+            for start in range(0, len(dataframe), PREDICTION_CHUNK_SIZE)
+        ]
+        completed_chunks = 0
+        failed_chunks = 0
+
+        # chunks are sent by the shared "predictions" pool, keeping at most
+        # PREDICTION_MAX_PARALLEL_CHUNKS of this prediction in flight. One slot
+        # of the deployment is left to online predictions.
+        max_parallel_chunks = max(
+            1, min(PREDICTION_MAX_PARALLEL_CHUNKS, SELDON_MAX_CONCURRENCY - 1)
+        )
+        executor = get_executor("predictions")
+        indexed_chunks = iter(enumerate(chunks))
+        pending = set()
+        while True:
+            for index, chunk in indexed_chunks:
+                pending.add(
+                    executor.submit(
+                        self.predict_chunk,
+                        deployment_id=prediction_object.deployment_id,
+                        url=url,
+                        object_name=self.batch_object_name(prediction_id, index),
+                        chunk=chunk,
+                    )
+                )
+                if len(pending) >= max_parallel_chunks:
+                    break
+
+            if not pending:
+                break
+
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+            # progress is saved by this thread only, as the session is not thread-safe
+            for future in done:
+                if future.result():
+                    completed_chunks += 1
+                else:
+                    failed_chunks += 1
+
+            prediction_object.response_body = json.dumps(
+                self.batch_progress(
+                    prediction_id, len(chunks), completed_chunks, failed_chunks
+                )
+            )
+            self.session.commit()
+
+        prediction_object.status = "failed" if failed_chunks else "done"
         self.session.commit()
 
+    def predict_chunk(self, deployment_id, url, object_name, chunk):
+        """
+        Sends a chunk of a dataset to seldon API and saves the result in object storage.
+
+        Parameters
+        ----------
+        deployment_id : str
+        url : str
+        object_name : str
+        chunk : pandas.DataFrame
+
+        Returns
+        -------
+        bool
+            Whether the prediction succeeded.
+        """
+        try:
+            # chunks run in background, so they wait for a free slot of a
+            # busy deployment instead of failing
+            response = post_prediction(
+                deployment_id=deployment_id,
+                url=url,
+                json=parse_dataframe_to_seldon_request(dataframe=chunk),
+                wait_for_slot=True,
+            )
+            if response.status_code != 200:
+                logging.info(f"Unable to acquire prediction data: {response._content}")
+                return False
+
+            put_object(object_name, response._content, content_type="application/json")
+        except Exception as e:
+            logging.info(f"Unable to acquire prediction data: {e}")
+            return False
+
+        return True
+
+    def batch_object_name(self, prediction_id, index):
+        """
+        Returns the name of the object that keeps the result of a chunk.
+
+        Parameters
+        ----------
+        prediction_id : str
+        index : int
+
+        Returns
+        -------
+        str
+        """
+        return f"predictions/{prediction_id}/part-{index:05d}.json"
+
+    def batch_progress(
+        self, prediction_id, total_chunks, completed_chunks=0, failed_chunks=0
+    ):
+        """
+        Describes the progress of a batch prediction.
+
+        Parameters
+        ----------
+        prediction_id : str
+        total_chunks : int
+        completed_chunks : int
+        failed_chunks : int
+
+        Returns
+        -------
+        dict
+        """
+        return {
+            "totalChunks": total_chunks,
+            "completedChunks": completed_chunks,
+            "failedChunks": failed_chunks,
+            "resultsPrefix": f"predictions/{prediction_id}/",
+        }
+
     def get_prediction(
         self,
         prediction_id,
@@ -170,6 +569,8 @@ class PredictionController:
         Returns
         -------
         prediction_as_schema: schemas.prediction.Prediction
+            Or a fastapi.responses.StreamingResponse of the prediction, when
+            its bodies are in object storage.
 
         Raises
         ------
@@ -182,4 +583,13 @@ class PredictionController:
             raise NOT_FOUND
 
         predicton_as_schema = schemas.Prediction.from_orm(prediction_orm_obj)
+
+        if self.is_payload_pointer(
+            predicton_as_schema.request_body
+        ) or self.is_payload_pointer(predicton_as_schema.response_body):
+            return StreamingResponse(
+                self.iter_prediction_json(predicton_as_schema),
+                media_type="application/json",
+            )
+
         return predicton_as_schema
@@ -7,7 +7,13 @@ from sqlalchemy import asc, desc, func
 
 from projects import models, schemas
 from projects.controllers.experiments import ExperimentController
-from projects.controllers.utils import uuid_alpha
+from projects.controllers.utils import (
+    decode_cursor,
+    encode_cursor,
+    keyset_filter,
+    search_filter,
+    uuid_alpha,
+)
 from projects.exceptions import BadRequest, NotFound
 from projects.utils import now
 
@@ -50,6 +56,7 @@ class ProjectController:
         page: Optional[int] = 1,
         page_size: Optional[int] = 10,
         order_by: Optional[str] = None,
+        cursor: Optional[str] = None,
         **filters,
     ):
         """
@@ -62,6 +69,9 @@ class ProjectController:
             The page size. Default value is 10.
         order_by : str
             Order by instruction. Format is "column [asc|desc]".
+        cursor : str
+            The nextCursor of a previous page. When given, page is ignored and
+            the total is not counted.
         **filters : dict
         Returns
         -------
@@ -69,28 +79,35 @@ class ProjectController:
         Raises
         ------
         BadRequest
-            When order_by is invalid.
+            When order_by or cursor is invalid.
         """
-        query = self.session.query(models.Project).filter_by(
-            tenant=self.kubeflow_userid
-        )
+        # Selects only the columns of the summary, the flags are computed
+        # with EXISTS subqueries instead of loading experiments and deployments
+        query = self.session.query(
+            models.Project.uuid,
+            models.Project.name,
+            models.Project.description,
+            models.Project.created_at,
+            models.Project.updated_at,
+            models.Project.tenant,
+            models.Project.has_experiment.label("has_experiment"),
+            models.Project.has_deployment.label("has_deployment"),
+            models.Project.has_pre_deployment.label("has_pre_deployment"),
+        ).filter_by(tenant=self.kubeflow_userid)
         query_total = self.session.query(func.count(models.Project.uuid)).filter_by(
             tenant=self.kubeflow_userid
         )
 
         for column, value in filters.items():
-            query = query.filter(
-                getattr(models.Project, column)
-                .ilike(f"%{value}%")
-                .collate("utf8mb4_bin")
-            )
-            query_total = query_total.filter(
-                getattr(models.Project, column)
-                .ilike(f"%{value}%")
-                .collate("utf8mb4_bin")
+            condition = search_filter(
+                self.session,
+                models.Project,
+                column,
+                value,
+                collation="utf8mb4_bin",
             )
-
-        total = query_total.scalar()
+            query = query.filter(condition)
+            query_total = query_total.filter(condition)
 
         # Default sort is name in ascending order
         if not order_by:
@@ -99,21 +116,45 @@ class ProjectController:
         # Sorts records
         try:
             (column, sort) = order_by.strip().split()
-            assert sort.lower() in ["asc", "desc"]
+            sort = sort.lower()
+            assert sort in ["asc", "desc"]
             assert column in models.Project.__table__.columns.keys()
         except (AssertionError, ValueError):
             raise BadRequest(code="InvalidOrderBy", message="Invalid order argument")
 
-        if sort.lower() == "asc":
-            query = query.order_by(asc(getattr(models.Project, column)))
-        elif sort.lower() == "desc":
-            query = query.order_by(desc(getattr(models.Project, column)))
+        # uuid is the tiebreaker, so that the order is stable between pages
+        order = asc if sort == "asc" else desc
+        query = query.order_by(
+            order(getattr(models.Project, column)),
+            order(models.Project.uuid),
+        )
+
+        # Applies pagination. Keyset pagination (cursor) seeks the last record
+        # of the previous page, instead of scanning all records before it.
+        if cursor:
+            value, record_uuid = decode_cursor(cursor, column)
+            query = query.filter(
+                keyset_filter(
+                    getattr(models.Project, column),
+                    models.Project.uuid,
+                    sort,
+                    value,
+                    record_uuid,
+                )
+            )
+            total = None
+        else:
+            query = query.offset((page - 1) * page_size)
+            total = query_total.scalar()
+
+        projects = query.limit(page_size).all()
 
-        # Applies pagination
-        query = query.limit(page_size).offset((page - 1) * page_size)
-        projects = query.all()
+        next_cursor = None
+        if len(projects) == page_size:
+            last = projects[-1]
+            next_cursor = encode_cursor(column, getattr(last, column), last.uuid)
 
-        return schemas.ProjectList.from_orm(projects, total)
+        return schemas.ProjectList.from_orm(projects, total, next_cursor)
 
     def create_project(self, project: schemas.ProjectCreate):
         """
@@ -13,7 +13,13 @@ from jinja2 import Template
 from sqlalchemy import asc, desc, func
 
 from projects import models, schemas
-from projects.controllers.utils import uuid_alpha
+from projects.controllers.utils import (
+    decode_cursor,
+    encode_cursor,
+    keyset_filter,
+    search_filter,
+    uuid_alpha,
+)
 from projects.exceptions import BadRequest, Forbidden, NotFound
 from projects.kubernetes.notebook import (
     copy_files_to_pod,
@@ -105,6 +111,7 @@ class TaskController:
         page: Optional[int] = None,
         page_size: Optional[int] = None,
         order_by: str = Optional[str],
+        cursor: Optional[str] = None,
         **filters,
     ):
         """
@@ -117,6 +124,9 @@ class TaskController:
             The page size.
         order_by : str
             Order by instruction. Format is "column [asc|desc]".
+        cursor : str
+            The nextCursor of a previous page. When given, page is ignored and
+            the total is not counted.
         **filters : dict
         Returns
         -------
@@ -124,18 +134,15 @@ class TaskController:
         Raises
         ------
         BadRequest
-            When order_by is invalid.
+            When order_by or cursor is invalid.
         """
         query = self.session.query(models.Task)
         query_total = self.session.query(func.count(models.Task.uuid))
 
         for column, value in filters.items():
-            query = query.filter(getattr(models.Task, column).ilike(f"%{value}%"))
-            query_total = query_total.filter(
-                getattr(models.Task, column).ilike(f"%{value}%")
-            )
-
-        total = query_total.scalar()
+            condition = search_filter(self.session, models.Task, column, value)
+            query = query.filter(condition)
+            query_total = query_total.filter(condition)
 
         # Default sort is name in ascending order
         if not order_by:
@@ -144,22 +151,48 @@ class TaskController:
         # Sorts records
         try:
             (column, sort) = order_by.replace("+", " ").strip().split()
-            assert sort.lower() in ["asc", "desc"]
+            sort = sort.lower()
+            assert sort in ["asc", "desc"]
             assert column in models.Task.__table__.columns.keys()
         except (AssertionError, ValueError):
             raise BadRequest(code="InvalidOrderBy", message="Invalid order argument")
 
-        if sort.lower() == "asc":
-            query = query.order_by(asc(getattr(models.Task, column)))
-        elif sort.lower() == "desc":
-            query = query.order_by(desc(getattr(models.Task, column)))
+        # uuid is the tiebreaker, so that the order is stable between pages
+        order = asc if sort == "asc" else desc
+        query = query.order_by(
+            order(getattr(models.Task, column)),
+            order(models.Task.uuid),
+        )
 
-        if page and page_size:
-            # Applies pagination
-            query = query.limit(page_size).offset((page - 1) * page_size)
+        # Applies pagination. Keyset pagination (cursor) seeks the last record
+        # of the previous page, instead of scanning all records before it.
+        if cursor:
+            value, record_uuid = decode_cursor(cursor, column)
+            query = query.filter(
+                keyset_filter(
+                    getattr(models.Task, column),
+                    models.Task.uuid,
+                    sort,
+                    value,
+                    record_uuid,
+                )
+            )
+            if page_size:
+                query = query.limit(page_size)
+            total = None
+        else:
+            if page and page_size:
+                query = query.limit(page_size).offset((page - 1) * page_size)
+            total = query_total.scalar()
 
         tasks = query.all()
-        return schemas.TaskList.from_orm(tasks, total)
+
+        next_cursor = None
+        if page_size and len(tasks) == page_size:
+            last = tasks[-1]
+            next_cursor = encode_cursor(column, getattr(last, column), last.uuid)
+
+        return schemas.TaskList.from_orm(tasks, total, next_cursor)
 
     def generate_name_task(self, name, attempt=1):
         name_task = f"{name} - {attempt}"
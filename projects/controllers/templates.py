@@ -2,9 +2,11 @@
 """Templates controller."""
 import re
 from datetime import datetime
+from typing import Dict, List, Optional
 
 from projects import models, schemas
 from projects.controllers.utils import uuid_alpha
+from projects.dag import OperatorGraph
 from projects.exceptions import BadRequest, NotFound
 from projects.utils import now
 
@@ -145,15 +147,18 @@ class TemplateController:
             )
 
         # order operators by dependencies
-        operators_ordered = []
-        while len(operators) != len(operators_ordered):
-            for operator in operators:
-                self.order_operators_by_dependencies(operators_ordered, operator)
+        try:
+            operators_ordered = OperatorGraph.from_operators(operators).topological_sort()
+        except ValueError:
+            raise BadRequest(
+                code="InvalidCyclicalDependencies", message="Cyclical dependencies."
+            )
+        operators_by_uuid = {operator.uuid: operator for operator in operators}
 
         # JSON array order of elements are preserved, so there is no need to save positions
         tasks = []
         for uuid in operators_ordered:
-            operator = next((op for op in operators if op.uuid == uuid), None)
+            operator = operators_by_uuid[uuid]
             task = {
                 "uuid": operator.uuid,
                 "task_id": operator.task_id,
@@ -179,6 +184,59 @@ class TemplateController:
 
         return schemas.Template.from_orm(template)
 
+    def create_operators_from_template(
+        self,
+        tasks: List[Dict],
+        experiment_id: Optional[str] = None,
+        deployment_id: Optional[str] = None,
+        status: str = "Unset",
+    ):
+        """
+        Creates the operators described by the tasks of a template.
+
+        The uuids of all operators are remapped in one pass and the operators
+        are inserted in a single batch. Does not commit.
+
+        Parameters
+        ----------
+        tasks : list
+            The tasks of a template.
+        experiment_id : str or None
+        deployment_id : str or None
+        status : str
+            The status of the new operators.
+
+        Returns
+        -------
+        dict
+            A map of template task uuid to the created operator_id.
+        """
+        copies_map = {task["uuid"]: uuid_alpha() for task in tasks}
+        graph = OperatorGraph.from_operators(tasks).remap(copies_map)
+
+        mappings = []
+        for task in tasks:
+            operator_id = copies_map[task["uuid"]]
+            mappings.append(
+                {
+                    "uuid": operator_id,
+                    "experiment_id": experiment_id,
+                    "deployment_id": deployment_id,
+                    "task_id": task["task_id"],
+                    "dependencies": graph.dependencies[operator_id],
+                    "parameters": {},
+                    "status": status,
+                    "position_x": task["position_x"],
+                    "position_y": task["position_y"],
+                    "created_at": now(),
+                    "updated_at": now(),
+                }
+            )
+
+        self.session.bulk_insert_mappings(models.Operator, mappings)
+
+        return copies_map
+
     def get_template(self, template_id: str):
         """
         Details a template from our database.
@@ -326,25 +384,3 @@ class TemplateController:
         self.session.commit()
 
         return schemas.Message(message="Successfully removed templates")
-
-    def order_operators_by_dependencies(self, operators_ordered, operator):
-        """
-        Order operators by dependencies.
-
-        Parameters
-        ----------
-        operators_ordered : list
-        operator : dict
-        """
-        uuid = operator.uuid
-        dependencies = operator.dependencies
-        if uuid not in operators_ordered:
-            if len(dependencies) == 0:
-                operators_ordered.append(uuid)
-            else:
-                check = True
-                for d in dependencies:
-                    if d not in operators_ordered:
-                        check = False
-                if check:
-                    operators_ordered.append(uuid)
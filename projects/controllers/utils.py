@@ -1,12 +1,44 @@
 # -*- coding: utf-8 -*-
 """Shared functions."""
 import base64
+import binascii
+import codecs
 import csv
+import io
+import json
+import os
 import random
+import re
 import uuid
+from datetime import datetime
+from typing import Optional
 
 import filetype
+import numpy
 import pandas
+from sqlalchemy import and_, case, or_
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.util import identity_key
+
+from projects.exceptions import BadRequest
+
+INVALID_CURSOR = BadRequest(code="InvalidCursor", message="Invalid cursor argument")
+# how numeric dataframes are sent to seldon: "ndarray", "tensor" or "binData"
+SELDON_REQUEST_ENCODING = os.getenv("SELDON_REQUEST_ENCODING", "ndarray")
+# number of bytes read to detect the type, encoding and delimiter of an uploaded file
+CSV_SNIFF_SIZE = 64 * 1024
+# must match the ngram_token_size of the MySQL server
+NGRAM_TOKEN_SIZE = int(os.getenv("MYSQL_NGRAM_TOKEN_SIZE", "2"))
+# whether the MySQL server uses the InnoDB default stopwords. Set to "false" when
+# innodb_ft_server_stopword_table points to an empty table.
+MYSQL_FULLTEXT_STOPWORDS = os.getenv("MYSQL_FULLTEXT_STOPWORDS", "true").lower() == "true"
+# InnoDB default stopwords. The ngram parser does not index tokens that contain them.
+INNODB_DEFAULT_STOPWORDS = {
+    "a", "about", "an", "are", "as", "at", "be", "by", "com", "de", "en", "for",
+    "from", "how", "i", "in", "is", "it", "la", "of", "on", "or", "that", "the",
+    "this", "to", "was", "what", "when", "where", "who", "will", "with", "und",
+    "www",
+}
 
 
 def uuid_alpha():
@@ -24,28 +56,135 @@ def uuid_alpha():
     return uuid_
 
 
-def parse_dataframe_to_seldon_request(dataframe):
+def parse_dataframe_to_seldon_request(dataframe, encoding=None):
     """
     Parse a pandas dataframe to seldon request.
 
     Parameters
     ----------
     dataframe : pandas.core.frame.DataFrame
+    encoding : str
+        One of "ndarray", "tensor" or "binData". Numeric dataframes may be sent
+        as a tensor (flat values and shape) or as a NumPy .npy binary. Other
+        dataframes are always sent as ndarray. Default is
+        SELDON_REQUEST_ENCODING.
 
     Returns
     -------
     dict
         In seldon request format.
     """
-    dataframe = dataframe.to_dict("split")
+    encoding = encoding or SELDON_REQUEST_ENCODING
+    columns = dataframe.columns.tolist()
+    numeric = all(
+        pandas.api.types.is_numeric_dtype(dtype)
+        and not pandas.api.types.is_bool_dtype(dtype)
+        for dtype in dataframe.dtypes
+    )
+
+    if numeric and encoding == "tensor":
+        values = dataframe.to_numpy(dtype=numpy.float64)
+        return {
+            "data": {
+                "names": columns,
+                "tensor": {
+                    "shape": list(values.shape),
+                    "values": values.ravel().tolist(),
+                },
+            }
+        }
+
+    if numeric and encoding == "binData":
+        buffer = io.BytesIO()
+        numpy.save(buffer, dataframe.to_numpy(dtype=numpy.float64), allow_pickle=False)
+        return {
+            "binData": base64.b64encode(buffer.getvalue()).decode("utf-8"),
+            "meta": {
+                "content-type": "application/x-npy",
+                "names": columns,
+            },
+        }
+
+    if numeric and len(set(dataframe.dtypes)) <= 1:
+        # a single conversion of the numpy buffer, without boxing each value.
+        # only when all columns share a dtype, so ints are not cast to floats
+        ndarray = dataframe.to_numpy().tolist()
+    else:
+        # columns are converted to native python types one at a time,
+        # by position so that duplicate column names are kept
+        ndarray = [
+            list(row)
+            for row in zip(
+                *(dataframe.iloc[:, i].tolist() for i in range(dataframe.shape[1]))
+            )
+        ]
+
     return {
         "data": {
-            "names": dataframe["columns"],
-            "ndarray": dataframe["data"],
+            "names": columns,
+            "ndarray": ndarray,
         }
     }
 
 
+def read_csv_buffer(file):
+    """
+    Reads a CSV file buffer into a dataframe.
+
+    The file type, encoding, delimiter and quote char are detected on the
+    first CSV_SNIFF_SIZE bytes, so that the file is parsed once by the C engine.
+
+    Parameters
+    ----------
+    file : file-like
+        A binary file buffer.
+
+    Returns
+    -------
+    pandas.DataFrame
+
+    Raises
+    ------
+    UnicodeDecodeError
+        When the file is not UTF-8 text (e.g. an image).
+    csv.Error
+        When the file is text, but not CSV.
+    """
+    position = file.tell()
+    prefix = file.read(CSV_SNIFF_SIZE)
+    file.seek(position)
+
+    if b"\x00" in prefix or filetype.guess(prefix) is not None:
+        raise UnicodeDecodeError("utf-8", prefix, 0, 1, "binary file")
+
+    # a multibyte char cut at the end of the prefix is not an error
+    text = codecs.getincrementaldecoder("utf-8")().decode(prefix, final=False)
+    if len(prefix) == CSV_SNIFF_SIZE:
+        # the last line may be incomplete
+        text = text[:text.rfind("\n") + 1] or text
+
+    lines = [line for line in text.splitlines() if line.strip()]
+    if not lines:
+        raise csv.Error("Could not determine delimiter")
+
+    # the delimiter is sniffed in the first line, as the python engine does
+    dialect = csv.Sniffer().sniff(lines[0])
+    try:
+        # quotes are usually found in data lines only, so the quote char is
+        # sniffed in all lines of the prefix, with the delimiter already known
+        dialect = csv.Sniffer().sniff("\n".join(lines), delimiters=dialect.delimiter)
+    except csv.Error:
+        pass
+
+    return pandas.read_csv(
+        file,
+        sep=dialect.delimiter,
+        quotechar=dialect.quotechar,
+        skipinitialspace=dialect.skipinitialspace,
+        engine="c",
+    )
+
+
 def parse_file_buffer_to_seldon_request(file):
     """
     Reads file buffer and parse to seldon request.
@@ -61,7 +200,7 @@ def parse_file_buffer_to_seldon_request(file):
         Seldon API request
     """
     try:
-        df = pandas.read_csv(file, sep=None, engine="python")
+        df = read_csv_buffer(file)
 
         return parse_dataframe_to_seldon_request(df)
 
@@ -85,3 +224,255 @@ def parse_file_buffer_to_seldon_request(file):
     except csv.Error:
         file.seek(0)
         return {"strData": file.read().decode("utf-8")}
+
+
+def encode_cursor(column: str, value, record_uuid: str):
+    """
+    Encodes the position of a record in a sorted list as an opaque cursor.
+
+    Parameters
+    ----------
+    column : str
+        The sort column.
+    value
+        The value of the sort column in the record.
+    record_uuid : str
+        The uuid of the record, used as tiebreaker.
+
+    Returns
+    -------
+    str
+    """
+    if isinstance(value, datetime):
+        value = {"datetime": value.isoformat()}
+    content = json.dumps({"column": column, "value": value, "uuid": record_uuid})
+    return base64.urlsafe_b64encode(content.encode("utf-8")).decode("utf-8")
+
+
+def decode_cursor(cursor: str, column: str):
+    """
+    Decodes a cursor created by encode_cursor.
+
+    Parameters
+    ----------
+    cursor : str
+    column : str
+        The sort column of the current request.
+
+    Returns
+    -------
+    tuple
+        The value of the sort column and the uuid of the last record.
+
+    Raises
+    ------
+    BadRequest
+        When cursor is invalid or was created for another sort column.
+    """
+    try:
+        content = json.loads(base64.urlsafe_b64decode(cursor.encode("utf-8")))
+        assert content["column"] == column
+        value = content["value"]
+        if isinstance(value, dict):
+            value = datetime.fromisoformat(value["datetime"])
+        return value, content["uuid"]
+    except (AssertionError, binascii.Error, KeyError, TypeError, ValueError):
+        raise INVALID_CURSOR
+
+
+def keyset_filter(column, uuid_column, sort: str, value, record_uuid: str):
+    """
+    Builds the condition that selects the records after a cursor.
+
+    Records are expected to be sorted by column and then by uuid, in the same
+    direction. NULL values come first in ascending order (as in MySQL).
+
+    Parameters
+    ----------
+    column : sqlalchemy.Column
+    uuid_column : sqlalchemy.Column
+    sort : str
+        Either "asc" or "desc".
+    value
+        The value of the sort column in the last record.
+    record_uuid : str
+        The uuid of the last record.
+
+    Returns
+    -------
+    sqlalchemy.sql.elements.BooleanClauseList
+    """
+    if sort == "asc":
+        if value is None:
+            return or_(
+                and_(column.is_(None), uuid_column > record_uuid),
+                column.isnot(None),
+            )
+        return or_(column > value, and_(column == value, uuid_column > record_uuid))
+
+    if value is None:
+        return and_(column.is_(None), uuid_column < record_uuid)
+    return or_(
+        column < value,
+        column.is_(None),
+        and_(column == value, uuid_column < record_uuid),
+    )
+
+
+def has_fulltext_index(table, column: str):
+    """
+    Checks whether a column is covered by a MySQL FULLTEXT index.
+
+    Parameters
+    ----------
+    table : sqlalchemy.Table
+    column : str
+
+    Returns
+    -------
+    bool
+    """
+    for index in table.indexes:
+        prefix = index.dialect_options["mysql"]["prefix"]
+        if prefix == "FULLTEXT" and index.columns.keys() == [column]:
+            return True
+    return False
+
+
+def has_stopword_ngram(term: str):
+    """
+    Checks whether any ngram of a search term contains a stopword.
+    The ngram parser drops these ngrams from the index, so a phrase search
+    with them matches no rows.
+
+    Parameters
+    ----------
+    term : str
+
+    Returns
+    -------
+    bool
+    """
+    if not MYSQL_FULLTEXT_STOPWORDS:
+        return False
+
+    for word in term.lower().split():
+        for start in range(max(len(word) - NGRAM_TOKEN_SIZE + 1, 1)):
+            ngram = word[start:start + NGRAM_TOKEN_SIZE]
+            if any(stopword in ngram for stopword in INNODB_DEFAULT_STOPWORDS):
+                return True
+    return False
+
+
+def search_filter(session, model, column: str, value: str, collation: str = None):
+    """
+    Builds the condition of a substring search on a text column.
+
+    On MySQL, when the column has a FULLTEXT ngram index, a MATCH AGAINST
+    condition narrows the rows through the index before the LIKE is checked.
+    Otherwise, only the LIKE condition is used.
+
+    Parameters
+    ----------
+    session : sqlalchemy.orm.session.Session
+    model : projects.database.Base
+    column : str
+    value : str
+        The search term, escaped by generic_validators.escaped_format.
+    collation : str
+        The collation of the LIKE condition.
+
+    Returns
+    -------
+    sqlalchemy.sql.elements.ClauseElement
+    """
+    attribute = getattr(model, column)
+    condition = attribute.ilike(f"%{value}%")
+    if collation is not None:
+        condition = condition.collate(collation)
+
+    # terms shorter than a ngram, or with ngrams that are not indexed,
+    # are not found in the index
+    term = re.sub(r"\\(.)", r"\1", value).replace('"', " ")
+    if (
+        session.bind.dialect.name == "mysql"
+        and has_fulltext_index(model.__table__, column)
+        and len(term.strip()) >= NGRAM_TOKEN_SIZE
+        and not has_stopword_ngram(term)
+    ):
+        # double quotes search the phrase, i.e. the ngrams in sequence
+        condition = and_(attribute.match(f'"{term}"'), condition)
+
+    return condition
+
+
+def update_positions(
+    session,
+    model,
+    project_id: str,
+    record_uuid: Optional[str] = None,
+    new_position: Optional[int] = None,
+):
+    """
+    Reorders the experiments or deployments of a project.
+
+    Positions are made sequential and only the given record (or the last one,
+    when no record is given) is active. Only the rows whose position or
+    is_active changed are written, in a single UPDATE.
+
+    Parameters
+    ----------
+    session : sqlalchemy.orm.session.Session
+    model : projects.models.Experiment or projects.models.Deployment
+    project_id : str
+    record_uuid : str
+        The record that was created or moved.
+    new_position : int
+        The position where the record is shown.
+    """
+    # selects only the columns needed, so that relationships are not loaded
+    records = (
+        session.query(model.uuid, model.position, model.is_active)
+        .filter_by(project_id=project_id)
+        .order_by(model.position.asc())
+        .all()
+    )
+    current = {r.uuid: (r.position, r.is_active) for r in records}
+
+    ordered = [r.uuid for r in records if r.uuid != record_uuid]
+    if record_uuid is not None:
+        ordered.insert(new_position, record_uuid)
+
+    active = record_uuid
+    if active is None and ordered:
+        active = ordered[-1]
+
+    changes = {}
+    for index, uuid_ in enumerate(ordered):
+        data = (index, uuid_ == active)
+        if current.get(uuid_) != data:
+            changes[uuid_] = data
+
+    if not changes:
+        return
+
+    session.query(model).filter(model.uuid.in_(changes.keys())).update(
+        {
+            model.position: case(
+                {uuid_: data[0] for uuid_, data in changes.items()},
+                value=model.uuid,
+            ),
+            model.is_active: case(
+                {uuid_: data[1] for uuid_, data in changes.items()},
+                value=model.uuid,
+            ),
+        },
+        synchronize_session=False,
+    )
+
+    # keeps the records already loaded in the session up to date
+    for uuid_, (position, is_active) in changes.items():
+        record = session.identity_map.get(identity_key(model, uuid_))
+        if record is not None:
+            set_committed_value(record, "position", position)
+            set_committed_value(record, "is_active", is_active)
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""Directed acyclic graph of operators."""
+from collections import deque
+from typing import Dict, List, Optional
+
+from projects import models
+
+
+class OperatorGraph:
+    """
+    A graph of operators, where each operator points to its dependencies.
+
+    Parameters
+    ----------
+    dependencies : dict
+        A map of operator_id to the list of operator_ids it depends on.
+        The insertion order is kept by topological_sort.
+    """
+
+    def __init__(self, dependencies: Dict[str, List[str]]):
+        self.dependencies = {
+            operator_id: list(operator_dependencies or [])
+            for operator_id, operator_dependencies in dependencies.items()
+        }
+        self._dependents = None
+
+    @classmethod
+    def from_operators(cls, operators: List):
+        """
+        Builds the graph of a list of operators.
+
+        Parameters
+        ----------
+        operators : list
+            Objects that have uuid and dependencies attributes, or dicts with
+            these keys (e.g. template tasks).
+
+        Returns
+        -------
+        OperatorGraph
+        """
+        dependencies = {}
+        for operator in operators:
+            if isinstance(operator, dict):
+                dependencies[operator["uuid"]] = operator["dependencies"]
+            else:
+                dependencies[operator.uuid] = operator.dependencies
+        return cls(dependencies)
+
+    @classmethod
+    def load(
+        cls,
+        session,
+        experiment_id: Optional[str] = None,
+        deployment_id: Optional[str] = None,
+    ):
+        """
+        Loads the graph of an experiment or deployment with a single query.
+
+        Parameters
+        ----------
+        session : sqlalchemy.orm.session.Session
+        experiment_id : str or None
+        deployment_id : str or None
+
+        Returns
+        -------
+        OperatorGraph
+        """
+        rows = (
+            session.query(models.Operator.uuid, models.Operator.dependencies)
+            .filter_by(experiment_id=experiment_id)
+            .filter_by(deployment_id=deployment_id)
+            .all()
+        )
+        return cls.from_operators(rows)
+
+    def __contains__(self, operator_id):
+        return operator_id in self.dependencies
+
+    def __len__(self):
+        return len(self.dependencies)
+
+    @property
+    def dependents(self):
+        """
+        A map of operator_id to the list of operator_ids that depend on it.
+        Dependencies that are not in the graph are ignored.
+
+        Returns
+        -------
+        dict
+        """
+        if self._dependents is None:
+            self._dependents = {operator_id: [] for operator_id in self.dependencies}
+            for operator_id, operator_dependencies in self.dependencies.items():
+                for dependency_id in operator_dependencies:
+                    if dependency_id in self._dependents:
+                        self._dependents[dependency_id].append(operator_id)
+        return self._dependents
+
+    def roots(self):
+        """
+        Lists the operators without dependencies.
+
+        Returns
+        -------
+        list
+        """
+        return [
+            operator_id
+            for operator_id, operator_dependencies in self.dependencies.items()
+            if len(operator_dependencies) == 0
+        ]
+
+    def remap(self, mapping: Dict[str, str]):
+        """
+        Returns a copy of the graph with operator_ids replaced by the mapping.
+        Dependencies that are not in the mapping are dropped.
+
+        Parameters
+        ----------
+        mapping : dict
+            A map of operator_id to its new operator_id.
+
+        Returns
+        -------
+        OperatorGraph
+        """
+        return OperatorGraph(
+            {
+                mapping[operator_id]: [
+                    mapping[d] for d in operator_dependencies if d in mapping
+                ]
+                for operator_id, operator_dependencies in self.dependencies.items()
+            }
+        )
+
+    def descendants(self, operator_id: str):
+        """
+        Lists the operators that depend, directly or not, on an operator.
+
+        Parameters
+        ----------
+        operator_id : str
+
+        Returns
+        -------
+        set
+        """
+        reached = set()
+        stack = list(self.dependents.get(operator_id, []))
+        while stack:
+            current = stack.pop()
+            if current not in reached:
+                reached.add(current)
+                stack.extend(self.dependents[current])
+        return reached
+
+    def topological_sort(self):
+        """
+        Orders the operators so that each one comes after its dependencies.
+        Dependencies that are not in the graph are ignored.
+
+        Returns
+        -------
+        list
+
+        Raises
+        ------
+        ValueError
+            When the graph has cycles.
+        """
+        pending = {
+            operator_id: sum(1 for d in operator_dependencies if d in self.dependencies)
+            for operator_id, operator_dependencies in self.dependencies.items()
+        }
+        ready = deque(
+            operator_id for operator_id, count in pending.items() if count == 0
+        )
+
+        ordered = []
+        while ready:
+            operator_id = ready.popleft()
+            ordered.append(operator_id)
+            for dependent_id in self.dependents[operator_id]:
+                pending[dependent_id] -= 1
+                if pending[dependent_id] == 0:
+                    ready.append(dependent_id)
+
+        if len(ordered) != len(self.dependencies):
+            raise ValueError("graph has cycles")
+
+        return ordered
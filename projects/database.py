@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 import os
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 
@@ -11,11 +11,52 @@ DB_NAME = os.getenv("MYSQL_DB_NAME", "platiagro")
 DB_USER = os.getenv("MYSQL_DB_USER", "root")
 DB_PASS = os.getenv("MYSQL_DB_PASSWORD", "")
 DB_URL = f"mysql+pymysql://{DB_USER}:{DB_PASS}@{DB_HOST}/{DB_NAME}"
-engine = create_engine(
-    DB_URL,
-    connect_args={"connect_timeout": 10},
-)
+# optional read replica, used by read-only endpoints
+DB_READ_HOST = os.getenv("MYSQL_DB_READ_HOST")
+DB_READ_URL = f"mysql+pymysql://{DB_USER}:{DB_PASS}@{DB_READ_HOST}/{DB_NAME}"
+
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "300"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+
+
+def create_db_engine(url: str, **kwargs):
+    """
+    Creates an engine whose connection pool is configured by env variables.
+
+    Parameters
+    ----------
+    url : str
+    **kwargs
+        Overrides the default pool options.
+
+    Returns
+    -------
+    sqlalchemy.engine.Engine
+    """
+    options = {
+        "connect_args": {"connect_timeout": 10},
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        # connections idle for longer than this are replaced, which avoids
+        # "MySQL server has gone away" errors after idle periods
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+    options.update(kwargs)
+    return create_engine(url, **options)
+
+
+engine = create_db_engine(DB_URL)
+if DB_READ_HOST:
+    read_engine = create_db_engine(DB_READ_URL)
+else:
+    read_engine = engine
 Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSession = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
 Base = declarative_base()
 
 
@@ -30,6 +71,20 @@ def session_scope():
         session.close()
 
 
+def read_session_scope():
+    """
+    Provide a scope for read-only operations.
+
+    Sessions are bound to the read replica (MYSQL_DB_READ_HOST) when it is set,
+    otherwise they are bound to the primary database.
+    """
+    session = ReadSession()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
 def init_db():
     """
     Issues CREATE statements for all tables.
@@ -45,3 +100,19 @@ def init_db():
     conn.close()
 
     Base.metadata.create_all(bind=engine)
+    create_missing_indexes()
+
+
+def create_missing_indexes():
+    """
+    Issues CREATE INDEX statements for indexes missing in existing tables.
+
+    create_all only creates the indexes of new tables, so indexes added to the
+    models after a table was created are created here.
+    """
+    inspector = inspect(engine)
+    for table in Base.metadata.sorted_tables:
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(bind=engine)
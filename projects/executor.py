@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""Bounded thread pools that run blocking work off the event loop."""
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_POOL = "default"
+THREAD_POOL_MAX_WORKERS = int(os.getenv("THREAD_POOL_MAX_WORKERS", "40"))
+
+_EXECUTORS = {}
+_EXECUTORS_LOCK = threading.Lock()
+
+
+class InstrumentedThreadPoolExecutor(ThreadPoolExecutor):
+    """
+    A ThreadPoolExecutor that keeps track of how busy it is.
+
+    Parameters
+    ----------
+    name : str
+        The pool name, used to identify the pool in metrics.
+    max_workers : int
+        The maximum number of threads of this pool.
+    """
+
+    def __init__(self, name: str, max_workers: int):
+        super().__init__(max_workers=max_workers, thread_name_prefix=f"{name}-pool")
+        self.name = name
+        self.max_workers = max_workers
+        self._stats_lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._completed = 0
+
+    def submit(self, fn, *args, **kwargs):
+        """
+        Submits a callable to be executed, counting it as queued until a worker picks it up.
+
+        Parameters
+        ----------
+        fn : callable
+        *args
+        **kwargs
+
+        Returns
+        -------
+        concurrent.futures.Future
+        """
+        with self._stats_lock:
+            self._queued += 1
+
+        try:
+            return super().submit(self._track, fn, *args, **kwargs)
+        except RuntimeError:
+            with self._stats_lock:
+                self._queued -= 1
+            raise
+
+    def _track(self, fn, *args, **kwargs):
+        with self._stats_lock:
+            self._queued -= 1
+            self._running += 1
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._stats_lock:
+                self._running -= 1
+                self._completed += 1
+
+    def stats(self):
+        """
+        Returns a snapshot of the pool usage.
+
+        Returns
+        -------
+        dict
+        """
+        with self._stats_lock:
+            return {
+                "name": self.name,
+                "maxWorkers": self.max_workers,
+                "running": self._running,
+                "queued": self._queued,
+                "completed": self._completed,
+                "saturation": round(self._running / self.max_workers, 4),
+            }
+
+
+def get_executor(name: str = DEFAULT_POOL):
+    """
+    Returns the thread pool registered with the given name, creating it if needed.
+
+    The size of a pool is read from the env variable THREAD_POOL_<NAME>_MAX_WORKERS,
+    and falls back to THREAD_POOL_MAX_WORKERS.
+
+    Parameters
+    ----------
+    name : str
+
+    Returns
+    -------
+    InstrumentedThreadPoolExecutor
+    """
+    executor = _EXECUTORS.get(name)
+    if executor is not None:
+        return executor
+
+    with _EXECUTORS_LOCK:
+        if name not in _EXECUTORS:
+            env_name = f"THREAD_POOL_{name.upper()}_MAX_WORKERS"
+            max_workers = int(os.getenv(env_name, THREAD_POOL_MAX_WORKERS))
+            _EXECUTORS[name] = InstrumentedThreadPoolExecutor(
+                name=name, max_workers=max_workers
+            )
+        return _EXECUTORS[name]
+
+
+async def run_in_executor(func, *args, pool: str = DEFAULT_POOL, **kwargs):
+    """
+    Runs a blocking callable in a thread pool and awaits its result.
+
+    Parameters
+    ----------
+    func : callable
+    *args
+    pool : str
+        The name of the thread pool. Default value is "default".
+    **kwargs
+
+    Returns
+    -------
+    Any
+        The value returned by func.
+    """
+    loop = asyncio.get_running_loop()
+    # Runs in a copy of the current context, so contextvars are preserved
+    context = contextvars.copy_context()
+    child = functools.partial(func, *args, **kwargs)
+    return await loop.run_in_executor(get_executor(pool), context.run, child)
+
+
+def list_executors_stats():
+    """
+    Lists usage metrics of all thread pools.
+
+    Returns
+    -------
+    list
+    """
+    with _EXECUTORS_LOCK:
+        executors = list(_EXECUTORS.values())
+    return [executor.stats() for executor in executors]
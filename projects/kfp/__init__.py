@@ -1,6 +1,15 @@
-from .kfp import kfp_client, KF_PIPELINES_NAMESPACE
+from .kfp import (
+    KF_PIPELINES_NAMESPACE,
+    cache_kfp_experiment_id,
+    get_kfp_experiment_id,
+    kfp_client,
+    reset_kfp_client,
+)
 
 __all__ = [
+    "cache_kfp_experiment_id",
+    "get_kfp_experiment_id",
     "kfp_client",
+    "reset_kfp_client",
     "KF_PIPELINES_NAMESPACE",
 ]
@@ -2,29 +2,104 @@
 """Kubeflow Pipelines interface."""
 import os
 import pathlib
+import threading
+import time
 
 import kfp
 
 KF_PIPELINES_NAMESPACE = os.getenv("KF_PIPELINES_NAMESPACE", "anonymous")
+# seconds a KFP experiment id is kept in cache
+KFP_EXPERIMENT_CACHE_TTL = float(os.getenv("KFP_EXPERIMENT_CACHE_TTL", "300"))
+
+_CLIENT = None
+_CLIENT_LOCK = threading.Lock()
+_EXPERIMENT_IDS = {}
+_EXPERIMENT_IDS_LOCK = threading.Lock()
 
 
 def kfp_client():
     """
     Singleton that returns a kfp.Client object.
-    It was changed from constant to a function because the client instance
-    makes a request during __init__ (before the mock API is available), causing
-    tests to fail.
+    The client is created on first use, because the client instance makes a
+    request during __init__ (before the mock API is available in tests), and
+    is then shared by all threads.
 
     Returns
     -------
     kfp.Client
     """
-    host = os.getenv("KF_PIPELINES_ENDPOINT", "http://ml-pipeline.kubeflow:8888")
-    client = kfp.Client(host=host)
-    if KF_PIPELINES_NAMESPACE != "kubeflow":
-        # user namespace is stored in a configuration file at $HOME/.config/kfp/context.json
-        os.makedirs(
-            os.path.join(str(pathlib.Path.home()), ".config", "kfp"), exist_ok=True
+    global _CLIENT
+
+    with _CLIENT_LOCK:
+        if _CLIENT is None:
+            host = os.getenv(
+                "KF_PIPELINES_ENDPOINT", "http://ml-pipeline.kubeflow:8888"
+            )
+            client = kfp.Client(host=host)
+            if KF_PIPELINES_NAMESPACE != "kubeflow":
+                # user namespace is stored in a configuration file at $HOME/.config/kfp/context.json
+                os.makedirs(
+                    os.path.join(str(pathlib.Path.home()), ".config", "kfp"),
+                    exist_ok=True,
+                )
+                client.set_user_namespace(namespace=KF_PIPELINES_NAMESPACE)
+            _CLIENT = client
+
+    return _CLIENT
+
+
+def reset_kfp_client():
+    """
+    Discards the shared kfp.Client and the cached KFP experiment ids.
+    """
+    global _CLIENT
+
+    with _CLIENT_LOCK:
+        _CLIENT = None
+
+    with _EXPERIMENT_IDS_LOCK:
+        _EXPERIMENT_IDS.clear()
+
+
+def get_kfp_experiment_id(name):
+    """
+    Returns the id of a KFP experiment given its name.
+    Ids are cached for KFP_EXPERIMENT_CACHE_TTL seconds.
+
+    Parameters
+    ----------
+    name : str
+
+    Returns
+    -------
+    str
+
+    Raises
+    ------
+    ValueError
+        When the KFP experiment does not exist.
+    """
+    with _EXPERIMENT_IDS_LOCK:
+        cached = _EXPERIMENT_IDS.get(name)
+    if cached is not None and cached[1] > time.monotonic():
+        return cached[0]
+
+    kfp_experiment = kfp_client().get_experiment(experiment_name=name)
+    cache_kfp_experiment_id(name, kfp_experiment.id)
+    return kfp_experiment.id
+
+
+def cache_kfp_experiment_id(name, kfp_experiment_id):
+    """
+    Caches the id of a KFP experiment.
+
+    Parameters
+    ----------
+    name : str
+    kfp_experiment_id : str
+    """
+    with _EXPERIMENT_IDS_LOCK:
+        _EXPERIMENT_IDS[name] = (
+            kfp_experiment_id,
+            time.monotonic() + KFP_EXPERIMENT_CACHE_TTL,
         )
-        client.set_user_namespace(namespace=KF_PIPELINES_NAMESPACE)
-    return client
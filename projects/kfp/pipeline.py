@@ -1,15 +1,21 @@
 # -*- coding: utf-8 -*-
 """Kubeflow Pipelines interface."""
-from collections import defaultdict
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
 from datetime import datetime
 from json import dumps, loads
-from os import getenv
+from os import getenv, path
 
+import kfp
 from kfp import compiler, dsl
 from kfp.dsl._resource_op import kubernetes_resource_delete_op
+from kfp_server_api.rest import ApiException
 from kubernetes import client as k8s_client
 from kubernetes.client.models import V1PersistentVolumeClaim
 
+from projects.dag import OperatorGraph
 from projects.kfp import KF_PIPELINES_NAMESPACE, kfp_client
 from projects.kfp.templates import COMPONENT_SPEC, GRAPH, SELDON_DEPLOYMENT
 from projects.kubernetes.utils import volume_exists
@@ -27,10 +33,16 @@ SELDON_LOGGER_ENDPOINT = getenv(
     "http://projects.platiagro:8080",
 )
 
+# number of pipeline version ids kept in memory, by digest of the pipeline
+PIPELINE_CACHE_SIZE = int(getenv("PIPELINE_CACHE_SIZE", "1024"))
+
+_PIPELINE_VERSIONS = OrderedDict()
+_PIPELINE_VERSIONS_LOCK = threading.Lock()
+
 
 def compile_pipeline(name, operators, project_id, experiment_id, deployment_id):
     """
-    Compile the pipeline in a .yaml file.
+    Compile the pipeline in memory.
 
     Parameters
     ----------
@@ -39,6 +51,11 @@ def compile_pipeline(name, operators, project_id, experiment_id, deployment_id):
     project_id : str
     experiment_id : str
     deployment_id : str or None
+
+    Returns
+    -------
+    dict
+        The Argo workflow of the pipeline.
     """
     @dsl.pipeline(name=name)
     def pipeline_func():
@@ -86,8 +103,192 @@ def compile_pipeline(name, operators, project_id, experiment_id, deployment_id):
             if deployment_id is not None:
                 resource_op.after(container_op)
 
-    compiler.Compiler() \
-        .compile(pipeline_func, f"{name}.yaml")
+    # Compiler.compile writes this workflow to a file, it is kept in memory instead
+    return compiler.Compiler()._create_workflow(pipeline_func)
+
+
+def get_pipeline_digest(name, operators, experiment_id):
+    """
+    Returns a digest of everything an experiment pipeline is compiled from:
+    the operator graph, task images, commands, resources and parameters.
+
+    Parameters
+    ----------
+    name : str
+    operators : list
+    experiment_id : str
+
+    Returns
+    -------
+    str
+    """
+    content = {
+        "kfp": kfp.__version__,
+        "name": name,
+        "experimentId": experiment_id,
+        "namespace": KF_PIPELINES_NAMESPACE,
+        "minioEndpoint": MINIO_ENDPOINT,
+        "operators": [
+            {
+                "uuid": operator.uuid,
+                "dependencies": sorted(operator.dependencies),
+                "parameters": operator.parameters,
+                "taskId": operator.task_id,
+                "taskName": operator.task.name,
+                "image": operator.task.image,
+                "commands": operator.task.commands,
+                "arguments": operator.task.arguments,
+                "notebookPath": operator.task.experiment_notebook_path,
+                "taskParameters": operator.task.parameters,
+                "resources": [
+                    operator.task.memory_request,
+                    operator.task.memory_limit,
+                    operator.task.cpu_request,
+                    operator.task.cpu_limit,
+                ],
+            }
+            for operator in sorted(operators, key=lambda o: o.uuid)
+        ],
+    }
+    data = dumps(content, sort_keys=True, default=str)
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+def get_pipeline_version_id(name, digest):
+    """
+    Returns the id of the KFP pipeline version uploaded for a digest.
+
+    Parameters
+    ----------
+    name : str
+        The KFP pipeline name.
+    digest : str
+        The KFP pipeline version name.
+
+    Returns
+    -------
+    str or None
+        None when the pipeline version was not uploaded.
+    """
+    with _PIPELINE_VERSIONS_LOCK:
+        if digest in _PIPELINE_VERSIONS:
+            _PIPELINE_VERSIONS.move_to_end(digest)
+            return _PIPELINE_VERSIONS[digest]
+
+    pipeline_id = kfp_client().get_pipeline_id(name)
+    if pipeline_id is None:
+        return None
+
+    # versions uploaded by other replicas
+    predicate = {"key": "name", "op": "EQUALS", "string_value": digest}
+    response = kfp_client().pipelines.list_pipeline_versions(
+        resource_key_type="PIPELINE",
+        resource_key_id=pipeline_id,
+        filter=dumps({"predicates": [predicate]}),
+        page_size=1,
+    )
+    if not response.versions:
+        return None
+
+    cache_pipeline_version_id(digest, response.versions[0].id)
+    return response.versions[0].id
+
+
+def upload_pipeline_version(name, digest, workflow):
+    """
+    Uploads a compiled pipeline as a version of the KFP pipeline `name`.
+    The pipeline is created on its first upload.
+
+    Parameters
+    ----------
+    name : str
+    digest : str
+    workflow : dict
+
+    Returns
+    -------
+    str
+        The pipeline version id.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        # JSON is valid YAML, so the workflow is written as it is
+        pipeline_package_path = path.join(directory, f"{digest}.yaml")
+        with open(pipeline_package_path, "w") as f:
+            f.write(dumps(workflow))
+
+        pipeline_id = kfp_client().get_pipeline_id(name)
+        if pipeline_id is None:
+            try:
+                # the default version of a new pipeline is named after the
+                # pipeline, so the digest version is uploaded next
+                pipeline = kfp_client().upload_pipeline(
+                    pipeline_package_path=pipeline_package_path,
+                    pipeline_name=name,
+                )
+                pipeline_id = pipeline.id
+            except ApiException:
+                # the pipeline was created by a concurrent request
+                pipeline_id = kfp_client().get_pipeline_id(name)
+                if pipeline_id is None:
+                    raise
+
+        try:
+            version = kfp_client().upload_pipeline_version(
+                pipeline_package_path=pipeline_package_path,
+                pipeline_version_name=digest,
+                pipeline_id=pipeline_id,
+            )
+            version_id = version.id
+        except ApiException:
+            # the version was uploaded by a concurrent request
+            version_id = get_pipeline_version_id(name, digest)
+            if version_id is None:
+                raise
+
+    cache_pipeline_version_id(digest, version_id)
+    return version_id
+
+
+def delete_pipeline(name):
+    """
+    Deletes a KFP pipeline and all its versions, if it exists.
+
+    Parameters
+    ----------
+    name : str
+    """
+    pipeline_id = kfp_client().get_pipeline_id(name)
+    if pipeline_id is not None:
+        kfp_client().delete_pipeline(pipeline_id)
+
+
+def cache_pipeline_version_id(digest, version_id):
+    """
+    Caches the id of a pipeline version. Keeps the PIPELINE_CACHE_SIZE most
+    recently used ids.
+
+    Parameters
+    ----------
+    digest : str
+    version_id : str or None
+        None removes the id from cache.
+    """
+    with _PIPELINE_VERSIONS_LOCK:
+        if version_id is None:
+            _PIPELINE_VERSIONS.pop(digest, None)
+            return
+        _PIPELINE_VERSIONS[digest] = version_id
+        _PIPELINE_VERSIONS.move_to_end(digest)
+        while len(_PIPELINE_VERSIONS) > PIPELINE_CACHE_SIZE:
+            _PIPELINE_VERSIONS.popitem(last=False)
+
+
+def clear_pipeline_cache():
+    """
+    Discards the cached pipeline version ids.
+    """
+    with _PIPELINE_VERSIONS_LOCK:
+        _PIPELINE_VERSIONS.clear()
 
 
 def create_volume_op(name):
@@ -293,33 +494,27 @@ def create_resource_op(operators, project_id, experiment_id, deployment_id):
             })
         )
 
-    first = None
-    graph = defaultdict(list)
-    for operator in operators:
-        if len(operator.dependencies) == 0:
-            first = operator.uuid
-
-        for dependency_id in operator.dependencies:
-            graph[dependency_id].append({operator.uuid: graph[operator.uuid]})
-
-    if first is None:
+    operator_graph = OperatorGraph.from_operators(operators)
+    roots = operator_graph.roots()
+    if not roots:
         raise ValueError("deployment can't have cycles")
 
-    def build_graph(operator_id, children):
-        if len(children) > 1:
+    # seldon graphs are a chain: each operator has at most one dependent
+    chain = [roots[-1]]
+    while operator_graph.dependents[chain[-1]]:
+        dependents = operator_graph.dependents[chain[-1]]
+        if len(dependents) > 1:
             raise ValueError("deployment can't have multiple dependencies")
-        elif len(children) == 1:
-            child_operator_id, children = next(iter(children[0].items()))
-            children = build_graph(child_operator_id, children)
-        else:
-            children = ""
+        if dependents[0] in chain:
+            raise ValueError("deployment can't have cycles")
+        chain.append(dependents[0])
 
-        return GRAPH.substitute({
+    graph = ""
+    for operator_id in reversed(chain):
+        graph = GRAPH.substitute({
             "name": operator_id,
-            "children": children,
+            "children": graph,
         })
-
-    graph = build_graph(operator_id=first, children=graph[first])
     graph = loads(graph)
     graph["logger"] = {
         "mode": "response",
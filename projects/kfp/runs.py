@@ -3,49 +3,99 @@
 import json
 import os
 from datetime import datetime
+from kfp_server_api.models import (
+    ApiPipelineSpec,
+    ApiRelationship,
+    ApiResourceKey,
+    ApiResourceReference,
+    ApiResourceType,
+    ApiRun,
+)
 from kfp_server_api.rest import ApiException
 from projects.exceptions import NotFound
 
 from projects.exceptions import BadRequest
-from projects.kfp import kfp_client
-from projects.kfp.pipeline import compile_pipeline
+from projects.executor import get_executor
+from projects.kfp import cache_kfp_experiment_id, get_kfp_experiment_id, kfp_client
+from projects.kfp.pipeline import (
+    cache_pipeline_version_id,
+    compile_pipeline,
+    get_pipeline_digest,
+    get_pipeline_version_id,
+    upload_pipeline_version,
+)
 
+# number of run details that are fetched at the same time when listing runs
+KFP_MAX_PARALLEL_RUNS = int(os.getenv("KFP_MAX_PARALLEL_RUNS", "8"))
 
-def list_runs(experiment_id):
+
+def list_runs(experiment_id, page_size=10, page_token=""):
     """
-    Lists all runs of an experiment.
+    Lists a page of runs of an experiment, the most recent first.
 
     Parameters
     ----------
     experiment_id : str
+    page_size : int
+        The page size. Default value is 10.
+    page_token : str
+        The token returned by the previous page. Empty lists the first page.
 
     Returns
     -------
-    list
-        A list of all runs.
+    tuple
+        A list of runs, the total number of runs and the token of the next page,
+        which is None in the last page.
     """
     # In order to list_runs, we need to find KFP experiment id.
     # KFP experiment id is different from PlatIAgro's experiment_id,
-    # so calling kfp_client().get_experiment(experiment_name='..') is required first.
+    # so the KFP experiment id is looked up (or read from cache) first.
     try:
-        kfp_experiment = kfp_client().get_experiment(experiment_name=experiment_id)
+        kfp_experiment_id = get_kfp_experiment_id(experiment_id)
     except ValueError:
-        return []
+        return [], 0, None
 
     # Now, lists runs
     kfp_runs = kfp_client().list_runs(
-        page_size="10",
+        page_token=page_token or "",
+        page_size=page_size,
         sort_by="created_at desc",
-        experiment_id=kfp_experiment.id,
+        experiment_id=kfp_experiment_id,
     )
+    run_ids = [kfp_run.id for kfp_run in kfp_runs.runs or []]
 
+    # the listing does not include workflow manifests, so the details of
+    # the runs in the page are fetched by the shared "kfp" pool,
+    # at most KFP_MAX_PARALLEL_RUNS at a time
+    executor = get_executor("kfp")
     runs = []
-    for kfp_run in kfp_runs.runs:
-        run_id = kfp_run.id
-        run = get_run(experiment_id=experiment_id, run_id=run_id)
-        runs.append(run)
+    for start in range(0, len(run_ids), KFP_MAX_PARALLEL_RUNS):
+        batch = run_ids[start:start + KFP_MAX_PARALLEL_RUNS]
+        for run in executor.map(get_run_or_none, batch):
+            if run is not None:
+                runs.append(run)
+
+    total = kfp_runs.total_size or len(runs)
+    return runs, total, kfp_runs.next_page_token or None
 
-    return runs
+
+def get_run_or_none(run_id):
+    """
+    Details a run in Kubeflow Pipelines, or returns None when it was
+    deleted after being listed.
+
+    Parameters
+    ----------
+    run_id : str
+
+    Returns
+    -------
+    dict or None
+    """
+    try:
+        return get_run(run_id=run_id, experiment_id=None)
+    except NotFound:
+        return None
 
 
 def start_run(
@@ -73,31 +123,126 @@ def start_run(
         name = f"experiment-{experiment_id}"
     else:
         name = f"deployment-{deployment_id}"
+        # deployment workflows are unique (see create_resource_op),
+        # so they are compiled on every run and are not uploaded
+        workflow = compile_pipeline(
+            name=name,
+            operators=operators,
+            project_id=project_id,
+            experiment_id=experiment_id,
+            deployment_id=deployment_id,
+        )
+
+    if deployment_id is not None:
+        kfp_experiment_name = deployment_id
+    else:
+        kfp_experiment_name = experiment_id
+    kfp_experiment = kfp_client().create_experiment(name=kfp_experiment_name)
+    cache_kfp_experiment_id(kfp_experiment_name, kfp_experiment.id)
+
+    tag = datetime.utcnow().strftime("%Y-%m-%d %H-%M-%S")
 
-    compile_pipeline(
+    job_name = f"{name}-{tag}"
+
+    if deployment_id is not None:
+        run = create_run_from_workflow(
+            kfp_experiment_id=kfp_experiment.id,
+            job_name=job_name,
+            workflow=workflow,
+        )
+    else:
+        run = run_experiment_pipeline(
+            kfp_experiment_id=kfp_experiment.id,
+            job_name=job_name,
+            name=name,
+            operators=operators,
+            project_id=project_id,
+            experiment_id=experiment_id,
+        )
+
+    return get_run(run.id, experiment_id)
+
+
+def run_experiment_pipeline(
+    kfp_experiment_id, job_name, name, operators, project_id, experiment_id
+):
+    """
+    Runs an experiment pipeline. Each distinct pipeline is compiled and
+    uploaded as a KFP pipeline version once, then reused by later runs.
+
+    Parameters
+    ----------
+    kfp_experiment_id : str
+    job_name : str
+    name : str
+    operators : list
+    project_id : str
+    experiment_id : str
+
+    Returns
+    -------
+    kfp_server_api.models.api_run.ApiRun
+    """
+    digest = get_pipeline_digest(name, operators, experiment_id)
+
+    version_id = get_pipeline_version_id(name, digest)
+    if version_id is not None:
+        try:
+            return kfp_client().run_pipeline(
+                experiment_id=kfp_experiment_id,
+                job_name=job_name,
+                version_id=version_id,
+            )
+        except ApiException as e:
+            if e.status != 404:
+                raise
+            # the pipeline version was deleted in KFP
+            cache_pipeline_version_id(digest, None)
+
+    workflow = compile_pipeline(
         name=name,
         operators=operators,
         project_id=project_id,
         experiment_id=experiment_id,
-        deployment_id=deployment_id,
+        deployment_id=None,
     )
+    version_id = upload_pipeline_version(name, digest, workflow)
 
-    if deployment_id is not None:
-        kfp_experiment = kfp_client().create_experiment(name=deployment_id)
-    else:
-        kfp_experiment = kfp_client().create_experiment(name=experiment_id)
+    return kfp_client().run_pipeline(
+        experiment_id=kfp_experiment_id,
+        job_name=job_name,
+        version_id=version_id,
+    )
 
-    tag = datetime.utcnow().strftime("%Y-%m-%d %H-%M-%S")
 
-    job_name = f"{name}-{tag}"
-    pipeline_package_path = f"{name}.yaml"
-    run = kfp_client().run_pipeline(
-        experiment_id=kfp_experiment.id,
-        job_name=job_name,
-        pipeline_package_path=pipeline_package_path,
+def create_run_from_workflow(kfp_experiment_id, job_name, workflow):
+    """
+    Creates a run from a compiled pipeline, without writing it to a file.
+
+    Parameters
+    ----------
+    kfp_experiment_id : str
+    job_name : str
+    workflow : dict
+
+    Returns
+    -------
+    kfp_server_api.models.api_run.ApiRun
+    """
+    run_body = ApiRun(
+        name=job_name,
+        pipeline_spec=ApiPipelineSpec(workflow_manifest=json.dumps(workflow)),
+        resource_references=[
+            ApiResourceReference(
+                key=ApiResourceKey(
+                    id=kfp_experiment_id,
+                    type=ApiResourceType.EXPERIMENT,
+                ),
+                relationship=ApiRelationship.OWNER,
+            ),
+        ],
     )
-    os.remove(pipeline_package_path)
-    return get_run(run.id, experiment_id)
+    return kfp_client().runs.create_run(body=run_body).run
 
 
 def get_run(run_id, experiment_id):
@@ -131,8 +276,27 @@ def get_run(run_id, experiment_id):
 
     workflow_manifest = json.loads(kfp_run.pipeline_runtime.workflow_manifest)
 
-    operators = {}
+    return {
+        "uuid": kfp_run.run.id,
+        "operators": get_operators(workflow_manifest),
+        "createdAt": kfp_run.run.created_at,
+    }
+
+
+def get_operators(workflow_manifest):
+    """
+    Builds the status, taskId and parameters of each operator from a parsed
+    workflow manifest.
+
+    Parameters
+    ----------
+    workflow_manifest : dict
 
+    Returns
+    -------
+    dict
+        Operators attributes by operator_id.
+    """
     workflow_status = workflow_manifest["status"].get("phase")
 
     if workflow_status in {"Succeeded", "Failed"}:
@@ -140,34 +304,31 @@ def get_run(run_id, experiment_id):
     else:
         default_node_status = "Pending"
 
+    templates = workflow_manifest["spec"]["templates"]
+
     # initializes all operators with status=Pending and parameters={}
-    template = next(t for t in workflow_manifest["spec"]["templates"] if "dag" in t)
-    tasks = (
-        tsk for tsk in template["dag"]["tasks"] if not tsk["name"].startswith("vol-")
-    )
-    operators = dict(
-        (t["name"], {"status": default_node_status, "parameters": {}}) for t in tasks
-    )
+    template = next(t for t in templates if "dag" in t)
+    operators = {
+        task["name"]: {"status": default_node_status, "parameters": {}}
+        for task in template["dag"]["tasks"]
+        if not task["name"].startswith("vol-")
+    }
 
     # set status for each operator
     for node in workflow_manifest["status"].get("nodes", {}).values():
-        if node["displayName"] in operators:
-            operator_id = node["displayName"]
-            operators[operator_id]["status"] = get_status(node)
+        operator = operators.get(node["displayName"])
+        if operator is not None:
+            operator["status"] = get_status(node)
 
     # sets taskId and parameters for each operator
-    for template in workflow_manifest["spec"]["templates"]:
+    for template in templates:
         operator_id = template["name"]
         if "inputs" in template and "parameters" in template["inputs"]:
             operators[operator_id]["taskId"] = get_task_id(template)
         if "container" in template and "env" in template["container"]:
             operators[operator_id]["parameters"] = get_parameters(template)
 
-    return {
-        "uuid": kfp_run.run.id,
-        "operators": operators,
-        "createdAt": kfp_run.run.created_at,
-    }
+    return operators
 
 
 def get_latest_run_id(experiment_id):
@@ -183,7 +344,7 @@ def get_latest_run_id(experiment_id):
     str
     """
     try:
-        kfp_experiment = kfp_client().get_experiment(experiment_name=experiment_id)
+        kfp_experiment_id = get_kfp_experiment_id(experiment_id)
     except ValueError:
         return None
 
@@ -191,7 +352,7 @@ def get_latest_run_id(experiment_id):
     kfp_runs = kfp_client().list_runs(
         page_size="1",
         sort_by="created_at desc",
-        experiment_id=kfp_experiment.id,
+        experiment_id=kfp_experiment_id,
     )
 
     # find the latest training run
@@ -1,14 +1,53 @@
 # -*- coding: utf-8 -*-
 """Istio functions."""
+import logging
 import os
+import threading
+import time
+
 from kubernetes import client
 
 from projects.kubernetes.kube_config import load_kube_config
 
+# seconds the cluster ip and protocol are kept in cache
+ISTIO_CACHE_TTL = float(os.getenv("ISTIO_CACHE_TTL", "300"))
+
+_CACHE = {}
+_CACHE_LOCK = threading.Lock()
+_REFRESHING = set()
+
 
 def get_cluster_ip():
     """
     Retrieve the cluster ip.
+    The value is cached for ISTIO_CACHE_TTL seconds, then refreshed in background.
+
+    Returns
+    -------
+    str
+        The cluster ip.
+    """
+    if "INGRESS_HOST_PORT" in os.environ:
+        return os.environ["INGRESS_HOST_PORT"]
+    return get_cached("cluster_ip", read_cluster_ip)
+
+
+def get_protocol():
+    """
+    Get protocol used by the cluster.
+    The value is cached for ISTIO_CACHE_TTL seconds, then refreshed in background.
+
+    Returns
+    -------
+    str
+        The protocol.
+    """
+    return get_cached("protocol", read_protocol)
+
+
+def read_cluster_ip():
+    """
+    Reads the cluster ip from the istio-ingressgateway Service.
 
     Returns
     -------
@@ -28,12 +67,12 @@ def get_cluster_ip():
             cluster_ip = service.status.load_balancer.ingress[0].hostname
         else:
             cluster_ip = service.status.load_balancer.ingress[0].ip
-    return os.environ.get("INGRESS_HOST_PORT", cluster_ip)
+    return cluster_ip
 
 
-def get_protocol():
+def read_protocol():
     """
-    Get protocol used by the cluster.
+    Reads the protocol from the kubeflow-gateway Gateway.
 
     Returns
     -------
@@ -54,3 +93,64 @@ def get_protocol():
         protocol = 'http'
 
     return protocol
+
+
+def get_cached(key, read):
+    """
+    Returns a cached value. The first call reads the value, later calls
+    return the cached value and, once it expires, refresh it in background.
+
+    Parameters
+    ----------
+    key : str
+    read : function
+        Reads the current value from Kubernetes.
+
+    Returns
+    -------
+    str
+    """
+    with _CACHE_LOCK:
+        cached = _CACHE.get(key)
+        if cached is not None:
+            value, expires_at = cached
+            if expires_at <= time.monotonic() and key not in _REFRESHING:
+                _REFRESHING.add(key)
+                threading.Thread(
+                    target=refresh_cached, args=(key, read), daemon=True
+                ).start()
+            return value
+
+    value = read()
+    with _CACHE_LOCK:
+        _CACHE[key] = (value, time.monotonic() + ISTIO_CACHE_TTL)
+    return value
+
+
+def refresh_cached(key, read):
+    """
+    Reads a value again and replaces it in cache. The cached value is kept
+    when Kubernetes can't be reached.
+
+    Parameters
+    ----------
+    key : str
+    read : function
+    """
+    try:
+        value = read()
+        with _CACHE_LOCK:
+            _CACHE[key] = (value, time.monotonic() + ISTIO_CACHE_TTL)
+    except Exception as e:
+        logging.warning(f"Could not refresh {key}: {e}")
+    finally:
+        with _CACHE_LOCK:
+            _REFRESHING.discard(key)
+
+
+def clear_istio_cache():
+    """
+    Discards the cached cluster ip and protocol.
+    """
+    with _CACHE_LOCK:
+        _CACHE.clear()
@@ -1,9 +1,12 @@
 # -*- coding: utf-8 -*-
 """Seldon utility functions."""
+import os
+import threading
 
-
+import requests
 from kubernetes import client
-
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from projects.kfp import KF_PIPELINES_NAMESPACE
 from projects.kubernetes.istio import get_cluster_ip, get_protocol
@@ -11,6 +14,23 @@ from projects.kubernetes.kube_config import load_kube_config
 
 EXCLUDE_CONTAINERS = ["istio-proxy", "wait"]
 
+SELDON_CONNECT_TIMEOUT = float(os.getenv("SELDON_CONNECT_TIMEOUT", "5"))
+SELDON_READ_TIMEOUT = float(os.getenv("SELDON_READ_TIMEOUT", "60"))
+SELDON_MAX_RETRIES = int(os.getenv("SELDON_MAX_RETRIES", "3"))
+# keep-alive connections kept open to each deployment
+SELDON_POOL_MAXSIZE = int(os.getenv("SELDON_POOL_MAXSIZE", "10"))
+# maximum number of concurrent prediction requests to each deployment
+SELDON_MAX_CONCURRENCY = int(os.getenv("SELDON_MAX_CONCURRENCY", "4"))
+# seconds a prediction request waits for a deployment with no free slot
+SELDON_QUEUE_TIMEOUT = float(os.getenv("SELDON_QUEUE_TIMEOUT", "5"))
+# number of deployments whose connection pools are kept open
+SELDON_POOL_CONNECTIONS = 100
+
+_HTTP_SESSION = None
+_HTTP_SESSION_LOCK = threading.Lock()
+_SEMAPHORES = {}
+_SEMAPHORES_LOCK = threading.Lock()
+
 
 def get_seldon_deployment_url(deployment_id, ip=None, protocol=None, external_url=True):
     """
@@ -99,3 +119,105 @@ def list_project_seldon_deployments(project_id):
     )["items"]
 
     return deployments
+
+
+def get_http_session():
+    """
+    Returns the HTTP session shared by all requests to seldon deployments.
+
+    The session keeps a pool of keep-alive connections to each deployment and
+    retries requests that failed to connect or got a 502, 503 or 504 status.
+    Requests that timed out while reading the response are not retried, as
+    the deployment may still be computing the prediction.
+
+    Returns
+    -------
+    requests.Session
+    """
+    global _HTTP_SESSION
+
+    with _HTTP_SESSION_LOCK:
+        if _HTTP_SESSION is None:
+            retries = Retry(
+                total=SELDON_MAX_RETRIES,
+                read=0,
+                backoff_factor=0.5,
+                status_forcelist=[502, 503, 504],
+                # POST requests are retried too, but only when the request was not sent
+                # (connection errors) or was rejected by the gateway (status_forcelist)
+                allowed_methods=False,
+                raise_on_status=False,
+            )
+            adapter = HTTPAdapter(
+                pool_connections=SELDON_POOL_CONNECTIONS,
+                pool_maxsize=SELDON_POOL_MAXSIZE,
+                max_retries=retries,
+            )
+            session = requests.Session()
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _HTTP_SESSION = session
+
+    return _HTTP_SESSION
+
+
+def get_deployment_semaphore(deployment_id):
+    """
+    Returns the semaphore that limits concurrent requests to a deployment.
+
+    Parameters
+    ----------
+    deployment_id : str
+
+    Returns
+    -------
+    threading.BoundedSemaphore
+    """
+    with _SEMAPHORES_LOCK:
+        semaphore = _SEMAPHORES.get(deployment_id)
+        if semaphore is None:
+            semaphore = threading.BoundedSemaphore(SELDON_MAX_CONCURRENCY)
+            _SEMAPHORES[deployment_id] = semaphore
+    return semaphore
+
+
+def post_prediction(deployment_id, url, json, wait_for_slot=False):
+    """
+    Sends a prediction request to a seldon deployment.
+
+    Waits up to SELDON_QUEUE_TIMEOUT seconds while the deployment has
+    SELDON_MAX_CONCURRENCY requests in progress, then gives up so the
+    calling thread is released.
+
+    Parameters
+    ----------
+    deployment_id : str
+    url : str
+    json : dict
+    wait_for_slot : bool
+        Whether to wait with no timeout while the deployment is busy.
+        Used by background work, such as batch predictions. Default is False.
+
+    Returns
+    -------
+    requests.Response
+
+    Raises
+    ------
+    requests.RequestException
+        When the deployment is busy, could not be reached or did not respond in time.
+    """
+    semaphore = get_deployment_semaphore(deployment_id)
+    timeout = None if wait_for_slot else SELDON_QUEUE_TIMEOUT
+    if not semaphore.acquire(timeout=timeout):
+        raise requests.exceptions.Timeout(
+            f"Deployment {deployment_id} has {SELDON_MAX_CONCURRENCY} requests in progress"
+        )
+    try:
+        return get_http_session().post(
+            url=url,
+            json=json,
+            timeout=(SELDON_CONNECT_TIMEOUT, SELDON_READ_TIMEOUT),
+        )
+    finally:
+        semaphore.release()
@@ -1,10 +1,11 @@
 from .comparison import Comparison
 from .deployment import Deployment
+from .deployment_run import DeploymentRun
 from .experiment import Experiment
 from .monitoring import Monitoring
 from .operator import Operator
 from .project import Project
 from .prediction import Prediction
-from .response import Response
+from .response import Response, ResponseRetention, ResponseRollup
 from .task import Task
 from .template import Template
@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+"""Deployment Run model."""
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, String, Text
+
+from projects.database import Base
+
+
+class DeploymentRun(Base):
+    """
+    Index of the latest Kubeflow Pipelines run of each deployment.
+    Written when a deployment is deployed and kept current by the persistence agent.
+    """
+    __tablename__ = "deployment_runs"
+    deployment_id = Column(String(255), primary_key=True)
+    run_id = Column(String(255), nullable=False, index=True)
+    experiment_id = Column(String(255), nullable=True)
+    name = Column(Text, nullable=False)
+    status = Column(String(255), nullable=False, default="Running")
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
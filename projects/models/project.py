@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 """Project model."""
-from sqlalchemy import Column, String, Text
+from sqlalchemy import Column, Index, String, Text, and_, exists
 from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
 
@@ -16,6 +16,21 @@ CASCADE_BEHAVIOR = "all, delete-orphan"
 
 class Project(Base):
     __tablename__ = "projects"
+    __table_args__ = (
+        # ngram FULLTEXT indexes serve the substring search of list-projects
+        Index(
+            "ix_projects_name_fulltext",
+            "name",
+            mysql_prefix="FULLTEXT",
+            mysql_with_parser="ngram",
+        ),
+        Index(
+            "ix_projects_description_fulltext",
+            "description",
+            mysql_prefix="FULLTEXT",
+            mysql_with_parser="ngram",
+        ),
+    )
     uuid = Column(String(255), primary_key=True)
     name = Column(Text, nullable=False)
     created_at = Column(TimeStamp(), nullable=False, default=now())
@@ -39,10 +54,28 @@ class Project(Base):
     def has_experiment(self):
         return len(self.experiments) > 0
 
+    @has_experiment.expression
+    def has_experiment(cls):
+        return exists().where(Experiment.project_id == cls.uuid)
+
     @hybrid_property
     def has_pre_deployment(self):
         return len(self.deployments) > 0
 
+    @has_pre_deployment.expression
+    def has_pre_deployment(cls):
+        return exists().where(Deployment.project_id == cls.uuid)
+
     @hybrid_property
     def has_deployment(self):
         return any(d.status == "Succeeded" and d.url is not None for d in self.deployments)
+
+    @has_deployment.expression
+    def has_deployment(cls):
+        return exists().where(
+            and_(
+                Deployment.project_id == cls.uuid,
+                Deployment.status == "Succeeded",
+                Deployment.url.isnot(None),
+            )
+        )
@@ -2,7 +2,7 @@
 """Response model."""
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, JSON, String
+from sqlalchemy import Column, DateTime, Index, Integer, JSON, String
 
 from projects.database import Base
 
@@ -13,3 +13,26 @@ class Response(Base):
     deployment_id = Column(String(255), nullable=False, index=True)
     body = Column(JSON, nullable=False, default={})
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        # time range scans of a deployment (latest responses, rollups, retention)
+        Index("ix_responses_deployment_id_created_at", "deployment_id", "created_at"),
+        # time range scans of all deployments (rollups, default retention)
+        Index("ix_responses_created_at", "created_at"),
+    )
+
+
+class ResponseRollup(Base):
+    __tablename__ = "response_rollups"
+    deployment_id = Column(String(255), primary_key=True)
+    granularity = Column(String(255), primary_key=True)
+    period_start = Column(DateTime, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    summary = Column(JSON, nullable=False, default={})
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+class ResponseRetention(Base):
+    __tablename__ = "response_retentions"
+    deployment_id = Column(String(255), primary_key=True)
+    retention_days = Column(Integer, nullable=False)
@@ -3,7 +3,7 @@
 import os
 from datetime import datetime
 
-from sqlalchemy import Boolean, Column, Integer, JSON, String, Text
+from sqlalchemy import Boolean, Column, Index, Integer, JSON, String, Text
 from sqlalchemy.sql import expression
 
 from sqlalchemy.ext.hybrid import hybrid_property
@@ -29,6 +29,21 @@ TASK_DEFAULT_READINESS_INITIAL_DELAY_SECONDS = int(
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        # ngram FULLTEXT indexes serve the substring search of list-tasks
+        Index(
+            "ix_tasks_name_fulltext",
+            "name",
+            mysql_prefix="FULLTEXT",
+            mysql_with_parser="ngram",
+        ),
+        Index(
+            "ix_tasks_description_fulltext",
+            "description",
+            mysql_prefix="FULLTEXT",
+            mysql_with_parser="ngram",
+        ),
+    )
     uuid = Column(String(255), primary_key=True)
     name = Column(Text, nullable=False)
     description = Column(Text, nullable=True)
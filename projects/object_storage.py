@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 """Functions that access MinIO object storage."""
+from io import BytesIO
 from os import getenv
 
 from minio import Minio
@@ -36,7 +37,7 @@ def make_bucket(name):
             raise
 
 
-def list_objects(prefix):
+def list_objects(prefix, ensure_bucket=True, recursive=True):
     """
     Get objects from MinIO.
 
@@ -44,37 +45,45 @@ def list_objects(prefix):
     ----------
     prefix : str
         String specifying objects returned must begin with.
+    ensure_bucket : bool
+        Whether to create the bucket if it does not exist.
+    recursive : bool
+        Whether to list the objects of all levels below prefix. Otherwise,
+        the objects of the next level are listed, and the levels below it
+        are listed as directories. Default is True.
 
     Returns
     -------
     list
     """
-    # ensures MinIO bucket exists
-    make_bucket(BUCKET_NAME)
+    if ensure_bucket:
+        make_bucket(BUCKET_NAME)
 
     objects = MINIO_CLIENT.list_objects(
         bucket_name=BUCKET_NAME,
         prefix=prefix,
-        recursive=True,
+        recursive=recursive,
     )
 
     return objects
 
 
-def get_object(object_name):
+def get_object(object_name, ensure_bucket=True):
     """
     Get data from object in MinIO.
 
     Parameters
     ----------
     object_name : str
+    ensure_bucket : bool
+        Whether to create the bucket if it does not exist.
 
     Returns
     -------
     bytes
     """
-    # ensures MinIO bucket exists
-    make_bucket(BUCKET_NAME)
+    if ensure_bucket:
+        make_bucket(BUCKET_NAME)
 
     object_data = MINIO_CLIENT.get_object(
         bucket_name=BUCKET_NAME,
@@ -84,6 +93,56 @@ def get_object(object_name):
     return object_data
 
 
+def stream_object(object_name, chunk_size=64 * 1024):
+    """
+    Reads an object from MinIO in chunks, without loading it all in memory.
+
+    Parameters
+    ----------
+    object_name : str
+    chunk_size : int
+
+    Yields
+    ------
+    bytes
+    """
+    response = MINIO_CLIENT.get_object(
+        bucket_name=BUCKET_NAME,
+        object_name=object_name,
+    )
+    try:
+        for chunk in response.stream(chunk_size):
+            yield chunk
+    finally:
+        response.close()
+        response.release_conn()
+
+
+def put_object(object_name, data, content_type="application/octet-stream"):
+    """
+    Puts data in an object in MinIO.
+
+    Parameters
+    ----------
+    object_name : str
+    data : bytes or str
+    content_type : str
+    """
+    if isinstance(data, str):
+        data = data.encode()
+
+    # ensures MinIO bucket exists
+    make_bucket(BUCKET_NAME)
+
+    MINIO_CLIENT.put_object(
+        bucket_name=BUCKET_NAME,
+        object_name=object_name,
+        data=BytesIO(data),
+        length=len(data),
+        content_type=content_type,
+    )
+
+
 def remove_object(object_name):
     """
     Remove object from MinIO.
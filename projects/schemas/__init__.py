@@ -5,7 +5,13 @@ from .log import Log, LogList
 from .message import Message
 from .monitoring import Monitoring, MonitoringCreate, MonitoringList, MonitoringUpdate
 from .operator import Operator, OperatorCreate, OperatorList, OperatorUpdate, Parameter
-from .project import Project, ProjectCreate, ProjectList, ProjectUpdate
+from .project import Project, ProjectCreate, ProjectList, ProjectSummary, ProjectUpdate
+from .response import (
+    ResponseRetention,
+    ResponseRetentionUpdate,
+    ResponseRollup,
+    ResponseRollupList,
+)
 from .run import Run, RunList
 from .task import Task, TaskCreate, TaskList
 from .template import Template, TemplateCreate, TemplateList, TemplateUpdate
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""Response schema."""
+from datetime import datetime
+from typing import Dict, List
+
+from pydantic import BaseModel, conint
+
+from projects.utils import to_camel_case
+
+
+class ResponseBase(BaseModel):
+
+    class Config:
+        alias_generator = to_camel_case
+        allow_population_by_field_name = True
+        orm_mode = True
+
+
+class ResponseRollup(ResponseBase):
+    deployment_id: str
+    granularity: str
+    period_start: datetime
+    count: int
+    summary: Dict[str, Dict[str, float]]
+
+
+class ResponseRollupList(BaseModel):
+    rollups: List[ResponseRollup]
+    total: int
+
+    @classmethod
+    def from_orm(cls, models, total):
+        return ResponseRollupList(
+            rollups=[ResponseRollup.from_orm(model) for model in models],
+            total=total,
+        )
+
+
+class ResponseRetentionUpdate(ResponseBase):
+    retention_days: conint(ge=0)
+
+
+class ResponseRetention(ResponseBase):
+    deployment_id: str
+    retention_days: int
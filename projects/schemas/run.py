@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 """Run schema."""
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel
 
@@ -30,13 +30,15 @@ class Run(RunBase):
         )
 
 
-class RunList(BaseModel):
+class RunList(RunBase):
     runs: List[Run]
     total: int
+    next_page_token: Optional[str]
 
     @classmethod
-    def from_orm(cls, models, total):
+    def from_orm(cls, models, total, next_page_token=None):
         return RunList(
             runs=[Run.from_orm(model) for model in models],
             total=total,
+            next_page_token=next_page_token,
         )
@@ -138,19 +138,26 @@ class Task(TaskBase):
 
 class TaskList(BaseModel):
     tasks: List[Task]
-    total: int
+    total: Optional[int]
+    next_cursor: Optional[str]
+
+    class Config:
+        alias_generator = to_camel_case
+        allow_population_by_field_name = True
 
     @classmethod
-    def from_orm(cls, models, total):
+    def from_orm(cls, models, total, next_cursor=None):
         return TaskList(
             tasks=[Task.from_orm(model) for model in models],
             total=total,
+            next_cursor=next_cursor,
         )
 
 
 class TaskListRequest(BaseModel):
     filters: Optional[dict] = {}
     page: Optional[int] = 1
+    cursor: Optional[str]
     page_size: Optional[int]
     order: Optional[str]
 
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from projects.dag import OperatorGraph
+
+
+class TestOperatorGraph(unittest.TestCase):
+    def test_topological_sort(self):
+        """
+        Should order operators after their dependencies.
+        """
+        graph = OperatorGraph({"c": ["b"], "a": [], "b": ["a"], "d": []})
+        self.assertEqual(graph.topological_sort(), ["a", "d", "b", "c"])
+
+    def test_topological_sort_ignores_unknown_dependencies(self):
+        """
+        Should ignore dependencies that are not in the graph.
+        """
+        graph = OperatorGraph({"a": ["unk"], "b": ["a"]})
+        self.assertEqual(graph.topological_sort(), ["a", "b"])
+
+    def test_remap(self):
+        """
+        Should replace operator_ids in nodes and dependencies.
+        """
+        graph = OperatorGraph({"a": [], "b": ["a", "unk"]})
+        remapped = graph.remap({"a": "x", "b": "y"})
+        self.assertEqual(remapped.dependencies, {"x": [], "y": ["x"]})
+
+    def test_descendants(self):
+        """
+        Should list the operators that depend, directly or not, on an operator.
+        """
+        graph = OperatorGraph({"a": [], "b": ["a"], "c": ["b"], "d": []})
+        self.assertEqual(graph.descendants("a"), {"b", "c"})
+        self.assertEqual(graph.descendants("d"), set())
@@ -1,4 +1,6 @@
 # -*- coding: utf-8 -*-
+import os
+import tempfile
 import unittest
 import unittest.mock as mock
 
@@ -384,3 +386,155 @@ class TestDatasets(unittest.TestCase):
         mock_load_dataset.assert_any_call(
             name=name, run_id="4546465", operator_id=operator_id, page=2, page_size=3
         )
+
+    @mock.patch(
+        "kfp.Client",
+        return_value=util.MOCK_KFP_CLIENT,
+    )
+    @mock.patch(
+        "projects.controllers.experiments.runs.datasets.stat_dataset",
+        return_value={
+            "columns": util.IRIS_COLUMNS,
+            "featuretypes": util.IRIS_FEATURETYPES,
+            "original-filename": util.IRIS_DATASET_NAME,
+            "total": len(util.IRIS_DATA_ARRAY),
+        },
+    )
+    @mock.patch(
+        "projects.controllers.experiments.runs.datasets.load_dataset",
+        return_value=util.IRIS_DATAFRAME,
+    )
+    @mock.patch(
+        "projects.controllers.experiments.runs.datasets.DATASETS_CACHE_ROW_GROUP_SIZE",
+        2,
+    )
+    def test_list_datasets_cache(
+        self, mock_load_dataset, mock_stat_dataset, mock_kfp_client
+    ):
+        """
+        Should load the dataset once and read the pages from the cache.
+        """
+        name = util.IRIS_DATASET_NAME
+        project_id = util.MOCK_UUID_1
+        experiment_id = util.MOCK_UUID_1
+        run_id = "latest"
+        operator_id = util.MOCK_UUID_2
+
+        with tempfile.TemporaryDirectory() as cache_dir, mock.patch(
+            "projects.controllers.experiments.runs.datasets.DATASETS_CACHE_DIR",
+            cache_dir,
+        ):
+            rv = TEST_CLIENT.get(
+                f"/projects/{project_id}/experiments/{experiment_id}/runs/{run_id}/operators/{operator_id}/datasets?page=2&page_size=1"
+            )
+            result = rv.json()
+            expected = {
+                "columns": util.IRIS_COLUMNS,
+                "data": [[4.9, 3.0, 1.4, 0.2, "Iris-setosa"]],
+                "total": 4,
+            }
+            self.assertDictEqual(expected, result)
+
+            rv = TEST_CLIENT.get(
+                f"/projects/{project_id}/experiments/{experiment_id}/runs/{run_id}/operators/{operator_id}/datasets?page=2&page_size=3"
+            )
+            result = rv.json()
+            expected = {
+                "columns": util.IRIS_COLUMNS,
+                "data": [[4.6, 3.1, 1.5, 0.2, "Iris-setosa"]],
+                "total": 4,
+            }
+            self.assertDictEqual(expected, result)
+
+        mock_load_dataset.assert_called_once_with(
+            name=name, run_id="4546465", operator_id=operator_id
+        )
+        mock_stat_dataset.assert_called_once_with(
+            name=name, operator_id=operator_id, run_id="4546465"
+        )
+
+    @mock.patch(
+        "kfp.Client",
+        return_value=util.MOCK_KFP_CLIENT,
+    )
+    @mock.patch(
+        "projects.controllers.experiments.runs.datasets.stat_dataset",
+        return_value={
+            "columns": util.IRIS_COLUMNS,
+            "featuretypes": util.IRIS_FEATURETYPES,
+            "original-filename": util.IRIS_DATASET_NAME,
+            "total": len(util.IRIS_DATA_ARRAY),
+        },
+    )
+    @mock.patch(
+        "projects.controllers.experiments.runs.datasets.load_dataset",
+        return_value=util.IRIS_DATAFRAME,
+    )
+    @mock.patch(
+        "projects.controllers.experiments.runs.datasets.DatasetController.write_cache",
+        return_value=False,
+    )
+    def test_list_datasets_cache_not_written(
+        self, mock_write_cache, mock_load_dataset, mock_stat_dataset, mock_kfp_client
+    ):
+        """
+        Should return a page of the dataset when it could not be cached.
+        """
+        project_id = util.MOCK_UUID_1
+        experiment_id = util.MOCK_UUID_1
+        run_id = "latest"
+        operator_id = util.MOCK_UUID_2
+
+        with tempfile.TemporaryDirectory() as cache_dir, mock.patch(
+            "projects.controllers.experiments.runs.datasets.DATASETS_CACHE_DIR",
+            cache_dir,
+        ):
+            rv = TEST_CLIENT.get(
+                f"/projects/{project_id}/experiments/{experiment_id}/runs/{run_id}/operators/{operator_id}/datasets?page=2&page_size=1"
+            )
+            result = rv.json()
+            expected = {
+                "columns": util.IRIS_COLUMNS,
+                "data": [[4.9, 3.0, 1.4, 0.2, "Iris-setosa"]],
+                "total": 4,
+            }
+            self.assertDictEqual(expected, result)
+
+            rv = TEST_CLIENT.get(
+                f"/projects/{project_id}/experiments/{experiment_id}/runs/{run_id}/operators/{operator_id}/datasets?page=1&page_size=-1"
+            )
+            result = rv.json()
+            self.assertEqual(len(result["data"]), 4)
+            self.assertEqual(result["total"], 4)
+
+    def test_retry_run_removes_cache(self):
+        """
+        Should remove the cached datasets of a run when it is retried.
+        """
+        project_id = util.MOCK_UUID_1
+        experiment_id = util.MOCK_UUID_1
+        run_id = "run-1"
+
+        mock_client = mock.MagicMock(
+            get_run=mock.MagicMock(
+                return_value=mock.MagicMock(
+                    run=mock.MagicMock(id=run_id, status="Failed")
+                )
+            ),
+        )
+
+        with tempfile.TemporaryDirectory() as cache_dir, mock.patch(
+            "projects.controllers.experiments.runs.datasets.DATASETS_CACHE_DIR",
+            cache_dir,
+        ), mock.patch("kfp.Client", return_value=mock_client):
+            cache_path = os.path.join(cache_dir, run_id, util.MOCK_UUID_2)
+            os.makedirs(cache_path)
+            open(os.path.join(cache_path, "iris.parquet"), "wb").close()
+
+            rv = TEST_CLIENT.post(
+                f"/projects/{project_id}/experiments/{experiment_id}/runs/{run_id}/retry"
+            )
+            self.assertEqual(rv.status_code, 200)
+            self.assertFalse(os.path.exists(os.path.join(cache_dir, run_id)))
+
+        mock_client.runs.retry_run.assert_called_once_with(run_id=run_id)
@@ -2,8 +2,11 @@
 import unittest
 import unittest.mock as mock
 
+from datetime import datetime
+
 from fastapi.testclient import TestClient
 
+from projects import models
 from projects.api.main import app
 from projects.database import session_scope
 from projects.controllers import TaskController
@@ -284,6 +287,14 @@ class TestDeployments(unittest.TestCase):
         self.assertEqual(result, expected)
         self.assertEqual(rv.status_code, 200)
 
+        # deploy_run adds the run to the index, which the caller commits
+        session = util.TestingSessionLocal()
+        deployment_run = session.query(models.DeploymentRun).get(
+            result["deployments"][0]["uuid"]
+        )
+        session.close()
+        self.assertIsNotNone(deployment_run)
+
         mock_core_v1_api.assert_any_call()
         # mock_kfp_client.assert_any_call(host="http://ml-pipeline.kubeflow:8888")
         # mock_load_config.assert_any_call()
@@ -683,3 +694,142 @@ class TestDeployments(unittest.TestCase):
         mock_custom_objects_api.assert_any_call()
         # mock_kfp_client.assert_any_call(host="http://ml-pipeline.kubeflow:8888")
         mock_load_config.assert_any_call()
+
+    @mock.patch(
+        "kubernetes.client.CustomObjectsApi",
+        return_value=util.MOCK_CUSTOM_OBJECTS_API,
+    )
+    @mock.patch(
+        "kfp.Client",
+        return_value=util.MOCK_KFP_CLIENT,
+    )
+    @mock.patch(
+        "kubernetes.config.load_kube_config",
+    )
+    def test_delete_deployment_response_rollups(
+        self,
+        mock_load_config,
+        mock_kfp_client,
+        mock_custom_objects_api,
+    ):
+        """
+        Should delete the response rollups and retention of the deployment.
+        """
+        project_id = util.MOCK_UUID_1
+        deployment_id = util.MOCK_UUID_1
+
+        session = util.TestingSessionLocal()
+        session.add(
+            models.ResponseRollup(
+                deployment_id=deployment_id,
+                granularity="hour",
+                period_start=datetime(2021, 6, 24, 14),
+                count=1,
+                summary={},
+            )
+        )
+        session.add(
+            models.ResponseRetention(deployment_id=deployment_id, retention_days=7)
+        )
+        session.commit()
+        session.close()
+
+        rv = TEST_CLIENT.delete(f"/projects/{project_id}/deployments/{deployment_id}")
+        self.assertEqual(rv.status_code, 200)
+
+        session = util.TestingSessionLocal()
+        rollups = (
+            session.query(models.ResponseRollup)
+            .filter_by(deployment_id=deployment_id)
+            .count()
+        )
+        retentions = (
+            session.query(models.ResponseRetention)
+            .filter_by(deployment_id=deployment_id)
+            .count()
+        )
+        session.close()
+        self.assertEqual(rollups, 0)
+        self.assertEqual(retentions, 0)
+
+    @mock.patch(
+        "projects.controllers.deployments.runs.runs.get_deployment_runs",
+        return_value={"runId": "run-1"},
+    )
+    @mock.patch(
+        "kubernetes.client.CustomObjectsApi",
+        return_value=util.MOCK_CUSTOM_OBJECTS_API,
+    )
+    @mock.patch("kfp.Client")
+    @mock.patch(
+        "kubernetes.config.load_kube_config",
+    )
+    def test_delete_deployment_terminates_run(
+        self,
+        mock_load_config,
+        mock_kfp_client,
+        mock_custom_objects_api,
+        mock_get_deployment_runs,
+    ):
+        """
+        Should delete the KFP run of a deployment that is not in the deployment run index.
+        """
+        project_id = util.MOCK_UUID_1
+        deployment_id = util.MOCK_UUID_1
+
+        rv = TEST_CLIENT.delete(f"/projects/{project_id}/deployments/{deployment_id}")
+        result = rv.json()
+
+        expected = {"message": "Deployment deleted"}
+        self.assertDictEqual(expected, result)
+        self.assertEqual(rv.status_code, 200)
+
+        mock_get_deployment_runs.assert_called_once_with(deployment_id)
+        mock_kfp_client.return_value.runs.delete_run.assert_called_once_with("run-1")
+
+    @mock.patch("projects.controllers.deployments.runs.runs.get_deployment_runs")
+    @mock.patch(
+        "kubernetes.client.CustomObjectsApi",
+        return_value=util.MOCK_CUSTOM_OBJECTS_API,
+    )
+    @mock.patch("kfp.Client")
+    @mock.patch(
+        "kubernetes.config.load_kube_config",
+    )
+    def test_delete_deployment_terminates_indexed_run(
+        self,
+        mock_load_config,
+        mock_kfp_client,
+        mock_custom_objects_api,
+        mock_get_deployment_runs,
+    ):
+        """
+        Should delete the KFP run found in the deployment run index, then the index row.
+        """
+        project_id = util.MOCK_UUID_1
+        deployment_id = util.MOCK_UUID_1
+
+        session = util.TestingSessionLocal()
+        session.add(
+            models.DeploymentRun(
+                deployment_id=deployment_id,
+                run_id="run-1",
+                experiment_id=deployment_id,
+                name="deployment-1",
+                status="Succeeded",
+                created_at=datetime(2021, 6, 24, 14, 42, 9),
+            )
+        )
+        session.commit()
+        session.close()
+
+        rv = TEST_CLIENT.delete(f"/projects/{project_id}/deployments/{deployment_id}")
+        self.assertEqual(rv.status_code, 200)
+
+        mock_get_deployment_runs.assert_not_called()
+        mock_kfp_client.return_value.runs.delete_run.assert_called_once_with("run-1")
+
+        session = util.TestingSessionLocal()
+        deployment_run = session.query(models.DeploymentRun).get(deployment_id)
+        session.close()
+        self.assertIsNone(deployment_run)
@@ -1,9 +1,11 @@
 # -*- coding: utf-8 -*-
 import unittest
 import unittest.mock as mock
+from datetime import datetime
 
 from fastapi.testclient import TestClient
 
+from projects import models
 from projects.api.main import app
 from projects.database import session_scope
 
@@ -143,6 +145,53 @@ class TestDeploymentsRuns(unittest.TestCase):
 
         mock_kfp_client.assert_any_call(host="http://ml-pipeline.kubeflow:8888")
 
+    @mock.patch(
+        "projects.controllers.deployments.runs.runs.get_seldon_deployment_url",
+        return_value="http://localhost/seldon/anonymous/uuid-1/api/v1.0/predictions",
+    )
+    @mock.patch(
+        "kfp.Client",
+        return_value=util.MOCK_KFP_CLIENT,
+    )
+    def test_get_run_deployment_run_index(self, mock_kfp_client, mock_url):
+        """
+        Should return the deployment run from the index without listing KFP runs.
+        """
+        project_id = util.MOCK_UUID_1
+        deployment_id = util.MOCK_UUID_1
+
+        session = util.TestingSessionLocal()
+        session.add(
+            models.DeploymentRun(
+                deployment_id=deployment_id,
+                run_id="run-1",
+                experiment_id=deployment_id,
+                name="deployment-1",
+                status="Succeeded",
+                created_at=datetime(2021, 6, 24, 14, 42, 9),
+            )
+        )
+        session.commit()
+        session.close()
+
+        util.MOCK_LIST_RUNS.reset_mock()
+        rv = TEST_CLIENT.get(
+            f"/projects/{project_id}/deployments/{deployment_id}/runs/latest"
+        )
+        result = rv.json()
+        expected = {
+            "experimentId": deployment_id,
+            "name": "deployment-1",
+            "deploymentId": deployment_id,
+            "status": "Succeeded",
+            "createdAt": "2021-06-24T14:42:09.000Z",
+            "runId": "run-1",
+            "url": "http://localhost/seldon/anonymous/uuid-1/api/v1.0/predictions",
+        }
+        self.assertDictEqual(expected, result)
+        self.assertEqual(rv.status_code, 200)
+        util.MOCK_LIST_RUNS.assert_not_called()
+
     # @mock.patch("projects.kubernetes.kube_config.config.load_incluster_config")
     # # @mock.patch(
     # #     "kubernetes.client.CustomObjectsApi.list_namespaced_custom_object",
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import unittest
+
+from projects import executor
+
+
+class TestExecutor(unittest.TestCase):
+    def test_get_executor_returns_same_pool(self):
+        """
+        Should return the same pool when the same name is requested twice.
+        """
+        pool = executor.get_executor("test-same")
+        self.assertIs(pool, executor.get_executor("test-same"))
+
+    def test_run_in_executor_success(self):
+        """
+        Should run the callable in the named pool and return its result.
+        """
+        result = asyncio.run(
+            executor.run_in_executor(sum, [1, 2, 3], start=1, pool="test-run")
+        )
+        self.assertEqual(result, 7)
+
+        stats = executor.get_executor("test-run").stats()
+        self.assertEqual(stats["completed"], 1)
+        self.assertEqual(stats["running"], 0)
+        self.assertEqual(stats["queued"], 0)
+
+    def test_list_executors_stats(self):
+        """
+        Should list the metrics of every pool that was created.
+        """
+        executor.get_executor("test-list")
+        names = [stats["name"] for stats in executor.list_executors_stats()]
+        self.assertIn("test-list", names)
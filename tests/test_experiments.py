@@ -5,11 +5,12 @@ import unittest.mock as mock
 from fastapi.testclient import TestClient
 
 from projects.api.main import app
-from projects.database import session_scope
+from projects.database import read_session_scope, session_scope
 
 import tests.util as util
 
 app.dependency_overrides[session_scope] = util.override_session_scope
+app.dependency_overrides[read_session_scope] = util.override_session_scope
 TEST_CLIENT = TestClient(app)
 
 
@@ -445,12 +446,14 @@ class TestExperiments(unittest.TestCase):
         self.assertDictEqual(expected, result)
         self.assertEqual(rv.status_code, 404)
 
-    def test_delete_experiment_success(self):
+    @mock.patch("kfp.Client")
+    def test_delete_experiment_success(self, mock_kfp_client):
         """
         Should delete experiment successfully.
         """
         project_id = util.MOCK_UUID_1
         experiment_id = util.MOCK_UUID_1
+        mock_kfp_client.return_value.get_pipeline_id.return_value = "pipeline-1"
 
         rv = TEST_CLIENT.delete(f"/projects/{project_id}/experiments/{experiment_id}")
         result = rv.json()
@@ -459,6 +462,14 @@ class TestExperiments(unittest.TestCase):
         self.assertDictEqual(expected, result)
         self.assertEqual(rv.status_code, 200)
 
+        # the experiment pipeline and its versions are deleted in KFP
+        mock_kfp_client.return_value.get_pipeline_id.assert_called_once_with(
+            f"experiment-{experiment_id}"
+        )
+        mock_kfp_client.return_value.delete_pipeline.assert_called_once_with(
+            "pipeline-1"
+        )
+
     def test_create_experiment_forbidden_character(self):
         """
         Should create and return an experiment successfully.
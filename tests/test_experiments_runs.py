@@ -6,6 +6,7 @@ from fastapi.testclient import TestClient
 
 from projects.api.main import app
 from projects.database import session_scope
+from projects.kfp import runs as kfp_runs
 
 import tests.util as util
 
@@ -47,6 +48,50 @@ class TestExperimentsRuns(unittest.TestCase):
 
         mock_kfp_client.assert_any_call(host="http://ml-pipeline.kubeflow:8888")
 
+    def test_list_runs_page(self):
+        """
+        Should return a page of runs, skipping runs deleted after being listed.
+        """
+        project_id = util.MOCK_UUID_1
+        experiment_id = util.MOCK_UUID_1
+
+        mock_list_runs = mock.MagicMock(
+            return_value=mock.MagicMock(
+                runs=[mock.MagicMock(id="uuid-1"), mock.MagicMock(id="deleted")],
+                total_size=5,
+                next_page_token="token-2",
+            )
+        )
+
+        def get_run(run_id):
+            if run_id == "deleted":
+                raise util.ApiException(status=404)
+            return util.MOCK_GET_RUN.return_value
+
+        mock_client = mock.MagicMock(
+            list_runs=mock_list_runs,
+            get_run=mock.MagicMock(side_effect=get_run),
+            get_experiment=util.MOCK_GET_EXPERIMENT,
+        )
+
+        with mock.patch("kfp.Client", return_value=mock_client):
+            rv = TEST_CLIENT.get(
+                f"/projects/{project_id}/experiments/{experiment_id}/runs",
+                params={"page_size": 2, "page_token": "token-1"},
+            )
+        result = rv.json()
+        self.assertEqual(rv.status_code, 200)
+        self.assertEqual(len(result["runs"]), 1)
+        self.assertEqual(result["total"], 5)
+        self.assertEqual(result["nextPageToken"], "token-2")
+
+        mock_list_runs.assert_called_once_with(
+            page_token="token-1",
+            page_size=2,
+            sort_by="created_at desc",
+            experiment_id="uuid-1",
+        )
+
     @mock.patch(
         "kfp.Client",
         return_value=util.MOCK_KFP_CLIENT,
@@ -69,6 +114,82 @@ class TestExperimentsRuns(unittest.TestCase):
 
         mock_kfp_client.assert_any_call(host="http://ml-pipeline.kubeflow:8888")
 
+    def test_create_run_reuses_pipeline_version(self):
+        """
+        Should compile and upload an experiment pipeline once and reuse its version.
+        """
+        project_id = util.MOCK_UUID_1
+        experiment_id = util.MOCK_UUID_1
+
+        mock_client = mock.MagicMock(
+            get_run=util.MOCK_GET_RUN,
+            create_experiment=util.MOCK_CREATE_EXPERIMENT,
+            get_pipeline_id=mock.MagicMock(return_value=None),
+            upload_pipeline=mock.MagicMock(
+                return_value=mock.MagicMock(
+                    id="pipeline-1", default_version=mock.MagicMock(id="default")
+                )
+            ),
+            upload_pipeline_version=mock.MagicMock(
+                return_value=mock.MagicMock(id="version-1")
+            ),
+            run_pipeline=mock.MagicMock(return_value=mock.MagicMock(id="uuid-1")),
+        )
+
+        with mock.patch("kfp.Client", return_value=mock_client), mock.patch(
+            "projects.kfp.runs.compile_pipeline",
+            wraps=kfp_runs.compile_pipeline,
+        ) as mock_compile_pipeline:
+            for _ in range(2):
+                rv = TEST_CLIENT.post(
+                    f"/projects/{project_id}/experiments/{experiment_id}/runs", json={}
+                )
+                self.assertEqual(rv.status_code, 200)
+
+        mock_compile_pipeline.assert_called_once()
+        mock_client.upload_pipeline.assert_called_once()
+        # the first version is uploaded with the digest name, not as the default version
+        mock_client.upload_pipeline_version.assert_called_once()
+        upload_version_kwargs = mock_client.upload_pipeline_version.call_args[1]
+        self.assertEqual(upload_version_kwargs["pipeline_id"], "pipeline-1")
+        self.assertEqual(len(upload_version_kwargs["pipeline_version_name"]), 64)
+        self.assertEqual(mock_client.run_pipeline.call_count, 2)
+        for call in mock_client.run_pipeline.call_args_list:
+            self.assertEqual(call[1]["version_id"], "version-1")
+
+    def test_create_run_concurrent_pipeline_version(self):
+        """
+        Should reuse the pipeline version uploaded by a concurrent request.
+        """
+        project_id = util.MOCK_UUID_1
+        experiment_id = util.MOCK_UUID_1
+
+        mock_client = mock.MagicMock(
+            get_run=util.MOCK_GET_RUN,
+            create_experiment=util.MOCK_CREATE_EXPERIMENT,
+            get_pipeline_id=mock.MagicMock(return_value="pipeline-1"),
+            upload_pipeline_version=mock.MagicMock(
+                side_effect=util.ApiException(status=409)
+            ),
+            run_pipeline=mock.MagicMock(return_value=mock.MagicMock(id="uuid-1")),
+        )
+        mock_client.pipelines.list_pipeline_versions.side_effect = [
+            mock.MagicMock(versions=[]),
+            mock.MagicMock(versions=[mock.MagicMock(id="version-2")]),
+        ]
+
+        with mock.patch("kfp.Client", return_value=mock_client):
+            rv = TEST_CLIENT.post(
+                f"/projects/{project_id}/experiments/{experiment_id}/runs", json={}
+            )
+        self.assertEqual(rv.status_code, 200)
+
+        mock_client.upload_pipeline.assert_not_called()
+        mock_client.upload_pipeline_version.assert_called_once()
+        self.assertEqual(
+            mock_client.run_pipeline.call_args[1]["version_id"], "version-2"
+        )
+
     def test_list_run_status_operator(self):
         """
         Should return an runs successfully.
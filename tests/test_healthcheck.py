@@ -32,3 +32,14 @@ class TestHealthCheck(unittest.TestCase):
             "/healthcheck"
         )
         self.assertEqual(rv.status_code, 200)
+
+    def test_list_executors_success(self):
+        """
+        Should return usage metrics of the thread pools.
+        """
+        rv = TEST_CLIENT.get("/healthcheck/executors")
+        result = rv.json()
+
+        self.assertIn("executors", result)
+        self.assertEqual(result["total"], len(result["executors"]))
+        self.assertEqual(rv.status_code, 200)
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+import unittest
+import unittest.mock as mock
+
+from projects.kubernetes import istio
+
+
+class TestIstio(unittest.TestCase):
+    def setUp(self):
+        """
+        Sets up the test before running it.
+        """
+        istio.clear_istio_cache()
+
+    def tearDown(self):
+        """
+        Deconstructs the test after running it.
+        """
+        istio.clear_istio_cache()
+
+    @mock.patch("projects.kubernetes.istio.read_protocol", return_value="https")
+    def test_get_protocol_is_cached(self, mock_read_protocol):
+        """
+        Should read the protocol from Kubernetes once within the TTL.
+        """
+        self.assertEqual(istio.get_protocol(), "https")
+        self.assertEqual(istio.get_protocol(), "https")
+        mock_read_protocol.assert_called_once_with()
+
+    @mock.patch("projects.kubernetes.istio.ISTIO_CACHE_TTL", 0)
+    @mock.patch(
+        "projects.kubernetes.istio.read_cluster_ip", side_effect=["1.1.1.1", "2.2.2.2"]
+    )
+    @mock.patch("projects.kubernetes.istio.threading.Thread")
+    def test_get_cluster_ip_refreshes_in_background(
+        self, mock_thread, mock_read_cluster_ip
+    ):
+        """
+        Should return the cached cluster ip and refresh it in background when it expires.
+        """
+        self.assertEqual(istio.get_cluster_ip(), "1.1.1.1")
+        self.assertEqual(istio.get_cluster_ip(), "1.1.1.1")
+
+        # runs the background refresh
+        mock_thread.assert_called_once()
+        istio.refresh_cached(*mock_thread.call_args[1]["args"])
+
+        self.assertEqual(istio.get_cluster_ip(), "2.2.2.2")
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+import unittest
+import unittest.mock as mock
+
+from projects.kfp import get_kfp_experiment_id, kfp_client, reset_kfp_client
+
+
+class TestKfp(unittest.TestCase):
+    def setUp(self):
+        """
+        Sets up the test before running it.
+        """
+        reset_kfp_client()
+
+    def tearDown(self):
+        """
+        Deconstructs the test after running it.
+        """
+        reset_kfp_client()
+
+    @mock.patch("kfp.Client")
+    def test_kfp_client_is_reused(self, mock_kfp_client):
+        """
+        Should create the kfp.Client once.
+        """
+        self.assertIs(kfp_client(), kfp_client())
+        mock_kfp_client.assert_called_once_with(host="http://ml-pipeline.kubeflow:8888")
+
+    @mock.patch("kfp.Client")
+    def test_get_kfp_experiment_id_is_cached(self, mock_kfp_client):
+        """
+        Should look up the KFP experiment id once within the TTL.
+        """
+        get_experiment = mock_kfp_client.return_value.get_experiment
+        get_experiment.return_value = mock.MagicMock(id="kfp-id")
+
+        self.assertEqual(get_kfp_experiment_id("uuid-1"), "kfp-id")
+        self.assertEqual(get_kfp_experiment_id("uuid-1"), "kfp-id")
+        get_experiment.assert_called_once_with(experiment_name="uuid-1")
+
+        with mock.patch("projects.kfp.kfp.KFP_EXPERIMENT_CACHE_TTL", 0):
+            reset_kfp_client()
+            get_kfp_experiment_id("uuid-1")
+            get_kfp_experiment_id("uuid-1")
+        self.assertEqual(get_experiment.call_count, 3)
+
+    @mock.patch("kfp.Client")
+    def test_get_kfp_experiment_id_not_found(self, mock_kfp_client):
+        """
+        Should not cache experiments that do not exist.
+        """
+        get_experiment = mock_kfp_client.return_value.get_experiment
+        get_experiment.side_effect = ValueError("No experiment is found")
+
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                get_kfp_experiment_id("unk")
+        self.assertEqual(get_experiment.call_count, 2)
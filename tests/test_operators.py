@@ -4,6 +4,7 @@ import unittest.mock as mock
 
 from fastapi.testclient import TestClient
 
+from projects import models
 from projects.api.main import app
 from projects.database import session_scope
 
@@ -695,3 +696,7 @@ class TestOperators(unittest.TestCase):
         expected = {"message": "Operator deleted"}
         self.assertDictEqual(expected, result)
         self.assertEqual(rv.status_code, 200)
+
+        # the deleted operator is removed from the dependencies of others
+        operator = util.TestingSessionLocal().query(models.Operator).get(util.MOCK_UUID_4)
+        self.assertEqual(operator.dependencies, [])
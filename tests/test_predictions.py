@@ -1,12 +1,17 @@
 # -*- coding: utf-8 -*-
+import io
+import json
+import threading
 import unittest
 import unittest.mock as mock
 
+import requests
 from fastapi.testclient import TestClient
 from sqlalchemy.exc import DataError
 
 from projects.api.main import app
 from projects.database import session_scope
+from projects.object_storage import BUCKET_NAME, MINIO_CLIENT
 
 import tests.util as util
 
@@ -133,12 +138,14 @@ class TestPredictions(unittest.TestCase):
         return_value=util.IRIS_DATAFRAME,
     )
     @mock.patch(
-        "requests.post",
-        return_value=util.MOCK_POST_PREDICTION,
+        "projects.kubernetes.seldon.get_http_session",
+        return_value=mock.MagicMock(
+            **{"post.return_value": util.MOCK_POST_PREDICTION}
+        ),
     )
     def test_create_prediction_dataset(
         self,
-        mock_requests_post,
+        mock_get_http_session,
         mock_load_dataset,
     ):
         """
@@ -158,7 +165,7 @@ class TestPredictions(unittest.TestCase):
         self.assertEqual(rv.status_code, 200)
 
         mock_load_dataset.assert_any_call(name)
-        mock_requests_post.assert_any_call(
+        mock_get_http_session.return_value.post.assert_any_call(
             url=url,
             json={
                 "data": {
@@ -177,6 +184,7 @@ class TestPredictions(unittest.TestCase):
                     ],
                 }
             },
+            timeout=(5.0, 60.0),
         )
 
     @mock.patch(
@@ -184,12 +192,14 @@ class TestPredictions(unittest.TestCase):
         return_value=util.IRIS_DATAFRAME,
     )
     @mock.patch(
-        "requests.post",
-        return_value=util.MOCK_POST_PREDICTION,
+        "projects.kubernetes.seldon.get_http_session",
+        return_value=mock.MagicMock(
+            **{"post.return_value": util.MOCK_POST_PREDICTION}
+        ),
     )
     def test_create_prediction_dataset_image(
         self,
-        mock_requests_post,
+        mock_get_http_session,
         mock_load_dataset,
     ):
         """
@@ -209,7 +219,7 @@ class TestPredictions(unittest.TestCase):
         self.assertEqual(rv.status_code, 200)
 
         mock_load_dataset.assert_any_call(dataset_name)
-        mock_requests_post.assert_any_call(
+        mock_get_http_session.return_value.post.assert_any_call(
             url=url,
             json={
                 "data": {
@@ -228,6 +238,7 @@ class TestPredictions(unittest.TestCase):
                     ],
                 }
             },
+            timeout=(5.0, 60.0),
         )
 
     @mock.patch(
@@ -235,13 +246,15 @@ class TestPredictions(unittest.TestCase):
         return_value=util.IRIS_DATAFRAME,
     )
     @mock.patch(
-        "requests.post",
-        return_value=util.MOCK_POST_PREDICTION,
+        "projects.kubernetes.seldon.get_http_session",
+        return_value=mock.MagicMock(
+            **{"post.return_value": util.MOCK_POST_PREDICTION}
+        ),
     )
     @mock.patch("projects.api.predictions.Session.commit", side_effect=DataError("statement", "params", "orig"))
     def test_create_prediction_fail(
         self,
-        mock_requests_post,
+        mock_get_http_session,
         mock_load_dataset,
         mock_data_error
     ):
@@ -259,3 +272,317 @@ class TestPredictions(unittest.TestCase):
         result = rv.json()
         self.assertEqual(rv.status_code, 400)
         self.assertEqual(result["message"], "File too large")
+
+    @mock.patch("projects.controllers.predictions.PREDICTION_PAYLOAD_THRESHOLD", 10)
+    @mock.patch(
+        "projects.controllers.predictions.load_dataset",
+        return_value=util.IRIS_DATAFRAME,
+    )
+    @mock.patch(
+        "projects.api.predictions.Session.commit",
+        side_effect=DataError("statement", "params", "orig"),
+    )
+    @mock.patch.object(MINIO_CLIENT, "make_bucket")
+    @mock.patch.object(MINIO_CLIENT, "put_object")
+    @mock.patch.object(MINIO_CLIENT, "remove_object")
+    def test_create_prediction_fail_removes_payload(
+        self,
+        mock_remove_object,
+        mock_put_object,
+        mock_make_bucket,
+        mock_commit,
+        mock_load_dataset,
+    ):
+        """
+        Should remove the payload saved in object storage when the prediction is not saved.
+        """
+        project_id = util.MOCK_UUID_1
+        deployment_id = util.MOCK_UUID_1
+
+        rv = TEST_CLIENT.post(
+            f"/projects/{project_id}/deployments/{deployment_id}/predictions",
+            json={"dataset": util.IRIS_DATASET_NAME},
+        )
+        self.assertEqual(rv.status_code, 400)
+
+        mock_put_object.assert_called_once()
+        object_name = mock_put_object.call_args[1]["object_name"]
+        self.assertTrue(object_name.endswith("/request_body.json.gz"))
+        mock_remove_object.assert_called_once_with(
+            bucket_name=BUCKET_NAME, object_name=object_name
+        )
+
+    @mock.patch(
+        "projects.controllers.predictions.load_dataset",
+        return_value=util.IRIS_DATAFRAME,
+    )
+    @mock.patch(
+        "projects.kubernetes.seldon.get_http_session",
+        return_value=mock.MagicMock(
+            **{"post.side_effect": requests.ConnectionError("Connection refused")}
+        ),
+    )
+    def test_create_prediction_connection_error(
+        self,
+        mock_get_http_session,
+        mock_load_dataset,
+    ):
+        """
+        Should save the prediction as failed when the deployment is unreachable.
+        """
+        project_id = util.MOCK_UUID_1
+        deployment_id = util.MOCK_UUID_1
+
+        rv = TEST_CLIENT.post(
+            f"/projects/{project_id}/deployments/{deployment_id}/predictions",
+            json={"dataset": util.IRIS_DATASET_NAME},
+        )
+        result = rv.json()
+        self.assertEqual(rv.status_code, 200)
+
+        rv = TEST_CLIENT.get(
+            f"/projects/{project_id}/deployments/{deployment_id}/predictions/{result['uuid']}",
+        )
+        result = rv.json()
+        self.assertEqual(result["status"], "failed")
+
+    @mock.patch("projects.kubernetes.seldon.SELDON_QUEUE_TIMEOUT", 0)
+    @mock.patch(
+        "projects.kubernetes.seldon.get_deployment_semaphore",
+        return_value=mock.MagicMock(**{"acquire.return_value": False}),
+    )
+    @mock.patch(
+        "projects.controllers.predictions.load_dataset",
+        return_value=util.IRIS_DATAFRAME,
+    )
+    @mock.patch("projects.kubernetes.seldon.get_http_session")
+    def test_create_prediction_deployment_busy(
+        self,
+        mock_get_http_session,
+        mock_load_dataset,
+        mock_get_deployment_semaphore,
+    ):
+        """
+        Should save the prediction as failed when the deployment has no free slot.
+        """
+        project_id = util.MOCK_UUID_1
+        deployment_id = util.MOCK_UUID_1
+
+        rv = TEST_CLIENT.post(
+            f"/projects/{project_id}/deployments/{deployment_id}/predictions",
+            json={"dataset": util.IRIS_DATASET_NAME},
+        )
+        result = rv.json()
+        self.assertEqual(rv.status_code, 200)
+
+        rv = TEST_CLIENT.get(
+            f"/projects/{project_id}/deployments/{deployment_id}/predictions/{result['uuid']}",
+        )
+        result = rv.json()
+        self.assertEqual(result["status"], "failed")
+        mock_get_deployment_semaphore.return_value.acquire.assert_called_once_with(
+            timeout=0
+        )
+        mock_get_http_session.return_value.post.assert_not_called()
+
+    @mock.patch(
+        "projects.controllers.predictions.load_dataset",
+        return_value=util.IRIS_DATAFRAME,
+    )
+    @mock.patch(
+        "projects.kubernetes.seldon.get_http_session",
+        return_value=mock.MagicMock(
+            **{"post.return_value": util.MOCK_POST_PREDICTION}
+        ),
+    )
+    @mock.patch.object(MINIO_CLIENT, "make_bucket")
+    @mock.patch.object(MINIO_CLIENT, "put_object")
+    @mock.patch("projects.controllers.predictions.PREDICTION_CHUNK_SIZE", 3)
+    def test_create_prediction_batch(
+        self,
+        mock_put_object,
+        mock_make_bucket,
+        mock_get_http_session,
+        mock_load_dataset,
+    ):
+        """
+        Should send the dataset in chunks and save the results in object storage.
+        """
+        project_id = util.MOCK_UUID_1
+        deployment_id = util.MOCK_UUID_1
+
+        rv = TEST_CLIENT.post(
+            f"/projects/{project_id}/deployments/{deployment_id}/predictions",
+            params={"batch": True},
+            json={"dataset": util.IRIS_DATASET_NAME},
+        )
+        result = rv.json()
+        self.assertEqual(rv.status_code, 200)
+
+        self.assertEqual(mock_get_http_session.return_value.post.call_count, 2)
+        self.assertEqual(mock_put_object.call_count, 2)
+        prefix = f"predictions/{result['uuid']}/"
+        mock_put_object.assert_any_call(
+            bucket_name=BUCKET_NAME,
+            object_name=f"{prefix}part-00001.json",
+            data=mock.ANY,
+            length=mock.ANY,
+            content_type="application/json",
+        )
+
+        rv = TEST_CLIENT.get(
+            f"/projects/{project_id}/deployments/{deployment_id}/predictions/{result['uuid']}",
+        )
+        result = rv.json()
+        self.assertEqual(result["status"], "done")
+        expected = {
+            "totalChunks": 2,
+            "completedChunks": 2,
+            "failedChunks": 0,
+            "resultsPrefix": prefix,
+        }
+        self.assertEqual(json.loads(result["response_body"]), expected)
+
+    @mock.patch("projects.kubernetes.seldon.SELDON_QUEUE_TIMEOUT", 0)
+    @mock.patch(
+        "projects.controllers.predictions.load_dataset",
+        return_value=util.IRIS_DATAFRAME,
+    )
+    @mock.patch(
+        "projects.kubernetes.seldon.get_http_session",
+        return_value=mock.MagicMock(
+            **{"post.return_value": util.MOCK_POST_PREDICTION}
+        ),
+    )
+    @mock.patch.object(MINIO_CLIENT, "make_bucket")
+    @mock.patch.object(MINIO_CLIENT, "put_object")
+    @mock.patch("projects.controllers.predictions.PREDICTION_CHUNK_SIZE", 3)
+    def test_create_prediction_batch_deployment_busy(
+        self,
+        mock_put_object,
+        mock_make_bucket,
+        mock_get_http_session,
+        mock_load_dataset,
+    ):
+        """
+        Should wait for a free slot of a busy deployment instead of failing chunks.
+        """
+        project_id = util.MOCK_UUID_1
+        deployment_id = util.MOCK_UUID_1
+
+        # all slots of the deployment are taken by other requests for a while
+        semaphore = threading.BoundedSemaphore(1)
+        semaphore.acquire()
+        threading.Timer(0.2, semaphore.release).start()
+
+        with mock.patch(
+            "projects.kubernetes.seldon.get_deployment_semaphore",
+            return_value=semaphore,
+        ):
+            rv = TEST_CLIENT.post(
+                f"/projects/{project_id}/deployments/{deployment_id}/predictions",
+                params={"batch": True},
+                json={"dataset": util.IRIS_DATASET_NAME},
+            )
+        result = rv.json()
+        self.assertEqual(rv.status_code, 200)
+        self.assertEqual(mock_get_http_session.return_value.post.call_count, 2)
+
+        rv = TEST_CLIENT.get(
+            f"/projects/{project_id}/deployments/{deployment_id}/predictions/{result['uuid']}",
+        )
+        result = rv.json()
+        self.assertEqual(result["status"], "done")
+        self.assertEqual(json.loads(result["response_body"])["failedChunks"], 0)
+
+    @mock.patch(
+        "projects.controllers.predictions.load_dataset",
+        return_value=io.BytesIO(b"not a dataframe"),
+    )
+    def test_create_prediction_batch_invalid_dataset(self, mock_load_dataset):
+        """
+        Should return an http status 400 when the dataset is not tabular.
+        """
+        project_id = util.MOCK_UUID_1
+        deployment_id = util.MOCK_UUID_1
+
+        rv = TEST_CLIENT.post(
+            f"/projects/{project_id}/deployments/{deployment_id}/predictions",
+            params={"batch": True},
+            json={"dataset": "mock.jpg"},
+        )
+        result = rv.json()
+        expected = {
+            "message": "batch predictions require a tabular dataset",
+            "code": "InvalidBatchDataset",
+        }
+        self.assertEqual(result, expected)
+        self.assertEqual(rv.status_code, 400)
+
+    @mock.patch(
+        "projects.controllers.predictions.load_dataset",
+        return_value=util.IRIS_DATAFRAME,
+    )
+    @mock.patch(
+        "projects.kubernetes.seldon.get_http_session",
+        return_value=mock.MagicMock(
+            **{"post.return_value": util.MOCK_POST_PREDICTION}
+        ),
+    )
+    @mock.patch.object(MINIO_CLIENT, "make_bucket")
+    @mock.patch.object(MINIO_CLIENT, "put_object")
+    @mock.patch.object(MINIO_CLIENT, "get_object")
+    @mock.patch("projects.controllers.predictions.PREDICTION_PAYLOAD_THRESHOLD", 10)
+    def test_create_prediction_large_payload(
+        self,
+        mock_get_object,
+        mock_put_object,
+        mock_make_bucket,
+        mock_get_http_session,
+        mock_load_dataset,
+    ):
+        """
+        Should save large bodies in object storage and stream them back.
+        """
+        project_id = util.MOCK_UUID_1
+        deployment_id = util.MOCK_UUID_1
+        objects = {}
+
+        def put_object(bucket_name, object_name, data, length, content_type):
+            objects[object_name] = data.read()
+
+        def get_object(bucket_name, object_name):
+            data = objects[object_name]
+            return mock.MagicMock(
+                **{"stream.return_value": [data[:10], data[10:]]}
+            )
+
+        mock_put_object.side_effect = put_object
+        mock_get_object.side_effect = get_object
+
+        rv = TEST_CLIENT.post(
+            f"/projects/{project_id}/deployments/{deployment_id}/predictions",
+            json={"dataset": util.IRIS_DATASET_NAME},
+        )
+        prediction_id = rv.json()["uuid"]
+        self.assertEqual(rv.status_code, 200)
+        self.assertEqual(
+            sorted(objects),
+            [
+                f"predictions/{prediction_id}/request_body.json.gz",
+                f"predictions/{prediction_id}/response_body.json.gz",
+            ],
+        )
+
+        rv = TEST_CLIENT.get(
+            f"/projects/{project_id}/deployments/{deployment_id}/predictions/{prediction_id}",
+        )
+        result = rv.json()
+        self.assertEqual(rv.status_code, 200)
+        self.assertEqual(result["status"], "done")
+        self.assertEqual(
+            json.loads(result["request_body"])["data"]["names"], util.IRIS_COLUMNS
+        )
+        self.assertEqual(
+            result["response_body"], util.MOCK_POST_PREDICTION._content
+        )
@@ -6,11 +6,12 @@ from fastapi.testclient import TestClient
 
 from projects import models
 from projects.api.main import app
-from projects.database import session_scope
+from projects.database import read_session_scope, session_scope
 
 import tests.util as util
 
 app.dependency_overrides[session_scope] = util.override_session_scope
+app.dependency_overrides[read_session_scope] = util.override_session_scope
 TEST_CLIENT = TestClient(app)
 DESCRIPTION = "LoremipsumdolorsitametconsecteturadipiscingelitInteerelitexauc\
                 LoremipsumdolorsitametconsecteturadipiscingelitInteerelitexauc\
@@ -81,10 +82,50 @@ class TestProjects(unittest.TestCase):
         )
         result = rv.json()
         total = util.TestingSessionLocal().query(models.Project).count()
-        expected = {"projects": [util.MOCK_PROJECT_3], "total": total}
+        expected = {
+            "projects": [util.MOCK_PROJECT_SUMMARY_3],
+            "total": total,
+            "nextCursor": mock.ANY,
+        }
+        self.assertEqual(result, expected)
+        self.assertEqual(rv.status_code, 200)
+
+    def test_list_projects_with_cursor(self):
+        """
+        Should return the same projects as offset pagination, following nextCursor.
+        """
+        rv = TEST_CLIENT.post("/projects/list-projects", json={"page_size": 2})
+        result = rv.json()
+        self.assertEqual(rv.status_code, 200)
+
+        rv = TEST_CLIENT.post(
+            "/projects/list-projects",
+            json={"page_size": 2, "cursor": result["nextCursor"]},
+        )
+        result = rv.json()
+
+        expected = {
+            "projects": util.MOCK_PROJECT_LIST["projects"][2:4],
+            "total": None,
+            "nextCursor": mock.ANY,
+        }
         self.assertEqual(result, expected)
         self.assertEqual(rv.status_code, 200)
 
+    def test_list_projects_invalid_cursor(self):
+        """
+        Should return a http error 400 and a message 'invalid cursor argument'.
+        """
+        rv = TEST_CLIENT.post("/projects/list-projects", json={"cursor": "foo"})
+        result = rv.json()
+
+        expected = {
+            "message": "Invalid cursor argument",
+            "code": "InvalidCursor",
+        }
+        self.assertDictEqual(expected, result)
+        self.assertEqual(rv.status_code, 400)
+
     def test_list_projects_with_filter(self):
         """
         Should return a list of projects compatible with some filter.
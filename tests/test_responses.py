@@ -1,15 +1,20 @@
 # -*- coding: utf-8 -*-
 import unittest
 import unittest.mock as mock
+from datetime import datetime, timedelta
 
 from fastapi.testclient import TestClient
 
+from projects import models
 from projects.api.main import app
-from projects.database import session_scope
+from projects.controllers import ResponseController
+from projects.controllers.deployments.responses import QUEUE_FULL, RESPONSE_BUFFER
+from projects.database import read_session_scope, session_scope
 
 import tests.util as util
 
 app.dependency_overrides[session_scope] = util.override_session_scope
+app.dependency_overrides[read_session_scope] = util.override_session_scope
 TEST_CLIENT = TestClient(app)
 
 
@@ -167,3 +172,343 @@ class TestResponses(unittest.TestCase):
                 "Ce-Source": "logger.anonymous",
             },
         )
+
+    @mock.patch(
+        "requests.post",
+        return_value=util.MOCK_POST_PREDICTION,
+    )
+    @mock.patch("projects.controllers.deployments.responses.RESPONSES_WINDOW_SIZE", 2)
+    def test_create_response_sliding_window(
+        self,
+        mock_requests_post,
+    ):
+        """
+        Should send only the latest responses to the broker.
+        """
+        project_id = util.MOCK_UUID_1
+        deployment_id = util.MOCK_UUID_1
+
+        for text in ["a", "b", "c"]:
+            rv = TEST_CLIENT.post(
+                f"/projects/{project_id}/deployments/{deployment_id}/responses",
+                json={"strData": text},
+            )
+            self.assertEqual(rv.status_code, 200)
+
+        mock_requests_post.assert_called_with(
+            "http://broker-ingress.knative-eventing.svc.cluster.local/anonymous/default",
+            json={
+                "data": {
+                    "ndarray": [["b"], ["c"]],
+                    "names": ["strData"],
+                },
+            },
+            headers={
+                "Ce-Id": mock.ANY,
+                "Ce-Specversion": "1.0",
+                "Ce-Type": f"deployment.{deployment_id}",
+                "Ce-Source": "logger.anonymous",
+            },
+        )
+
+    @mock.patch(
+        "requests.post",
+        return_value=util.MOCK_POST_PREDICTION,
+    )
+    @mock.patch("projects.controllers.deployments.responses.RESPONSES_WINDOW_TTL", 0)
+    def test_create_response_window_reloads_from_database(
+        self,
+        mock_requests_post,
+    ):
+        """
+        Should reload the window from the database, with responses saved by other replicas.
+        """
+        project_id = util.MOCK_UUID_1
+        deployment_id = util.MOCK_UUID_1
+
+        rv = TEST_CLIENT.post(
+            f"/projects/{project_id}/deployments/{deployment_id}/responses",
+            json={"strData": "a"},
+        )
+        self.assertEqual(rv.status_code, 200)
+
+        # saved by another replica
+        session = util.TestingSessionLocal()
+        session.add(
+            models.Response(
+                uuid="uuid-replica",
+                deployment_id=deployment_id,
+                body={"strData": "b"},
+                created_at=datetime.utcnow(),
+            )
+        )
+        session.commit()
+        session.close()
+
+        rv = TEST_CLIENT.post(
+            f"/projects/{project_id}/deployments/{deployment_id}/responses",
+            json={"strData": "c"},
+        )
+        self.assertEqual(rv.status_code, 200)
+
+        ndarray = mock_requests_post.call_args[1]["json"]["data"]["ndarray"]
+        self.assertEqual(ndarray, [["a"], ["b"], ["c"]])
+
+    @mock.patch(
+        "requests.post",
+        return_value=util.MOCK_POST_PREDICTION,
+    )
+    @mock.patch(
+        "projects.controllers.deployments.responses.RESPONSE_BUFFER.session_factory",
+        util.TestingSessionLocal,
+    )
+    @mock.patch(
+        "projects.controllers.deployments.responses.RESPONSES_INGESTION_MODE", "batch"
+    )
+    def test_create_response_batch(
+        self,
+        mock_requests_post,
+    ):
+        """
+        Should accept the response and save it in a micro-batch.
+        """
+        project_id = util.MOCK_UUID_1
+        deployment_id = util.MOCK_UUID_1
+
+        for text in ["a", "b"]:
+            rv = TEST_CLIENT.post(
+                f"/projects/{project_id}/deployments/{deployment_id}/responses",
+                json={"strData": text},
+            )
+            result = rv.json()
+            expected = {"message": "Accepted"}
+            self.assertEqual(result, expected)
+            self.assertEqual(rv.status_code, 202)
+
+        RESPONSE_BUFFER.drain()
+
+        mock_requests_post.assert_called_with(
+            "http://broker-ingress.knative-eventing.svc.cluster.local/anonymous/default",
+            json={
+                "data": {
+                    "ndarray": [["a"], ["b"]],
+                    "names": ["strData"],
+                },
+            },
+            headers={
+                "Ce-Id": mock.ANY,
+                "Ce-Specversion": "1.0",
+                "Ce-Type": f"deployment.{deployment_id}",
+                "Ce-Source": "logger.anonymous",
+            },
+        )
+
+    @mock.patch(
+        "requests.post",
+        return_value=util.MOCK_POST_PREDICTION,
+    )
+    @mock.patch(
+        "projects.controllers.deployments.responses.RESPONSE_BUFFER.session_factory",
+        util.TestingSessionLocal,
+    )
+    @mock.patch(
+        "projects.controllers.deployments.responses.RESPONSES_INGESTION_MODE", "batch"
+    )
+    def test_create_response_batch_unknown_deployment(
+        self,
+        mock_requests_post,
+    ):
+        """
+        Should accept the response without a query and drop it in the flusher.
+        """
+        project_id = util.MOCK_UUID_1
+
+        rv = TEST_CLIENT.post(
+            f"/projects/{project_id}/deployments/unk/responses",
+            json={"strData": "a"},
+        )
+        self.assertEqual(rv.status_code, 202)
+
+        RESPONSE_BUFFER.drain()
+
+        session = util.TestingSessionLocal()
+        count = session.query(models.Response).filter_by(deployment_id="unk").count()
+        session.close()
+        self.assertEqual(count, 0)
+        mock_requests_post.assert_not_called()
+
+    @mock.patch(
+        "requests.post",
+        return_value=util.MOCK_POST_PREDICTION,
+    )
+    @mock.patch(
+        "projects.controllers.deployments.responses.RESPONSE_BUFFER.session_factory",
+        util.TestingSessionLocal,
+    )
+    @mock.patch(
+        "projects.controllers.deployments.responses.RESPONSES_INGESTION_MODE", "batch"
+    )
+    @mock.patch("projects.controllers.deployments.responses.time.sleep")
+    def test_create_response_batch_retries_save(
+        self,
+        mock_sleep,
+        mock_requests_post,
+    ):
+        """
+        Should try to save a micro-batch again when saving fails.
+        """
+        project_id = util.MOCK_UUID_1
+        deployment_id = util.MOCK_UUID_1
+
+        rv = TEST_CLIENT.post(
+            f"/projects/{project_id}/deployments/{deployment_id}/responses",
+            json={"strData": "a"},
+        )
+        self.assertEqual(rv.status_code, 202)
+
+        save_responses = ResponseController.save_responses
+
+        def fail_once(controller, responses):
+            if mock_save_responses.call_count == 1:
+                raise Exception("deadlock")
+            return save_responses(controller, responses)
+
+        with mock.patch.object(
+            ResponseController,
+            "save_responses",
+            autospec=True,
+            side_effect=fail_once,
+        ) as mock_save_responses:
+            RESPONSE_BUFFER.drain()
+
+        self.assertEqual(mock_save_responses.call_count, 2)
+        mock_sleep.assert_called_once()
+        mock_requests_post.assert_called_once()
+
+        session = util.TestingSessionLocal()
+        count = (
+            session.query(models.Response).filter_by(deployment_id=deployment_id).count()
+        )
+        session.close()
+        self.assertEqual(count, 1)
+
+    @mock.patch(
+        "projects.controllers.deployments.responses.RESPONSE_BUFFER.put",
+        side_effect=QUEUE_FULL,
+    )
+    @mock.patch(
+        "projects.controllers.deployments.responses.RESPONSES_INGESTION_MODE", "batch"
+    )
+    def test_create_response_batch_queue_full(self, mock_put):
+        """
+        Should return a http status 503 and an error message.
+        """
+        project_id = util.MOCK_UUID_1
+        deployment_id = util.MOCK_UUID_1
+
+        rv = TEST_CLIENT.post(
+            f"/projects/{project_id}/deployments/{deployment_id}/responses",
+            json={"strData": "a"},
+        )
+        result = rv.json()
+
+        expected = {
+            "message": "Too many responses are waiting to be saved. Try again later.",
+            "code": "ResponsesQueueFull",
+        }
+        self.assertDictEqual(expected, result)
+        self.assertEqual(rv.status_code, 503)
+
+    @mock.patch(
+        "requests.post",
+        return_value=util.MOCK_POST_PREDICTION,
+    )
+    def test_list_rollups_success(
+        self,
+        mock_requests_post,
+    ):
+        """
+        Should summarize responses by hour and day.
+        """
+        project_id = util.MOCK_UUID_1
+        deployment_id = util.MOCK_UUID_1
+
+        rv = TEST_CLIENT.post(
+            f"/projects/{project_id}/deployments/{deployment_id}/responses",
+            json={"data": {"ndarray": [[1, "a"], [3, "b"]], "names": ["x", "y"]}},
+        )
+        self.assertEqual(rv.status_code, 200)
+
+        session = util.TestingSessionLocal()
+        ResponseController(session).rollup_responses()
+        session.close()
+
+        for granularity in ["hour", "day"]:
+            rv = TEST_CLIENT.get(
+                f"/projects/{project_id}/deployments/{deployment_id}/responses/rollups",
+                params={"granularity": granularity},
+            )
+            result = rv.json()
+            self.assertEqual(rv.status_code, 200)
+            self.assertEqual(result["total"], 1)
+            rollup = result["rollups"][0]
+            self.assertEqual(rollup["granularity"], granularity)
+            self.assertEqual(rollup["count"], 2)
+            self.assertEqual(
+                rollup["summary"], {"x": {"count": 2, "sum": 4, "min": 1, "max": 3}}
+            )
+
+    def test_list_rollups_invalid_granularity(self):
+        """
+        Should return a http status 400 and an error message.
+        """
+        project_id = util.MOCK_UUID_1
+        deployment_id = util.MOCK_UUID_1
+
+        rv = TEST_CLIENT.get(
+            f"/projects/{project_id}/deployments/{deployment_id}/responses/rollups",
+            params={"granularity": "minute"},
+        )
+        result = rv.json()
+
+        expected = {
+            "message": "Granularity must be one of ['hour', 'day']",
+            "code": "InvalidGranularity",
+        }
+        self.assertDictEqual(expected, result)
+        self.assertEqual(rv.status_code, 400)
+
+    def test_update_retention_success(self):
+        """
+        Should set the retention of a deployment and delete expired responses.
+        """
+        project_id = util.MOCK_UUID_1
+        deployment_id = util.MOCK_UUID_1
+
+        rv = TEST_CLIENT.put(
+            f"/projects/{project_id}/deployments/{deployment_id}/responses/retention",
+            json={"retentionDays": 1},
+        )
+        result = rv.json()
+        expected = {"deploymentId": deployment_id, "retentionDays": 1}
+        self.assertDictEqual(expected, result)
+        self.assertEqual(rv.status_code, 200)
+
+        session = util.TestingSessionLocal()
+        now = datetime.utcnow()
+        for uuid, created_at in [("old", now - timedelta(days=2)), ("new", now)]:
+            session.add(
+                models.Response(
+                    uuid=uuid,
+                    deployment_id=deployment_id,
+                    body={},
+                    created_at=created_at,
+                )
+            )
+        session.commit()
+
+        deleted = ResponseController(session).delete_expired_responses()
+        self.assertEqual(deleted, 1)
+        remaining = [uuid for (uuid,) in session.query(models.Response.uuid)]
+        self.assertEqual(remaining, ["new"])
+        session.close()
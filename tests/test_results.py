@@ -2,6 +2,7 @@
 import io
 import unittest
 import unittest.mock as mock
+import zipfile
 import pytest
 
 from minio.error import S3Error
@@ -18,6 +19,28 @@ import tests.util as util
 app.dependency_overrides[session_scope] = util.override_session_scope
 TEST_CLIENT = TestClient(app)
 
+RESULT_OBJECTS = [
+    f"experiments/{util.MOCK_UUID_1}/operators/{util.MOCK_UUID_1}/{util.MOCK_RUN_ID}/figure-202110281200000000.png",
+    f"experiments/{util.MOCK_UUID_1}/operators/deleted/{util.MOCK_RUN_ID}/figure-202110281200000001.html",
+    f"experiments/{util.MOCK_UUID_1}/operators/{util.MOCK_UUID_1}/other-run/figure-202110281200000002.png",
+]
+
+
+def list_results(prefix, recursive):
+    """
+    Lists RESULT_OBJECTS as MinIO does, with directories when not recursive.
+    """
+    names = []
+    for name in RESULT_OBJECTS:
+        if not name.startswith(prefix):
+            continue
+        rest = name[len(prefix):]
+        if not recursive and "/" in rest:
+            name = prefix + rest.split("/")[0] + "/"
+        if name not in names:
+            names.append(name)
+    return [Object(BUCKET_NAME, name) for name in names]
+
 
 class TestResults(unittest.TestCase):
     maxDiff = None
@@ -80,12 +103,9 @@ class TestResults(unittest.TestCase):
     @mock.patch.object(
         MINIO_CLIENT,
         "list_objects",
-        return_value=[
-            Object(
-                BUCKET_NAME,
-                f"experiments/{util.MOCK_UUID_1}/operators/{util.MOCK_UUID_1}/{util.MOCK_RUN_ID}/figure-202110281200000000.png",
-            )
-        ],
+        side_effect=lambda bucket_name, prefix, recursive: list_results(
+            prefix, recursive
+        ),
     )
     @mock.patch.object(
         MINIO_CLIENT,
@@ -113,16 +133,33 @@ class TestResults(unittest.TestCase):
 
         mock_kfp_client.assert_any_call(host="http://ml-pipeline.kubeflow:8888")
         mock_make_bucket.assert_any_call(BUCKET_NAME)
-        mock_list_objects.assert_any_call(
-            bucket_name=BUCKET_NAME,
-            prefix=f"experiments/{experiment_id}/operators/",
-            recursive=True,
+        # operators are listed non-recursively, then only the run of each one
+        self.assertEqual(
+            sorted(call[1]["prefix"] for call in mock_list_objects.call_args_list),
+            [
+                f"experiments/{experiment_id}/operators/",
+                f"experiments/{experiment_id}/operators/deleted/{util.MOCK_RUN_ID}/",
+                f"experiments/{experiment_id}/operators/{util.MOCK_UUID_1}/{util.MOCK_RUN_ID}/",
+            ],
         )
+        for call in mock_list_objects.call_args_list:
+            self.assertFalse(call[1]["recursive"])
         mock_get_object.assert_any_call(
             bucket_name=BUCKET_NAME,
             object_name=f"experiments/{experiment_id}/operators/{util.MOCK_UUID_1}/{util.MOCK_RUN_ID}/figure-202110281200000000.png",
         )
 
+        with zipfile.ZipFile(io.BytesIO(rv.content)) as z:
+            # results of deleted operators are kept, results of other runs are not
+            self.assertEqual(
+                z.namelist(),
+                [
+                    f"{util.MOCK_UUID_1}/figure-202110281200000000.png",
+                    "deleted/figure-202110281200000001.html",
+                ],
+            )
+            self.assertEqual(z.infolist()[0].compress_type, zipfile.ZIP_STORED)
+
     def test_get_operators_results_project_not_found(self):
         """
         Should return an http status 404 and an error message.
@@ -227,8 +264,8 @@ class TestResults(unittest.TestCase):
         mock_make_bucket.assert_any_call(BUCKET_NAME)
         mock_list_objects.assert_any_call(
             bucket_name=BUCKET_NAME,
-            prefix=f"experiments/{experiment_id}/operators/{operator_id}",
-            recursive=True,
+            prefix=f"experiments/{experiment_id}/operators/{operator_id}/{util.MOCK_RUN_ID}/",
+            recursive=False,
         )
         mock_get_object.assert_any_call(
             bucket_name=BUCKET_NAME,
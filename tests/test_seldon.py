@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+import unittest
+import unittest.mock as mock
+
+from urllib3.exceptions import ConnectTimeoutError, MaxRetryError, ReadTimeoutError
+
+from projects.kubernetes import seldon
+
+
+class TestSeldon(unittest.TestCase):
+    def setUp(self):
+        """
+        Sets up the test before running it.
+        """
+        self.session_patch = mock.patch.object(seldon, "_HTTP_SESSION", None)
+        self.session_patch.start()
+
+    def tearDown(self):
+        """
+        Deconstructs the test after running it.
+        """
+        self.session_patch.stop()
+
+    def get_retries(self):
+        return seldon.get_http_session().get_adapter("http://").max_retries
+
+    def test_read_timeout_is_not_retried(self):
+        """
+        Should not resend a prediction whose response timed out.
+        """
+        retries = self.get_retries()
+        error = ReadTimeoutError(None, "/api/v1.0/predictions", "Read timed out.")
+        with self.assertRaises(MaxRetryError):
+            retries.increment(method="POST", url="/api/v1.0/predictions", error=error)
+
+    def test_connect_timeout_is_retried(self):
+        """
+        Should resend a prediction that could not connect to the deployment.
+        """
+        retries = self.get_retries()
+        error = ConnectTimeoutError("Connection timed out.")
+        retries = retries.increment(
+            method="POST", url="/api/v1.0/predictions", error=error
+        )
+        self.assertEqual(retries.total, seldon.SELDON_MAX_RETRIES - 1)
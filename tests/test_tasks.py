@@ -8,10 +8,11 @@ from fastapi.testclient import TestClient
 from projects import models
 from projects.controllers import TaskController
 from projects.api.main import app
-from projects.database import session_scope
+from projects.database import read_session_scope, session_scope
 import tests.util as util
 
 app.dependency_overrides[session_scope] = util.override_session_scope
+app.dependency_overrides[read_session_scope] = util.override_session_scope
 TEST_CLIENT = TestClient(app)
 
 HOST_URL = "http://ml-pipeline.kubeflow:8888"
@@ -144,7 +145,35 @@ class TestTasks(unittest.TestCase):
         rv = TEST_CLIENT.post("/tasks/list-tasks", json={"page": 3, "page_size": 1})
         result = rv.json()
         total = util.TestingSessionLocal().query(models.Task).count()
-        expected = {"tasks": [util.MOCK_TASK_3], "total": total}
+        expected = {
+            "tasks": [util.MOCK_TASK_3],
+            "total": total,
+            "nextCursor": mock.ANY,
+        }
+        self.assertEqual(result, expected)
+        self.assertEqual(rv.status_code, 200)
+
+    def test_list_tasks_with_cursor(self):
+        """
+        Should return the next tasks sorted by name descending, following nextCursor.
+        """
+        rv = TEST_CLIENT.post(
+            "/tasks/list-tasks", json={"order": "name desc", "page_size": 4}
+        )
+        result = rv.json()
+        self.assertEqual(rv.status_code, 200)
+
+        rv = TEST_CLIENT.post(
+            "/tasks/list-tasks",
+            json={"order": "name desc", "page_size": 4, "cursor": result["nextCursor"]},
+        )
+        result = rv.json()
+
+        expected = {
+            "tasks": util.MOCK_TASK_LIST_SORTED_BY_NAME_DESC["tasks"][4:],
+            "total": None,
+            "nextCursor": None,
+        }
         self.assertEqual(result, expected)
         self.assertEqual(rv.status_code, 200)
 
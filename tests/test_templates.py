@@ -5,11 +5,12 @@ import unittest.mock as mock
 from fastapi.testclient import TestClient
 
 from projects.api.main import app
-from projects.database import session_scope
+from projects.database import read_session_scope, session_scope
 
 import tests.util as util
 
 app.dependency_overrides[session_scope] = util.override_session_scope
+app.dependency_overrides[read_session_scope] = util.override_session_scope
 TEST_CLIENT = TestClient(app)
 
 
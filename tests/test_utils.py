@@ -1,6 +1,18 @@
+import base64
+import io
 import unittest
+import unittest.mock as mock
 
-from projects import utils
+import numpy
+import pandas
+from sqlalchemy.dialects import mysql
+
+from projects import models, utils
+from projects.controllers.utils import (
+    parse_dataframe_to_seldon_request,
+    parse_file_buffer_to_seldon_request,
+    search_filter,
+)
 
 
 class TestUtils(unittest.TestCase):
@@ -13,3 +25,131 @@ class TestUtils(unittest.TestCase):
         snake = "test_to_camel_case"
         camel = "testToCamelCase"
         self.assertEqual(utils.to_snake_case(camel), snake)
+
+    def test_search_filter_mysql_fulltext(self):
+        """
+        Should narrow the search with the FULLTEXT index on MySQL.
+        """
+        session = mock.MagicMock()
+        session.bind.dialect.name = "mysql"
+        condition = search_filter(session, models.Project, "name", "foo\\-bug")
+        sql = str(
+            condition.compile(
+                dialect=mysql.dialect(), compile_kwargs={"literal_binds": True}
+            )
+        )
+        self.assertIn("""MATCH (projects.name) AGAINST ('"foo-bug"' IN BOOLEAN MODE)""", sql)
+        self.assertIn("LIKE", sql)
+
+    def test_search_filter_stopword_term(self):
+        """
+        Should only use LIKE when a ngram of the term contains a stopword.
+        """
+        session = mock.MagicMock()
+        session.bind.dialect.name = "mysql"
+        condition = search_filter(session, models.Project, "name", "data")
+        sql = str(condition.compile(dialect=mysql.dialect()))
+        self.assertNotIn("MATCH", sql)
+
+    def test_search_filter_short_term(self):
+        """
+        Should only use LIKE when the term is shorter than a ngram.
+        """
+        session = mock.MagicMock()
+        session.bind.dialect.name = "mysql"
+        condition = search_filter(session, models.Project, "name", "f")
+        sql = str(condition.compile(dialect=mysql.dialect()))
+        self.assertNotIn("MATCH", sql)
+
+    def test_parse_file_buffer_csv(self):
+        """
+        Should sniff the delimiter and parse a CSV file.
+        """
+        file = io.BytesIO(b"a;b\n1;x\n2;y\n")
+        request = parse_file_buffer_to_seldon_request(file)
+        expected = {"data": {"names": ["a", "b"], "ndarray": [[1, "x"], [2, "y"]]}}
+        self.assertEqual(request, expected)
+
+    def test_parse_file_buffer_csv_single_quotes(self):
+        """
+        Should sniff the quote char and parse a CSV file quoted with single quotes.
+        """
+        file = io.BytesIO(b"a,b\n1,'x, y'\n2,'z'\n")
+        request = parse_file_buffer_to_seldon_request(file)
+        expected = {"data": {"names": ["a", "b"], "ndarray": [[1, "x, y"], [2, "z"]]}}
+        self.assertEqual(request, expected)
+
+    def test_parse_file_buffer_not_utf8(self):
+        """
+        Should send a file that is not UTF-8 as binData.
+        """
+        content = "café;x\n".encode("latin-1")
+        file = io.BytesIO(content)
+        request = parse_file_buffer_to_seldon_request(file)
+        expected = {
+            "binData": base64.b64encode(content).decode("utf-8"),
+            "meta": {"content-type": "application/octet-stream"},
+        }
+        self.assertEqual(request, expected)
+
+    def test_parse_file_buffer_binary(self):
+        """
+        Should send a binary file as binData without parsing it.
+        """
+        content = b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR"
+        file = io.BytesIO(content)
+        request = parse_file_buffer_to_seldon_request(file)
+        expected = {
+            "binData": base64.b64encode(content).decode("utf-8"),
+            "meta": {"content-type": "image/png"},
+        }
+        self.assertEqual(request, expected)
+
+    def test_parse_dataframe_ndarray(self):
+        """
+        Should encode numeric and mixed dataframes as ndarray.
+        """
+        dataframe = pandas.DataFrame({"a": [1, 2], "b": [0.5, 1.5]})
+        request = parse_dataframe_to_seldon_request(dataframe, encoding="ndarray")
+        expected = {"data": {"names": ["a", "b"], "ndarray": [[1, 0.5], [2, 1.5]]}}
+        self.assertEqual(request, expected)
+        self.assertIsInstance(request["data"]["ndarray"][0][0], int)
+
+        dataframe = pandas.DataFrame({"a": [1, 2], "b": [3, 4]})
+        request = parse_dataframe_to_seldon_request(dataframe, encoding="ndarray")
+        expected = {"data": {"names": ["a", "b"], "ndarray": [[1, 3], [2, 4]]}}
+        self.assertEqual(request, expected)
+
+        dataframe = pandas.DataFrame([[1, "x"], [2, "y"]], columns=["a", "a"])
+        request = parse_dataframe_to_seldon_request(dataframe, encoding="ndarray")
+        expected = {"data": {"names": ["a", "a"], "ndarray": [[1, "x"], [2, "y"]]}}
+        self.assertEqual(request, expected)
+
+        dataframe = pandas.DataFrame({"a": [1, 2], "b": ["x", "y"]})
+        request = parse_dataframe_to_seldon_request(dataframe, encoding="tensor")
+        expected = {"data": {"names": ["a", "b"], "ndarray": [[1, "x"], [2, "y"]]}}
+        self.assertEqual(request, expected)
+
+    def test_parse_dataframe_tensor(self):
+        """
+        Should encode a numeric dataframe as a flat tensor with its shape.
+        """
+        dataframe = pandas.DataFrame({"a": [1, 2], "b": [0.5, 1.5]})
+        request = parse_dataframe_to_seldon_request(dataframe, encoding="tensor")
+        expected = {
+            "data": {
+                "names": ["a", "b"],
+                "tensor": {"shape": [2, 2], "values": [1.0, 0.5, 2.0, 1.5]},
+            }
+        }
+        self.assertEqual(request, expected)
+
+    def test_parse_dataframe_bin_data(self):
+        """
+        Should encode a numeric dataframe as a NumPy .npy binary.
+        """
+        dataframe = pandas.DataFrame({"a": [1, 2], "b": [0.5, 1.5]})
+        request = parse_dataframe_to_seldon_request(dataframe, encoding="binData")
+        self.assertEqual(request["meta"]["content-type"], "application/x-npy")
+        values = numpy.load(io.BytesIO(base64.b64decode(request["binData"])))
+        numpy.testing.assert_array_equal(values, dataframe.to_numpy())
@@ -2,7 +2,12 @@
 import json
 import unittest
 
-from projects.agent.watchers.workflow import update_status, update_seldon_deployment
+from projects import models
+from projects.agent.watchers.workflow import (
+    update_deployment_run,
+    update_seldon_deployment,
+    update_status,
+)
 
 import tests.util as util
 
@@ -50,3 +55,26 @@ class TestWatchers(unittest.TestCase):
         created_at_str = "2021-06-24T14:42:09Z"
         session = next(util.override_session_scope())
         update_seldon_deployment(deployment_id, status, created_at_str, session)
+
+    def test_update_deployment_run_success(self):
+        """
+        Should index the latest run of a deployment and ignore events of older runs.
+        """
+        deployment_id = util.MOCK_UUID_1
+        session = next(util.override_session_scope())
+        metadata = {
+            "creationTimestamp": "2021-06-24T14:42:09Z",
+            "labels": {"pipeline/runid": "run-2"},
+        }
+        update_deployment_run(deployment_id, metadata, "Running", session)
+
+        older_metadata = {
+            "creationTimestamp": "2021-06-23T14:42:09Z",
+            "labels": {"pipeline/runid": "run-1"},
+        }
+        update_deployment_run(deployment_id, older_metadata, "Succeeded", session)
+
+        deployment_run = session.query(models.DeploymentRun).get(deployment_id)
+        self.assertEqual(deployment_run.run_id, "run-2")
+        self.assertEqual(deployment_run.status, "Running")
+        self.assertEqual(deployment_run.name, util.MOCK_DEPLOYMENT_1["name"])
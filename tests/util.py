@@ -12,13 +12,17 @@ from sqlalchemy.orm import sessionmaker
 from kubernetes.client.rest import ApiException as K8_ApiException
 from projects.database import DB_TENANT, Base
 from projects import models
+from projects.controllers.deployments.responses import clear_response_windows
+from projects.kfp import reset_kfp_client
+from projects.kfp.pipeline import clear_pipeline_cache
+from projects.kubernetes.istio import clear_istio_cache
 
 MOCK_SET_USER_NAMESPACE = mock.MagicMock()
 MOCK_RUNS = mock.MagicMock()
 MOCK_RUN_ID = "4546465"
 MOCK_RUN = mock.MagicMock(id=MOCK_RUN_ID)
 MOCK_LIST_RUNS = mock.MagicMock(
-    return_value=mock.MagicMock(runs=[MOCK_RUN], next_page_token=None)
+    return_value=mock.MagicMock(runs=[MOCK_RUN], total_size=1, next_page_token=None)
 )
 MOCK_WORKFLOW_MANIFEST = open(
     "tests/resources/deployment_mock_manifest.json", "r"
@@ -685,6 +689,23 @@ MOCK_PROJECT_TO_BE_FILTERED = {
     "uuid": MOCK_UUID_FROM_PROJECT_TO_BE_FILTERED,
 }
 
+
+def project_summary(project):
+    """
+    Returns the fields of a project that are returned by list-projects.
+    """
+    return {
+        key: value
+        for key, value in project.items()
+        if key not in ["experiments", "deployments"]
+    }
+
+
+MOCK_PROJECT_SUMMARY_1 = project_summary(MOCK_PROJECT_1)
+MOCK_PROJECT_SUMMARY_2 = project_summary(MOCK_PROJECT_2)
+MOCK_PROJECT_SUMMARY_3 = project_summary(MOCK_PROJECT_3)
+MOCK_PROJECT_SUMMARY_TO_BE_FILTERED = project_summary(MOCK_PROJECT_TO_BE_FILTERED)
+
 MOCK_COMPARISON_1 = {
     "activeTab": "1",
     "createdAt": MOCK_CREATED_AT_1.isoformat(),
@@ -699,22 +720,25 @@ MOCK_COMPARISON_1 = {
 
 MOCK_PROJECT_LIST = {
     "projects": [
-        MOCK_PROJECT_1,
-        MOCK_PROJECT_2,
-        MOCK_PROJECT_3,
-        MOCK_PROJECT_TO_BE_FILTERED,
+        MOCK_PROJECT_SUMMARY_1,
+        MOCK_PROJECT_SUMMARY_2,
+        MOCK_PROJECT_SUMMARY_3,
+        MOCK_PROJECT_SUMMARY_TO_BE_FILTERED,
     ],
     "total": 4,
+    "nextCursor": None,
 }
 
 MOCK_PROJECT_LIST_SORTED_BY_NAME_DESC = {
     "projects": MOCK_PROJECT_LIST["projects"][::-1],
     "total": 4,
+    "nextCursor": None,
 }
 
 MOCK_PROJECT_LIST_FILTERED = {
-    "projects": [MOCK_PROJECT_TO_BE_FILTERED],
+    "projects": [MOCK_PROJECT_SUMMARY_TO_BE_FILTERED],
     "total": 1,
+    "nextCursor": None,
 }
 
 MOCK_EXPERIMENT_LIST = {
@@ -765,6 +789,7 @@ MOCK_DEPLOYMENT_RUN_LIST = {
         }
     ],
     "total": 1,
+    "nextPageToken": None,
 }
 
 MOCK_COMPARISON_LIST = {
@@ -924,11 +949,13 @@ MOCK_TASK_LIST = {
         MOCK_TASK_6,
     ],
     "total": 6,
+    "nextCursor": None,
 }
 
 MOCK_TASK_LIST_SORTED_BY_NAME_DESC = {
     "tasks": MOCK_TASK_LIST["tasks"][::-1],
     "total": 6,
+    "nextCursor": None,
 }
 
 MOCK_MONITORING_1 = {
@@ -1083,6 +1110,9 @@ def create_mocks():
     """
     Inserts some mock records into test database.
     """
+    reset_kfp_client()
+    clear_pipeline_cache()
+    clear_istio_cache()
     session = TestingSessionLocal()
     objects = [
         models.Project(
@@ -1342,8 +1372,12 @@ def delete_mocks():
     """
     Deletes mock records from test database.
     """
+    clear_response_windows()
     session = TestingSessionLocal()
     session.query(models.Response).delete()
+    session.query(models.ResponseRollup).delete()
+    session.query(models.ResponseRetention).delete()
+    session.query(models.DeploymentRun).delete()
     session.query(models.Monitoring).delete()
     session.query(models.Comparison).delete()
     session.query(models.Operator).delete()